@@ -2,7 +2,13 @@
 # Casen Ward
 
 import os
+import asyncio
+import threading
 import requests
+import httpx
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import datetime
 import time
@@ -10,24 +16,242 @@ import time
 load_dotenv() # Load environment variables from .env file
 
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")      # Finnhub API key from environment variable
-URL = "https://finnhub.io/api/v1"        # Finnhub base URL
+URL = os.getenv("FINNHUB_BASE_URL", "https://finnhub.io/api/v1")        # Finnhub base URL (overridable for local mocks)
+MAX_CONNECTIONS = int(os.getenv("FINNHUB_MAX_CONNECTIONS", "100"))      # connection pool size (sync session and async client)
+CONNECT_TIMEOUT = float(os.getenv("FINNHUB_CONNECT_TIMEOUT", "3"))      # seconds to open a connection
+READ_TIMEOUT = float(os.getenv("FINNHUB_READ_TIMEOUT", "10"))           # seconds to wait for a response
+MAX_RETRIES = int(os.getenv("FINNHUB_MAX_RETRIES", "3"))                # retries on 429 / 5xx
+BACKOFF = float(os.getenv("FINNHUB_BACKOFF", "0.5"))                    # backoff factor: 0.5s, 1s, 2s, ...
+RATE_PER_MINUTE = float(os.getenv("FINNHUB_RATE_PER_MINUTE", "60"))     # Finnhub free tier: 60 calls / minute
+BURST = float(os.getenv("FINNHUB_BURST", "30"))                         # Finnhub hard cap: 30 calls / second
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+# -------------------------------------------------
+# Rate limiting
+# -------------------------------------------------
+# Token bucket shared by the sync and async clients: refills at
+# RATE_PER_MINUTE / 60 tokens per second and holds at most BURST tokens.
+# A waiter takes its token up front (so waiters are served in order) and
+# gives it back if it is cancelled before its turn, so abandoned requests
+# do not push later callers further back.
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate                # tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Take a token (possibly going negative) and return how long to wait for it
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def _refund(self):
+        with self.lock:
+            self.tokens += 1
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund()
+                raise
+
+RATE_LIMITER = TokenBucket(RATE_PER_MINUTE / 60, BURST)
+
+
+# -------------------------------------------------
+# Pooled session (keep-alive + retries)
+# -------------------------------------------------
+# The adapter only retries connections that could not be opened (those
+# never reached Finnhub). Retries on 429 / 5xx are new calls against the
+# rate limit, so _get and _fetch_async make them themselves, taking a
+# token for every attempt.
+
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=MAX_RETRIES,
+                    connect=MAX_RETRIES,
+                    read=0,
+                    status=0,
+                    backoff_factor=BACKOFF,
+                    allowed_methods=["GET"],
+                    raise_on_status=False       # hand the response to _get
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONNECTIONS, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return BACKOFF * (2 ** attempt)
+
+
+# -------------------------------------------------
+# Request coalescing
+# -------------------------------------------------
+# Identical (endpoint, params) requests that are already in flight share the
+# first caller's upstream call instead of issuing their own.
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _request_key(endpoint, params):
+    return (endpoint, tuple(sorted(params.items())))
+
+def _get(endpoint, params):
+    key = _request_key(endpoint, params)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        session = _get_session()
+        for attempt in range(MAX_RETRIES + 1):
+            RATE_LIMITER.acquire()
+            r = session.get(f"{URL}{endpoint}", params={**params, "token": FINNHUB_API_KEY},
+                            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            if r.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            time.sleep(_retry_delay(r, attempt))
+        r.raise_for_status()       # Raise an error for bad responses
+        future.set_result(r.json())
+    except BaseException as e:
+        future.set_exception(e)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+    return future.result()
 
 # Get the stocks quote (current price and other data)
 def get_quote(symbol):
-    url = f"{URL}/quote"    #sets url as the constant URL + endpoint
-    params = {"symbol": symbol, "token": FINNHUB_API_KEY}    #symbol = stock tucker ex: "AAPL", token = api key
-    r = requests.get(url, params=params, timeout=5)   #makes a get request to the url with the parameters
-    r.raise_for_status()       # Raise an error for bad responses
-    return r.json()         #returns the response as a json object
+    params = {"symbol": symbol}    #symbol = stock tucker ex: "AAPL" (the api key is added by _get)
+    return _get("/quote", params)         #returns the response as a json object
 
 # Get the current metrics for a stock
 def get_metrics(symbol):
-    url = f"{URL}/stock/metric"
-    params = {"symbol": symbol, "metric": "all", "token": FINNHUB_API_KEY}    #metric = all gets all available metrics
-    r = requests.get(url, params=params)
+    params = {"symbol": symbol, "metric": "all"}    #metric = all gets all available metrics
+    return _get("/stock/metric", params)
+
+# -------------------------------------------------
+# Async versions (for async FastAPI routes)
+# -------------------------------------------------
+# One shared httpx.AsyncClient so concurrent requests reuse connections
+# instead of blocking a threadpool thread each. Same rate limiter, retry
+# policy and coalescing as the sync client. A shared request is cancelled
+# once every caller waiting for it has been cancelled or timed out, so a
+# request nobody wants any more gives back its queued rate-limit token.
+# A caller's timeout only covers the upstream call, not the time spent
+# queued on the rate limiter.
+
+_async_client = None
+_async_inflight = {}        # request key -> _SharedRequest
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            base_url=URL,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS)
+        )
+    return _async_client
+
+async def _fetch_async(endpoint, params, admitted: asyncio.Event):
+    client = _get_async_client()
+    for attempt in range(MAX_RETRIES + 1):
+        await RATE_LIMITER.acquire_async()
+        admitted.set()
+        r = await client.get(endpoint, params={**params, "token": FINNHUB_API_KEY})
+        if r.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(_retry_delay(r, attempt))
     r.raise_for_status()
     return r.json()
 
+class _SharedRequest:
+    def __init__(self, key, endpoint, params):
+        self.key = key
+        self.waiters = 0
+        self.admitted = asyncio.Event()     # set once the call is past the rate limiter
+        self.task = asyncio.ensure_future(_fetch_async(endpoint, params, self.admitted))
+        self.task.add_done_callback(lambda _: self.forget())
+
+    def forget(self):
+        if _async_inflight.get(self.key) is self:
+            del _async_inflight[self.key]
+
+async def _get_async(endpoint, params, timeout=None):
+    key = _request_key(endpoint, params)
+    request = _async_inflight.get(key)
+    if request is None:
+        request = _async_inflight[key] = _SharedRequest(key, endpoint, params)
+
+    request.waiters += 1
+    try:
+        if timeout is not None:
+            admitted = asyncio.ensure_future(request.admitted.wait())
+            try:
+                await asyncio.wait((admitted, request.task), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                admitted.cancel()
+        # shield: one caller being cancelled must not cancel the shared request
+        return await asyncio.wait_for(asyncio.shield(request.task), timeout)
+    finally:
+        request.waiters -= 1
+        if request.waiters == 0 and not request.task.done():
+            request.forget()
+            request.task.cancel()
+
+async def get_quote_async(symbol, timeout=None):
+    return await _get_async("/quote", {"symbol": symbol}, timeout)
+
+async def get_metrics_async(symbol, timeout=None):
+    return await _get_async("/stock/metric", {"symbol": symbol, "metric": "all"}, timeout)
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+def close_session():
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
 # Test
 if __name__ == "__main__":
     print(get_quote("AAPL"))
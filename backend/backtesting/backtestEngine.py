@@ -1,7 +1,21 @@
-from typing import List
+from typing import List, Union
 from datetime import date, timedelta
 import importlib
-import yfinance as yf
+import os
+
+import numpy as np
+
+from backend.backtesting.portfolioEngine import PortfolioEngine
+from backend.backtesting.pricePanel import PricePanel
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.resultCache import RESULT_CACHE
+from backend.backtesting.riskMetrics import held_from_signals, periods_per_year, run_metrics
+from backend.backtesting.trade import Trade, TradeLedger
+from backend.backtesting.tradeStats import TradeStats
+from backend.data.batchFetcher import BATCH_FETCHER
+from backend.jitKernels import position_kernel
+from backend.strategies.streamingAdapter import as_streaming
+from backend.strategies.vectorIndicators import IndicatorStore
 
 
 # -------------------------------------------------
@@ -65,6 +79,10 @@ class BacktestResult:
         max_drawdown_pct: float,
         trades_count: int,
         time_in_market_pct: float,
+        trades: Union[List[Trade], TradeLedger] = None,
+        equity_curve: np.ndarray = None,
+        risk: dict = None,
+        trade_stats: TradeStats = None,
     ):
         self.ticker = ticker
         self.start_date = start_date
@@ -74,41 +92,163 @@ class BacktestResult:
         self.max_drawdown_pct = max_drawdown_pct
         self.trades_count = trades_count
         self.time_in_market_pct = time_in_market_pct
+        self.trades = trades if trades is not None else []
+        # Equity at every close and the riskMetrics.METRICS computed from it.
+        # max_drawdown_pct above stays trade-level; risk["max_drawdown"]
+        # includes drawdowns inside open trades.
+        self.equity_curve = equity_curve
+        self.risk = risk if risk is not None else {}
+        self.trade_stats = trade_stats
 
 
 # -------------------------------------------------
 # Backtest Engine (Single-Ticker, Deterministic)
 # -------------------------------------------------
 
+PROGRESS_EVERY = 256    # bars between progress callbacks
+USE_JIT = os.getenv("BACKTEST_JIT", "0") == "1"     # default for BacktestEngine(jit=...)
+
+
 class BacktestEngine:
-    def __init__(self, ticker: str, price_data: List[dict], strategy):
+    def __init__(self, ticker: str, price_data: Union[PriceSeries, List[dict]], strategy, progress=None,
+                 jit: bool = USE_JIT, record_trades: bool = True):
         self.ticker = ticker
         self.price_data = price_data
         self.strategy = strategy
+        # Optional callable(bars_processed), called every PROGRESS_EVERY bars
+        # and once at the end; raising from it aborts the run.
+        self.progress = progress
+        # Compute signals up front and run the state machine as one kernel
+        # call (compiled, with the indicators, when numba is installed).
+        # Same results; progress is only reported at the start and end.
+        self.jit = jit
+        # Keep every trade in a TradeLedger; summary stats are accumulated
+        # as trades close either way, so runs that only need the summary
+        # can skip the ledger.
+        self.record_trades = record_trades
 
     def run(self) -> BacktestResult:
         if len(self.price_data) < 2:
             raise ValueError("Not enough price data")
 
+        series = PriceSeries.coerce(self.price_data, self.ticker)
+        return self._run(series, kernels=self.jit)
+
+    def _run(self, series: PriceSeries, kernels: bool) -> BacktestResult:
+        if kernels:
+            equity, peak_equity, trades, days_in_market, ledger, stats, held = self._simulate_kernels(series)
+        else:
+            equity, peak_equity, trades, days_in_market, ledger, stats, held = self._simulate_loop(series)
+
+        opens = series.open
+        closes = series.close
+        n = len(series)
+
+        # ---- Metrics ----
+        strategy_return = equity - 1
+
+        first_open = float(opens[0])
+        last_close = float(closes[-1])
+        buy_and_hold_return = (last_close / first_open) - 1
+
+        max_drawdown = (peak_equity - equity) / peak_equity if peak_equity > 0 else 0
+
+        time_in_market_pct = days_in_market / n
+
+        equity_curve, risk = run_metrics(opens, closes, held, periods_per_year(series.dates))
+
+        # ---- Sanity guards ----
+        assert 0 <= time_in_market_pct <= 1
+        assert 0 <= max_drawdown <= 1
+
+        return BacktestResult(
+            ticker=self.ticker,
+            start_date=series.date_at(0),
+            end_date=series.date_at(-1),
+            strategy_return_pct=strategy_return,
+            buy_and_hold_return_pct=buy_and_hold_return,
+            max_drawdown_pct=max_drawdown,
+            trades_count=trades,
+            time_in_market_pct=time_in_market_pct,
+            trades=ledger,
+            equity_curve=equity_curve,
+            risk=risk,
+            trade_stats=stats,
+        )
+
+    def _simulate_kernels(self, series: PriceSeries):
+        """Signals for every bar up front, then the state machine as one kernel call."""
+        n = len(series)
+        progress = self.progress
+        if progress is not None:
+            progress(0)
+
+        if hasattr(self.strategy, "vectorized_signals"):
+            signals = self.strategy.vectorized_signals(series.close, IndicatorStore(series.close, jit=True))
+        else:
+            strategy = as_streaming(self.strategy)
+            strategy.reset()
+            signals = np.fromiter((strategy.on_bar(series.bar(i)) for i in range(n - 1)), dtype=np.int8, count=n - 1)
+            signals = np.append(signals, 0)
+
+        equity, peak_equity, trades, days_in_market, entry_bars, exit_bars, exit_prices = position_kernel(
+            series.open, series.close, np.ascontiguousarray(signals, dtype=np.int8)
+        )
+        entry_prices = series.open[entry_bars]
+        entry_dates = series.dates[entry_bars]
+        exit_dates = series.dates[exit_bars]
+        durations = (exit_dates - entry_dates).astype("timedelta64[D]").astype(np.int64)
+
+        stats = TradeStats()
+        for entry_price, exit_price, duration in zip(entry_prices.tolist(), exit_prices.tolist(), durations.tolist()):
+            stats.add(entry_price, exit_price, duration)
+        ledger = None
+        if self.record_trades:
+            ledger = TradeLedger.from_arrays(self.ticker, entry_prices, exit_prices, entry_dates, exit_dates)
+
+        if progress is not None:
+            progress(n)
+        held = held_from_signals(signals)
+        return float(equity), float(peak_equity), int(trades), int(days_in_market), ledger, stats, held
+
+    def _simulate_loop(self, series: PriceSeries):
+        # Prices are read from the arrays only when a trade fills, and held
+        # is one byte per bar, so per-bar memory stays flat for long
+        # intraday series
+        opens = series.open
+        n = len(series)
+
         # ---- Reset state (critical) ----
         in_position = False
         entry_price = None
+        entry_date = None
         equity = 1.0
         peak_equity = 1.0
 
         trades = 0
         days_in_market = 0
+        stats = TradeStats()
+        ledger = TradeLedger(self.ticker, series.dates.dtype) if self.record_trades else None
+        held = np.zeros(n, dtype=bool)      # position open during each bar
+
+        # Strategies are fed one bar at a time (legacy calculate_signal
+        # strategies go through an adapter), keeping the loop O(n).
+        strategy = as_streaming(self.strategy)
+        strategy.reset()
+        progress = self.progress
 
         # ---- Main simulation loop ----
-        for i in range(len(self.price_data) - 1):
-            today = self.price_data[i]
-            tomorrow = self.price_data[i + 1]
+        for i in range(n - 1):
+            if progress is not None and i % PROGRESS_EVERY == 0:
+                progress(i)
 
-            historical_data = self.price_data[: i + 1]
-            signal = self.strategy.calculate_signal(historical_data)
+            today = series.bar(i)
+
+            signal = strategy.on_bar(today)
 
             if not in_position and signal == 1:
-                entry_price = tomorrow["open"]
+                entry_price = float(opens[i + 1])
+                entry_date = series.date_at(i + 1)
                 in_position = True
                 trades += 1
 
@@ -116,44 +256,55 @@ class BacktestEngine:
                 days_in_market += 1
 
                 if signal == -1:
-                    exit_price = tomorrow["open"]
+                    exit_price = float(opens[i + 1])
+                    exit_date = series.date_at(i + 1)
                     equity *= exit_price / entry_price
+                    stats.add(entry_price, exit_price, (exit_date - entry_date).days)
+                    if ledger is not None:
+                        ledger.append(entry_price, exit_price, entry_date, exit_date)
                     in_position = False
                     entry_price = None
 
                     peak_equity = max(peak_equity, equity)
 
+            held[i + 1] = in_position
+
         # ---- Force close at end ----
         if in_position:
-            last_close = self.price_data[-1]["close"]
+            last_close = float(series.close[-1])
+            exit_date = series.date_at(-1)
             equity *= last_close / entry_price
+            stats.add(entry_price, last_close, (exit_date - entry_date).days)
+            if ledger is not None:
+                ledger.append(entry_price, last_close, entry_date, exit_date)
             peak_equity = max(peak_equity, equity)
 
-        # ---- Metrics ----
-        strategy_return = equity - 1
-
-        first_open = self.price_data[0]["open"]
-        last_close = self.price_data[-1]["close"]
-        buy_and_hold_return = (last_close / first_open) - 1
+        if progress is not None:
+            progress(n)
 
-        max_drawdown = (peak_equity - equity) / peak_equity if peak_equity > 0 else 0
+        return equity, peak_equity, trades, days_in_market, ledger, stats, held
 
-        time_in_market_pct = days_in_market / len(self.price_data)
+    def _backtest_tickers(self, tickers, start_date, end_date):
+        """
+        Backtest each ticker as soon as its prices arrive. Downloads run
+        concurrently, results come back in ticker order, and a ticker whose
+        fetch fails (or has too little data) is skipped.
+        """
+        for ticker, price_data, error in BATCH_FETCHER.fetch_many(tickers, start_date, end_date, adjusted=False):
+            if error is not None:
+                print(f"Skipping {ticker}: {error}")
+                continue
+            if len(price_data) < 2:
+                continue
 
-        # ---- Sanity guards ----
-        assert 0 <= time_in_market_pct <= 1
-        assert 0 <= max_drawdown <= 1
+            engine = BacktestEngine(
+                ticker=ticker,
+                price_data=price_data,
+                strategy=self.strategy,
+                record_trades=False     # the scenario tests only use the summary
+            )
 
-        return BacktestResult(
-            ticker=self.ticker,
-            start_date=self.price_data[0]["date"],
-            end_date=self.price_data[-1]["date"],
-            strategy_return_pct=strategy_return,
-            buy_and_hold_return_pct=buy_and_hold_return,
-            max_drawdown_pct=max_drawdown,
-            trades_count=trades,
-            time_in_market_pct=time_in_market_pct
-        )
+            yield ticker, RESULT_CACHE.run(engine)     # fixed windows are only ever computed once
 
     # -------------------------------------------------
     # Test 1: Large-Cap Stability Test
@@ -165,35 +316,7 @@ class BacktestEngine:
         end_date = date.today()
         start_date = end_date - timedelta(days=TIME_PERIODS["5y"])
 
-        for ticker in LARGE_CAP_TICKERS:
-            df = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                auto_adjust=False
-            )
-
-            if df.empty or len(df) < 2:
-                continue
-            
-            price_data = []
-            for row in df.itertuples(index=True, name=None):
-                price_data.append({
-                    "date": row[0].date(),     # index
-                    "open": float(row[1]),     # Open
-                    "close": float(row[4]),    # Close
-                    "symbol": ticker
-                })
-
-            engine = BacktestEngine(
-                ticker=ticker,
-                price_data=price_data,
-                strategy=self.strategy
-            )
-
-            result = engine.run()
-
+        for ticker, result in self._backtest_tickers(LARGE_CAP_TICKERS, start_date, end_date):
             results.append({
                 "ticker": ticker,
                 "strategy_return": result.strategy_return_pct,
@@ -212,35 +335,7 @@ class BacktestEngine:
         end_date = date.today()
         start_date = end_date - timedelta(days=TIME_PERIODS["6mo"])
         
-        for ticker in PERFORMANCE_TEST_TICKERS:
-            df = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                auto_adjust=False
-            )
-
-            if df.empty or len(df) < 2:
-                continue
-            
-            price_data = []
-            for row in df.itertuples(index=True, name=None):
-                price_data.append({
-                    "date": row[0].date(),     # index
-                    "open": float(row[1]),     # Open
-                    "close": float(row[4]),    # Close
-                    "symbol": ticker
-                })
-
-            engine = BacktestEngine(
-                ticker=ticker,
-                price_data=price_data,
-                strategy=self.strategy
-            )
-
-            result = engine.run()
-
+        for ticker, result in self._backtest_tickers(PERFORMANCE_TEST_TICKERS, start_date, end_date):
             results.append({
                 "ticker": ticker,
                 "alpha": result.strategy_return_pct - result.buy_and_hold_return_pct,
@@ -260,35 +355,7 @@ class BacktestEngine:
         end_date = date(2021, 12, 31)
         
         
-        for ticker in BULL_2020_2021_TICKERS:
-            df = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                auto_adjust=False
-            )
-
-            if df.empty or len(df) < 2:
-                continue
-
-            price_data = []
-            for row in df.itertuples(index=True, name=None):
-                price_data.append({
-                    "date": row[0].date(),     # index
-                    "open": float(row[1]),     # Open
-                    "close": float(row[4]),    # Close
-                    "symbol": ticker
-                })
-
-            engine = BacktestEngine(
-                ticker=ticker,
-                price_data=price_data,
-                strategy=self.strategy
-            )
-
-            result = engine.run()
-
+        for ticker, result in self._backtest_tickers(BULL_2020_2021_TICKERS, start_date, end_date):
             results.append({
                 "ticker": ticker,
                 "strategy_return": result.strategy_return_pct,
@@ -309,35 +376,7 @@ class BacktestEngine:
         end_date = date(2022, 12, 31)
         
         
-        for ticker in BEAR_2022_TICKERS:
-            df = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                auto_adjust=False
-            )
-
-            if df.empty or len(df) < 2:
-                continue
-
-            price_data = []
-            for row in df.itertuples(index=True, name=None):
-                price_data.append({
-                    "date": row[0].date(),     # index
-                    "open": float(row[1]),     # Open
-                    "close": float(row[4]),    # Close
-                    "symbol": ticker
-                })
-
-            engine = BacktestEngine(
-                ticker=ticker,
-                price_data=price_data,
-                strategy=self.strategy
-            )
-
-            result = engine.run()
-
+        for ticker, result in self._backtest_tickers(BEAR_2022_TICKERS, start_date, end_date):
             results.append({
                 "ticker": ticker,
                 "strategy_return": result.strategy_return_pct,
@@ -346,15 +385,39 @@ class BacktestEngine:
             })
         return results
 
+    # -------------------------------------------------
+    # Test 5: Large-Cap Portfolio Test
+    # -------------------------------------------------
 
+    def portfolio_test(self, rebalance_every: int = 21):
+        '' 'All large caps held together in one equal-weight portfolio' ''
+        end_date = date.today()
+        start_date = end_date - timedelta(days=TIME_PERIODS["5y"])
 
-def analysis(strategy_name):
-    ''  'TEST 1: Large-Cap Stability Analysis'  ''
-    
+        series = {}
+        for ticker, price_data, error in BATCH_FETCHER.fetch_many(LARGE_CAP_TICKERS, start_date, end_date, adjusted=False):
+            if error is not None:
+                print(f"Skipping {ticker}: {error}")
+                continue
+            series[ticker] = price_data
+
+        panel = PricePanel.from_series(series)
+        return PortfolioEngine(panel, self.strategy, rebalance_every=rebalance_every).run()
+
+
+
+def load_strategy(strategy_name, **params):
+    """Instantiate a strategy by its STRATEGIES key, passing any parameters through."""
     module_path, class_name = STRATEGIES[strategy_name].rsplit(".", 1)
     module = importlib.import_module(module_path)
     StrategyClass = getattr(module, class_name)
-    strategy = StrategyClass()
+    return StrategyClass(**params)
+
+
+def analysis(strategy_name):
+    ''  'TEST 1: Large-Cap Stability Analysis'  ''
+    
+    strategy = load_strategy(strategy_name)
 
     engine = BacktestEngine(
         ticker=None,
@@ -463,8 +526,20 @@ def analysis(strategy_name):
         print(f"Worst Alpha: {min(alphas):.2%}")
         print(f"Standard Deviation of Alpha: {(sum((x - (sum(alphas) / len(alphas)))**2 for x in alphas) / len(alphas))**0.5:.2%}")
         print(f"Median Alpha: {sorted(alphas)[len(alphas)//2]:.2%}")
-        
-        
-    
+
+    ''  'TEST 5: Large-Cap Portfolio Test'  ''
+    result = engine.portfolio_test()
+    print("\n=== Test 5: Large-Cap Portfolio Results ===\n")
+    print(
+        f"Strategy={result.strategy_return_pct:.2%}, "
+        f"EqualWeight Buy&Hold={result.benchmark_return_pct:.2%}, "
+        f"Alpha={result.strategy_return_pct - result.benchmark_return_pct:.2%}, "
+        f"MaxDD={result.max_drawdown_pct:.2%}, "
+        f"Trades={result.trades_count}, "
+        f"AvgPositions={result.avg_positions:.1f}, "
+        f"Exposure={result.exposure_pct:.2%}"
+    )
+
+
 if __name__ == "__main__":
     analysis("mean_reversion")
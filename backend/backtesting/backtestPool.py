@@ -0,0 +1,55 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.backtesting.backtestEngine import BacktestEngine, BacktestResult
+from backend.backtesting.resultCache import RESULT_CACHE
+from backend.data.asyncData import offload
+
+
+# -------------------------------------------------
+# Bounded executor for CPU-heavy backtests
+# -------------------------------------------------
+# Routes await backtests here instead of running them on the event loop.
+# Worker processes keep CPU work off the GIL the API threads need, and
+# max_workers bounds how many backtests run at once; the rest queue.
+
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", str(os.cpu_count() or 1)))
+
+_executor = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    # Created on first use so importing the routes never spawns processes
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=BACKTEST_WORKERS)
+    return _executor
+
+
+def run_backtest_task(ticker, price_data, strategy) -> BacktestResult:
+    return BacktestEngine(ticker=ticker, price_data=price_data, strategy=strategy).run()
+
+
+def _cached_result(ticker, price_data, strategy):
+    # Hashing the price series and reading the disk tier block, so this
+    # (and storing the result) runs on the I/O pool, not the event loop
+    key = RESULT_CACHE.key(BacktestEngine(ticker=ticker, price_data=price_data, strategy=strategy))
+    return key, RESULT_CACHE.get(key)
+
+
+async def run_backtest_async(ticker, price_data, strategy) -> BacktestResult:
+    # Identical runs are answered from the result cache without touching the pool
+    key, result = await offload(_cached_result, ticker, price_data, strategy)
+    if result is None:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(get_executor(), run_backtest_task, ticker, price_data, strategy)
+        await offload(RESULT_CACHE.put, key, result)
+    return result
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
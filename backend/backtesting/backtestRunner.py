@@ -0,0 +1,256 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import shared_memory
+from typing import List, Union
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import TIME_PERIODS, BacktestEngine, load_strategy
+from backend.backtesting.pricePanel import PricePanel
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.resultCache import RESULT_CACHE
+from backend.data.batchFetcher import BATCH_FETCHER
+from backend.data.priceSources import date_unit
+
+
+# -------------------------------------------------
+# Parallel Backtest Runner (strategies x tickers x periods)
+# -------------------------------------------------
+# Prices are fetched once per ticker (longest window), packed into two
+# shared-memory blocks, and every worker process maps those blocks
+# instead of receiving pickled price data. Each task only ships
+# (strategy, ticker, start index, stop index) to a worker.
+#
+# With a panel (a PricePanel store, see panelStore.build_panel) nothing is
+# fetched or copied: every worker memory-maps the store read-only and runs
+# on views of its ticker's columns.
+#
+# A period is either a TIME_PERIODS key ("1y") or a (start_date, end_date)
+# tuple for fixed windows such as the 2022 bear market.
+
+Period = Union[str, tuple]
+
+FIELDS = PriceSeries.FIELDS
+
+# Per-worker state, set by _init_worker
+_worker_blocks = None
+_worker_prices = None
+_worker_dates = None
+_worker_symbols = None
+_worker_panel = None
+_worker_strategies = {}
+
+
+def _init_worker(prices_name: str, dates_name: str, total_bars: int, symbols: dict, date_dtype: str = "datetime64[D]"):
+    global _worker_blocks, _worker_prices, _worker_dates, _worker_symbols
+
+    prices_block = shared_memory.SharedMemory(name=prices_name)
+    dates_block = shared_memory.SharedMemory(name=dates_name)
+    _worker_blocks = (prices_block, dates_block)     # keep the mappings alive
+
+    _worker_prices = np.ndarray((len(FIELDS), total_bars), dtype=np.float64, buffer=prices_block.buf)
+    _worker_dates = np.ndarray((total_bars,), dtype=date_dtype, buffer=dates_block.buf)
+    _worker_symbols = symbols
+
+
+def _init_panel_worker(path: str):
+    global _worker_panel
+    _worker_panel = PricePanel.open(path)
+
+
+def _worker_strategy(strategy_name: str):
+    # Strategies are reset at the start of every run, so one instance per
+    # worker is enough.
+    if strategy_name not in _worker_strategies:
+        _worker_strategies[strategy_name] = load_strategy(strategy_name)
+    return _worker_strategies[strategy_name]
+
+
+def _run_task(task) -> dict:
+    strategy_name, ticker, period, lo, hi = task
+
+    offset = _worker_symbols[ticker]
+    series = PriceSeries(
+        ticker,
+        _worker_dates[offset + lo: offset + hi],
+        **{field: _worker_prices[row, offset + lo: offset + hi] for row, field in enumerate(FIELDS)}
+    )
+    return _result_row(strategy_name, ticker, period, series, _worker_strategy(strategy_name))
+
+
+def _run_panel_task(task) -> dict:
+    strategy_name, ticker, period, lo, hi = task
+    series = _worker_panel.series(ticker)[lo:hi]
+    return _result_row(strategy_name, ticker, period, series, _worker_strategy(strategy_name))
+
+
+def _result_row(strategy_name: str, ticker: str, period: str, series: PriceSeries, strategy) -> dict:
+    row = {"strategy": strategy_name, "ticker": ticker, "period": period}
+
+    if len(series) < 2:
+        row["error"] = "Not enough price data"
+        return row
+
+    result = RESULT_CACHE.run(BacktestEngine(ticker=ticker, price_data=series, strategy=strategy, record_trades=False))
+    row.update({
+        "start_date": result.start_date,
+        "end_date": result.end_date,
+        "strategy_return": result.strategy_return_pct,
+        "buy_and_hold_return": result.buy_and_hold_return_pct,
+        "alpha": result.strategy_return_pct - result.buy_and_hold_return_pct,
+        "max_drawdown": result.max_drawdown_pct,
+        "trades": result.trades_count,
+        "time_in_market": result.time_in_market_pct,
+    })
+    return row
+
+
+def period_window(period: Period, today: date = None):
+    """(label, start_date, end_date) for a TIME_PERIODS key or an explicit date tuple."""
+    if isinstance(period, str):
+        end_date = today or date.today()
+        return period, end_date - timedelta(days=TIME_PERIODS[period]), end_date
+    start_date, end_date = period
+    return f"{start_date.isoformat()}:{end_date.isoformat()}", start_date, end_date
+
+
+class BacktestRunner:
+    def __init__(
+        self,
+        strategies: List[str],
+        tickers: List[str],
+        periods: List[Period],
+        max_workers: int = None,
+        fetcher=BATCH_FETCHER,
+        interval: str = "1d",
+        panel: PricePanel = None,
+    ):
+        self.strategies = strategies
+        self.tickers = tickers
+        self.periods = periods
+        self.max_workers = max_workers or os.cpu_count()
+        self.fetcher = fetcher
+        # Bar size fetched for every ticker ("1d", or an intraday interval
+        # such as "5m"; minute timestamps are kept in the shared dates block)
+        self.interval = interval
+        # A memory-mapped PricePanel to read prices from instead of fetching
+        if panel is not None and panel.path is None:
+            raise ValueError("panel must be opened from a store (PricePanel.open / build_panel)")
+        self.panel = panel
+
+    def run(self) -> List[dict]:
+        """
+        Run every (strategy, ticker, period) cell. Rows come back in grid
+        order (strategy, then ticker, then period) regardless of which worker
+        finished first. Tickers whose data could not be fetched get a row
+        with an "error" key.
+        """
+        windows = [period_window(period) for period in self.periods]
+        series_by_ticker, errors = self._fetch(windows)
+
+        tasks = []
+        for strategy_name in self.strategies:
+            for ticker in self.tickers:
+                for label, start_date, end_date in windows:
+                    if ticker in errors:
+                        continue
+                    lo, hi = date_bounds(series_by_ticker[ticker], start_date, end_date)
+                    tasks.append((strategy_name, ticker, label, lo, hi))
+
+        rows = iter(self._execute(series_by_ticker, tasks))
+
+        results = []
+        for strategy_name in self.strategies:
+            for ticker in self.tickers:
+                for label, _, _ in windows:
+                    if ticker in errors:
+                        results.append({"strategy": strategy_name, "ticker": ticker, "period": label, "error": errors[ticker]})
+                    else:
+                        results.append(next(rows))
+        return results
+
+    # ---- Data ----
+
+    def _fetch(self, windows):
+        """Fetch one covering window per ticker; every period is sliced out of it."""
+        if self.panel is not None:
+            series_by_ticker = {ticker: self.panel.series(ticker) for ticker in self.tickers if ticker in self.panel.index}
+            failed = PricePanel.metadata(self.panel.path).get("errors", {})
+            errors = {
+                ticker: failed.get(ticker, "Not in the price panel")
+                for ticker in self.tickers if ticker not in self.panel.index
+            }
+            return series_by_ticker, errors
+
+        start_date = min(window[1] for window in windows)
+        end_date = max(window[2] for window in windows)
+
+        series_by_ticker, errors = {}, {}
+        for ticker, series, error in self.fetcher.fetch_many(self.tickers, start_date, end_date, self.interval):
+            if error is not None:
+                errors[ticker] = str(error)
+            else:
+                series_by_ticker[ticker] = series
+        return series_by_ticker, errors
+
+    def _execute(self, series_by_ticker: dict, tasks: list) -> List[dict]:
+        if not tasks:
+            return []
+
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        if self.panel is not None:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_panel_worker,
+                initargs=(self.panel.path,),
+            ) as pool:
+                return list(pool.map(_run_panel_task, tasks, chunksize=chunksize))
+
+        symbols, offset = {}, 0
+        for ticker, series in series_by_ticker.items():
+            symbols[ticker] = offset
+            offset += len(series)
+        total_bars = offset
+
+        prices_block = shared_memory.SharedMemory(create=True, size=max(1, len(FIELDS) * total_bars * 8))
+        dates_block = shared_memory.SharedMemory(create=True, size=max(1, total_bars * 8))
+        try:
+            prices = np.ndarray((len(FIELDS), total_bars), dtype=np.float64, buffer=prices_block.buf)
+            date_dtype = f"datetime64[{date_unit(self.interval)}]"
+            dates = np.ndarray((total_bars,), dtype=date_dtype, buffer=dates_block.buf)
+            for ticker, series in series_by_ticker.items():
+                lo, hi = symbols[ticker], symbols[ticker] + len(series)
+                dates[lo:hi] = series.dates
+                for row, field in enumerate(FIELDS):
+                    prices[row, lo:hi] = getattr(series, field)
+            del prices, dates     # release buffer exports before closing
+
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(prices_block.name, dates_block.name, total_bars, symbols, date_dtype),
+            ) as pool:
+                return list(pool.map(_run_task, tasks, chunksize=chunksize))
+        finally:
+            prices_block.close()
+            prices_block.unlink()
+            dates_block.close()
+            dates_block.unlink()
+
+
+def date_bounds(series: PriceSeries, start_date: date, end_date: date):
+    lo = int(np.searchsorted(series.dates, np.datetime64(start_date, "D"), side="left"))
+    hi = int(np.searchsorted(series.dates, np.datetime64(end_date, "D"), side="left"))
+    return lo, hi
+
+
+if __name__ == "__main__":
+    from backend.backtesting.backtestEngine import LARGE_CAP_TICKERS, STRATEGIES
+
+    runner = BacktestRunner(list(STRATEGIES), LARGE_CAP_TICKERS, ["1y", "5y"])
+    for row in runner.run():
+        if "error" in row:
+            print(f"{row['strategy']} {row['ticker']} {row['period']}: {row['error']}")
+        else:
+            print(f"{row['strategy']} {row['ticker']} {row['period']}: Alpha={row['alpha']:.2%}, Trades={row['trades']}")
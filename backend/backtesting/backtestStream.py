@@ -0,0 +1,74 @@
+import asyncio
+from typing import List
+
+from backend.backtesting.backtestEngine import load_strategy
+from backend.backtesting.backtestPool import run_backtest_async
+from backend.backtesting.backtestResult import BacktestResult
+from backend.backtesting.backtestRunner import date_bounds, period_window
+from backend.data.asyncData import get_prices
+
+
+# -------------------------------------------------
+# Streamed batch backtests (tickers x strategies x periods)
+# -------------------------------------------------
+# Each ticker is fetched once over the longest requested window and every
+# (strategy, period) cell is a slice of that series. Cells run on the
+# shared backtest process pool and are yielded in completion order, so a
+# caller can stream each report as soon as it is ready.
+
+
+def backtest_report(ticker: str, price_data, result) -> dict:
+    """Trade-level report for one engine result (the /api/backtest payload)."""
+    report = BacktestResult(
+        ticker=ticker,
+        start_date=result.start_date,
+        end_date=result.end_date,
+        trades=result.trades,
+        price_data=price_data,
+        stats=result.trade_stats
+    )
+    report_dict = report.to_dict()
+    report_dict["trades"] = [trade.to_dict() for trade in report.trades]
+    report_dict["risk"] = result.risk       # bar-level metrics from the engine's equity curve
+    return report_dict
+
+
+async def stream_backtests(tickers: List[str], strategies: List[str], periods: List[str]):
+    """Yields one row per (ticker, strategy, period) cell as it completes."""
+    windows = [period_window(period) for period in periods]
+    start_date = min(window[1] for window in windows)
+    end_date = max(window[2] for window in windows)
+
+    fetches = {
+        ticker: asyncio.ensure_future(get_prices(ticker, start_date, end_date, adjusted=True))
+        for ticker in dict.fromkeys(ticker.upper() for ticker in tickers)     # dedupe, keep order
+    }
+
+    async def run_cell(ticker, strategy_name, label, cell_start, cell_end) -> dict:
+        row = {"ticker": ticker, "strategy": strategy_name, "period": label}
+        try:
+            series = await fetches[ticker]      # every cell of a ticker shares one fetch
+            lo, hi = date_bounds(series, cell_start, cell_end)
+            window = series[lo:hi]
+            if len(window) < 2:
+                row["error"] = f"No price data found for ticker: {ticker}"
+                return row
+            result = await run_backtest_async(ticker, window, load_strategy(strategy_name))
+            row.update(backtest_report(ticker, window, result))
+        except Exception as e:
+            row["error"] = str(e)
+        return row
+
+    cells = [
+        asyncio.ensure_future(run_cell(ticker, strategy_name, *window))
+        for ticker in fetches
+        for strategy_name in strategies
+        for window in windows
+    ]
+    try:
+        for next_row in asyncio.as_completed(cells):
+            yield await next_row
+    finally:
+        # Client disconnected mid-stream: drop queued work
+        for task in cells + list(fetches.values()):
+            task.cancel()
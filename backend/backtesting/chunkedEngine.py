@@ -0,0 +1,278 @@
+import os
+from datetime import date
+from typing import Iterable, Union
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import USE_JIT, BacktestResult
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.riskMetrics import PERIODS_PER_YEAR, RiskAccumulator, mark_to_market
+from backend.backtesting.trade import TradeLedger
+from backend.backtesting.tradeStats import TradeStats
+from backend.data.intradayBars import cached_chunks
+from backend.data.priceCache import PRICE_CACHE
+from backend.strategies.streamingAdapter import as_streaming
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
+# -------------------------------------------------
+# Chunked (out-of-core) backtests
+# -------------------------------------------------
+# Runs the BacktestEngine state machine over a series that arrives in
+# blocks (e.g. views into the memory-mapped price cache), so only one block
+# plus O(lookback) state is in memory at a time. Everything the engine
+# carries from bar to bar carries across block boundaries:
+# - signals: the same streaming strategy instance keeps its rolling
+#   windows (legacy calculate_signal strategies keep their last `lookback`
+#   bars); with jit=True, vectorized strategies get the last lookback - 1
+#   closes prepended to each block as warm-up
+# - the signal on a block's last bar fills at the next block's first open,
+#   and the open trade, equity and peak carry over
+# - the equity curve continues from the previous block's close
+# Returns, trades, the ledger and the curve are identical to an in-memory
+# BacktestEngine run; see RiskAccumulator for the risk moments.
+
+BLOCK_BARS = int(os.getenv("BACKTEST_BLOCK_BARS", "262144"))
+
+
+def blocks_of(series: PriceSeries, block_bars: int = BLOCK_BARS):
+    for lo in range(0, len(series), block_bars):
+        yield series[lo:lo + block_bars]
+
+
+class ChunkedBacktestEngine:
+    def __init__(self, ticker: str, price_data: Union[PriceSeries, Iterable[PriceSeries]], strategy, progress=None,
+                 jit: bool = USE_JIT, record_trades: bool = True, record_curve: bool = True,
+                 block_bars: int = BLOCK_BARS):
+        self.ticker = ticker
+        # A PriceSeries (sliced into block_bars blocks) or any iterable of
+        # consecutive PriceSeries blocks
+        self.price_data = price_data
+        self.strategy = strategy
+        self.progress = progress
+        self.jit = jit
+        self.record_trades = record_trades
+        # The curve costs 8 bytes per bar; without it the risk metrics are
+        # still accumulated block by block
+        self.record_curve = record_curve
+        self.block_bars = block_bars
+
+    def run(self) -> BacktestResult:
+        blocks = self.price_data
+        if isinstance(blocks, PriceSeries):
+            blocks = blocks_of(blocks, self.block_bars)
+
+        self._reset()
+        for block in blocks:
+            if len(block):
+                self._add_block(block)
+        return self._finish()
+
+    # ---- State ----
+
+    def _reset(self):
+        self.signals = self._signal_source()
+        self.bars = 0
+        self.sessions = 0               # distinct days, for intraday annualization
+        self.first_open = None
+        self.first_date = None
+
+        # The previous block's last bar
+        self.last_close = None
+        self.last_date = None
+        self.last_held = False
+        self.last_equity = None
+        self.pending = 0                # its signal, filled at the next block's first open
+
+        self.in_position = False
+        self.entry_price = None
+        self.entry_date = None
+        self.equity = 1.0
+        self.peak_equity = 1.0
+        self.trades = 0
+        self.days_in_market = 0
+
+        self.stats = TradeStats()
+        self.ledger = None
+        self.risk = RiskAccumulator()
+        self.curve = []
+
+    def _signal_source(self):
+        """Callable(block) -> int8 signals, keeping indicator state between calls."""
+        strategy = self.strategy
+        if self.jit and hasattr(strategy, "vectorized_signals") and hasattr(strategy, "lookback"):
+            tail = np.empty(0)
+            warm_up = strategy.lookback - 1
+
+            def vectorized(block):
+                nonlocal tail
+                closes = np.concatenate((tail, block.close))
+                signals = strategy.vectorized_signals(closes, IndicatorStore(closes, jit=True))[len(tail):]
+                tail = closes[-warm_up:] if warm_up else closes[:0]
+                return signals
+
+            return vectorized
+
+        streaming = as_streaming(strategy)
+        streaming.reset()
+
+        def stream(block):
+            return np.fromiter((streaming.on_bar(block.bar(i)) for i in range(len(block))), dtype=np.int8, count=len(block))
+
+        return stream
+
+    # ---- Blocks ----
+
+    def _add_block(self, block: PriceSeries):
+        n = len(block)
+        if self.ledger is None and self.record_trades:
+            self.ledger = TradeLedger(self.ticker, block.dates.dtype)
+        first_block = self.first_open is None
+        if first_block:
+            self.first_open = float(block.open[0])
+            self.first_date = block.dates[0]
+
+        signals = np.asarray(self.signals(block), dtype=np.int8)
+
+        # decisions[j] fills at this block's bar j: the previous block's last
+        # signal, then this block's signals shifted by one
+        decisions = np.empty(n, dtype=np.int8)
+        decisions[0] = self.pending
+        decisions[1:] = signals[:-1]
+
+        # Position after each decision: the last nonzero decision so far,
+        # else the position carried in
+        bars = np.arange(n)
+        last_nonzero = np.maximum.accumulate(np.where(decisions != 0, bars, -1))
+        held = np.where(last_nonzero >= 0, decisions[np.maximum(last_nonzero, 0)] == 1, self.in_position)
+        was_held = np.empty(n, dtype=bool)
+        was_held[0] = self.in_position
+        was_held[1:] = held[:-1]
+
+        # A decision bar counts as in the market when the position was open before it
+        self.days_in_market += int(np.count_nonzero(was_held))
+        self._fill(block, np.flatnonzero(held != was_held), held)
+
+        # ---- Curve and risk ----
+        previous = None if first_block else (self.last_close, self.last_held, self.last_equity)
+        curve = mark_to_market(block.open, block.close, held, previous)
+        self.risk.add(curve, held)
+        if self.record_curve:
+            self.curve.append(curve)
+
+        days = block.dates.astype("datetime64[D]")
+        self.sessions += int(np.count_nonzero(days[1:] != days[:-1]))
+        self.sessions += int(first_block or days[0] != self.last_date.astype("datetime64[D]"))
+
+        self.bars += n
+        self.last_close = float(block.close[-1])
+        self.last_date = block.dates[-1]
+        self.last_held = bool(held[-1])
+        self.last_equity = float(curve[-1])
+        self.pending = int(signals[-1])
+
+        if self.progress is not None:
+            self.progress(self.bars)
+
+    def _fill(self, block: PriceSeries, fills: np.ndarray, held: np.ndarray):
+        """Apply the entries / exits at the given bars of the block, in order."""
+        for j in fills.tolist():
+            price = float(block.open[j])
+            if held[j]:
+                self.in_position = True
+                self.entry_price = price
+                self.entry_date = block.dates[j]
+                self.trades += 1
+            else:
+                self._close(price, block.dates[j])
+                self.peak_equity = max(self.peak_equity, self.equity)
+
+    def _close(self, exit_price: float, exit_date):
+        self.equity *= exit_price / self.entry_price
+        duration = int((exit_date - self.entry_date).astype("timedelta64[D]").astype(np.int64))
+        self.stats.add(self.entry_price, exit_price, duration)
+        if self.ledger is not None:
+            self.ledger.append(self.entry_price, exit_price, self.entry_date, exit_date)
+        self.in_position = False
+        self.entry_price = None
+
+    # ---- Result ----
+
+    def _finish(self) -> BacktestResult:
+        if self.bars < 2:
+            raise ValueError("Not enough price data")
+
+        if self.in_position:
+            self._close(self.last_close, self.last_date)
+            self.peak_equity = max(self.peak_equity, self.equity)
+
+        max_drawdown = (self.peak_equity - self.equity) / self.peak_equity if self.peak_equity > 0 else 0
+        time_in_market_pct = self.days_in_market / self.bars
+        assert 0 <= time_in_market_pct <= 1
+        assert 0 <= max_drawdown <= 1
+
+        intraday = np.datetime_data(self.last_date.dtype)[0] not in ("Y", "M", "W", "D")
+        periods_per_year = PERIODS_PER_YEAR * self.bars / self.sessions if intraday else PERIODS_PER_YEAR
+
+        return BacktestResult(
+            ticker=self.ticker,
+            start_date=self.first_date.astype(object),
+            end_date=self.last_date.astype(object),
+            strategy_return_pct=self.equity - 1,
+            buy_and_hold_return_pct=(self.last_close / self.first_open) - 1,
+            max_drawdown_pct=max_drawdown,
+            trades_count=self.trades,
+            time_in_market_pct=time_in_market_pct,
+            trades=self.ledger,
+            equity_curve=np.concatenate(self.curve) if self.record_curve else None,
+            risk=self.risk.metrics(periods_per_year),
+            trade_stats=self.stats,
+        )
+
+
+def chunked_backtest(ticker: str, start: date, end: date, strategy, interval: str = "1d", adjusted: bool = False,
+                     block_bars: int = BLOCK_BARS, cache=PRICE_CACHE, **settings) -> BacktestResult:
+    """Backtest [start, end) straight from the memory-mapped price cache, block_bars at a time."""
+    blocks = cached_chunks(ticker, start, end, interval, adjusted, chunk_bars=block_bars, cache=cache)
+    return ChunkedBacktestEngine(ticker, blocks, strategy, **settings).run()
+
+
+# Peak memory and parity against an in-memory run over a memory-mapped series
+if __name__ == "__main__":
+    import tempfile
+    import time
+    import tracemalloc
+
+    from backend.backtesting.backtestEngine import BacktestEngine, load_strategy
+
+    bars = 4_000_000
+    folder = tempfile.mkdtemp()
+    rng = np.random.default_rng(11)
+    closes = np.lib.format.open_memmap(os.path.join(folder, "close.npy"), "w+", np.float64, (bars,))
+    closes[:] = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, bars)))
+    minutes = np.arange(bars)
+    dates = np.datetime64("2000-01-03T09:30", "m") + (minutes // 390).astype("timedelta64[D]") + (minutes % 390).astype("timedelta64[m]")
+    np.save(os.path.join(folder, "dates.npy"), dates)
+    closes.flush()
+    del closes, minutes, dates
+
+    closes = np.load(os.path.join(folder, "close.npy"), mmap_mode="r")
+    series = PriceSeries("SYN", np.load(os.path.join(folder, "dates.npy"), mmap_mode="r"), open=closes, close=closes)
+
+    results = {}
+    for label, engine in (
+        ("in-memory", BacktestEngine("SYN", series, load_strategy("trend_follower"), jit=True, record_trades=False)),
+        ("chunked", ChunkedBacktestEngine("SYN", series, load_strategy("trend_follower"), jit=True,
+                                          record_trades=False, record_curve=False)),
+    ):
+        tracemalloc.start()
+        started = time.perf_counter()
+        results[label] = engine.run()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:>9}: {bars:,} bars in {elapsed:.1f}s, peak {peak / 2**20:.0f} MB")
+
+    a, b = results["in-memory"], results["chunked"]
+    print("identical:", a.strategy_return_pct == b.strategy_return_pct and a.trades_count == b.trades_count
+          and a.max_drawdown_pct == b.max_drawdown_pct and a.time_in_market_pct == b.time_in_market_pct)
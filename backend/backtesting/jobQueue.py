@@ -0,0 +1,363 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import BacktestEngine, load_strategy
+from backend.backtesting.resultCache import RESULT_CACHE
+from backend.backtesting.backtestRunner import date_bounds, period_window
+from backend.backtesting.backtestStream import backtest_report
+from backend.data.batchFetcher import BATCH_FETCHER
+
+
+# -------------------------------------------------
+# Background backtest jobs
+# -------------------------------------------------
+# Long grids are submitted as jobs and polled instead of holding an HTTP
+# request open:
+# - a bounded priority queue, a heap under the queue's lock (submit raises
+#   QueueFull when it is full); cancelling a queued job removes it, so it
+#   no longer takes a place
+# - JOB_WORKERS dispatcher threads; each fetches a job's prices once per
+#   ticker, then splits the job into one chunk per ticker (its series, sent
+#   once, and every strategy x period cell as (lo, hi) bounds into it) and
+#   runs the chunks in parallel on the worker pool
+# - every dispatcher owns one slot in a shared-memory block holding a
+#   cancel flag and one progress lane per chunk it can have running (bars
+#   processed by that chunk), so polling and cancelling never need a round
+#   trip to the workers
+# - finished jobs are kept in an LRU store of JOB_RESULTS entries
+
+JOB_WORKERS = int(os.getenv("BACKTEST_JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("BACKTEST_JOB_QUEUE_SIZE", "64"))
+JOB_RESULTS = int(os.getenv("BACKTEST_JOB_RESULTS", "256"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# Slot layout in the shared block: [cancel flag, bars processed per lane...]
+CANCEL, LANES = 0, slice(1, None)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, tickers: List[str], strategies: List[str], periods: List[str], priority: int = 0):
+        self.id = uuid.uuid4().hex
+        self.tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        self.strategies = strategies
+        self.periods = periods
+        self.priority = priority        # higher runs first
+        self.status = QUEUED
+        self.bars_done = 0
+        self.bars_total = None          # known once prices are fetched
+        self.slot = None                # shared-memory slot while running
+        self.cancel_requested = False
+        self.results = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "tickers": self.tickers,
+            "strategies": self.strategies,
+            "time_periods": self.periods,
+            "progress": {
+                "bars_done": self.bars_done,
+                "bars_total": self.bars_total,
+                "pct": 100 * self.bars_done / self.bars_total if self.bars_total else 0.0,
+            },
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "results": self.results,
+        }
+
+
+# ---- Worker process side ----
+
+_worker_block = None
+_worker_slots = None
+
+
+def _init_worker(block_name: str, slots: int, lanes: int):
+    global _worker_block, _worker_slots
+    _worker_block = shared_memory.SharedMemory(name=block_name)
+    _worker_slots = np.ndarray((slots, 1 + lanes), dtype=np.int64, buffer=_worker_block.buf)
+
+
+def _run_chunk(slot: int, lane: int, ticker: str, series, cells) -> List[dict]:
+    """
+    Run one ticker's cells (strategy, period label, lo, hi) in order, each
+    over series[lo:hi], publishing bars processed to the slot's lane.
+    """
+    state = _worker_slots[slot]
+    rows = []
+    done_before = 0
+
+    for strategy_name, label, lo, hi in cells:
+        def progress(bars, base=done_before):
+            if state[CANCEL]:
+                raise JobCancelled()
+            state[lane] = base + bars
+
+        window = series[lo:hi]
+        row = {"ticker": ticker, "strategy": strategy_name, "period": label}
+        if len(window) < 2:
+            row["error"] = f"No price data found for ticker: {ticker}"
+        else:
+            result = RESULT_CACHE.run(BacktestEngine(ticker, window, load_strategy(strategy_name), progress=progress))
+            row.update(backtest_report(ticker, window, result))
+        rows.append(row)
+
+        done_before += len(window)
+        state[lane] = done_before
+
+    return rows
+
+
+# ---- API process side ----
+
+class JobQueue:
+    def __init__(self, workers: int = JOB_WORKERS, max_queued: int = JOB_QUEUE_SIZE,
+                 max_results: int = JOB_RESULTS, fetcher=BATCH_FETCHER):
+        self.workers = workers
+        self.max_results = max_results
+        self.fetcher = fetcher
+
+        self.max_queued = max_queued
+        self._heap = []                         # (-priority, order, job) of queued jobs
+        self._order = itertools.count()         # FIFO among equal priorities
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)      # notified on submit and shutdown
+        self._active = {}                       # id -> queued / running Job
+        self._finished = OrderedDict()          # id -> finished Job, LRU order
+        self._closed = False
+
+        # One lane per pool process: a job alone can keep the whole pool busy
+        lanes = workers
+        self._block = shared_memory.SharedMemory(create=True, size=workers * (1 + lanes) * 8)
+        self._slots = np.ndarray((workers, 1 + lanes), dtype=np.int64, buffer=self._block.buf)
+        self._slots[:] = 0
+        self._chunk_bars = [0] * workers        # per slot, bars of the running job's finished chunks
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self._block.name, workers, lanes),
+        )
+        self._threads = [
+            threading.Thread(target=self._dispatch, args=(slot,), daemon=True, name=f"backtest-job-{slot}")
+            for slot in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ---- Public API ----
+
+    def submit(self, tickers: List[str], strategies: List[str], periods: List[str], priority: int = 0) -> Job:
+        job = Job(tickers, strategies, periods, priority)
+        with self._lock:
+            if len(self._heap) >= self.max_queued:
+                raise QueueFull(f"Job queue is full ({self.max_queued} queued)")
+            heapq.heappush(self._heap, (-priority, next(self._order), job))
+            self._active[job.id] = job
+            self._queued.notify()
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                job = self._finished.get(job_id)
+                if job is not None:
+                    self._finished.move_to_end(job_id)
+                return job
+            if job.slot is not None:
+                job.bars_done = self._bars_done(job.slot)
+            return job
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                return self._finished.get(job_id)
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                self._heap = [entry for entry in self._heap if entry[2] is not job]
+                heapq.heapify(self._heap)
+                self._finish(job, CANCELLED)
+            elif job.slot is not None:
+                self._slots[job.slot, CANCEL] = 1
+            return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": sum(1 for job in self._active.values() if job.status == QUEUED),
+                "running": sum(1 for job in self._active.values() if job.status == RUNNING),
+                "finished": len(self._finished),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            self._queued.notify_all()       # wake idle dispatchers
+        self._slots[:, CANCEL] = 1      # running jobs abort at their next progress check
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        del self._slots     # release the buffer export before closing
+        self._block.close()
+        self._block.unlink()
+
+    # ---- Dispatch ----
+
+    def _dispatch(self, slot: int):
+        while True:
+            with self._lock:
+                while not self._heap and not self._closed:
+                    self._queued.wait()
+                if self._closed:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                job.status = RUNNING
+                job.started_at = time.time()
+
+            try:
+                chunks = self._chunks(job)
+                with self._lock:
+                    job.bars_total = sum(hi - lo for _, _, cells, _ in chunks for _, _, lo, hi in cells)
+                    self._slots[slot] = 0
+                    self._chunk_bars[slot] = 0
+                    job.slot = slot
+                    cancelled = job.cancel_requested
+                rows = [] if cancelled else self._run_chunks(job, slot, chunks)
+            except JobCancelled:
+                rows, cancelled = None, True
+            except Exception as e:
+                with self._lock:
+                    job.error = str(e)
+                    self._finish(job, FAILED)
+                continue
+
+            with self._lock:
+                cancelled = cancelled or job.cancel_requested
+                job.results = None if cancelled else rows
+                self._finish(job, CANCELLED if cancelled else DONE)
+
+    def _chunks(self, job: Job) -> list:
+        """
+        Fetch each ticker once over the longest window. One chunk per ticker:
+        (ticker, series, cells, error) with a (strategy, label, lo, hi) cell
+        per strategy x period; a ticker that could not be fetched has no
+        series and an error for its cells.
+        """
+        windows = [period_window(period) for period in job.periods]
+        start_date = min(window[1] for window in windows)
+        end_date = max(window[2] for window in windows)
+
+        chunks = []
+        for ticker, series, error in self.fetcher.fetch_many(job.tickers, start_date, end_date, adjusted=True):
+            cells = []
+            for strategy_name in job.strategies:
+                for label, cell_start, cell_end in windows:
+                    lo, hi = date_bounds(series, cell_start, cell_end) if error is None else (0, 0)
+                    cells.append((strategy_name, label, lo, hi))
+            chunks.append((ticker, series, cells, None if error is None else f"Could not fetch {ticker}: {error}"))
+        return chunks
+
+    def _run_chunks(self, job: Job, slot: int, chunks) -> List[dict]:
+        """
+        Run the chunks on the pool, at most one per lane of the slot at a
+        time, and return their rows in job order. If a chunk fails (or sees
+        the cancel flag) the others are cancelled and its error is raised.
+        """
+        state = self._slots[slot]
+        rows = [None] * len(chunks)
+        waiting = list(enumerate(chunks))[::-1]
+        free_lanes = list(range(state.shape[0] - 1, 0, -1))
+        running = {}        # future -> (chunk index, lane)
+        try:
+            while waiting or running:
+                while waiting and free_lanes:
+                    index, (ticker, series, cells, error) = waiting.pop()
+                    if error is not None:
+                        rows[index] = [
+                            {"ticker": ticker, "strategy": strategy_name, "period": label, "error": error}
+                            for strategy_name, label, _, _ in cells
+                        ]
+                        continue
+                    lane = free_lanes.pop()
+                    running[self._pool.submit(_run_chunk, slot, lane, ticker, series, cells)] = (index, lane)
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, lane = running.pop(future)
+                    rows[index] = future.result()
+                    with self._lock:
+                        # Move the finished chunk's bars off its lane for the next chunk
+                        self._chunk_bars[slot] += int(state[lane])
+                        state[lane] = 0
+                    free_lanes.append(lane)
+        except BaseException:
+            state[CANCEL] = 1
+            for future in running:
+                future.cancel()
+            wait(running)
+            raise
+        return [row for chunk_rows in rows for row in chunk_rows]
+
+    def _bars_done(self, slot: int) -> int:
+        # Caller holds self._lock
+        return self._chunk_bars[slot] + int(self._slots[slot, LANES].sum())
+
+    def _finish(self, job: Job, status: str):
+        # Caller holds self._lock
+        if job.slot is not None:
+            job.bars_done = self._bars_done(job.slot)
+            job.slot = None
+        job.status = status
+        job.finished_at = time.time()
+        self._active.pop(job.id, None)
+        self._finished[job.id] = job
+        while len(self._finished) > self.max_results:
+            self._finished.popitem(last=False)
+
+
+_job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    # Created on first use so importing the routes never spawns processes
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+def shutdown():
+    global _job_queue
+    if _job_queue is not None:
+        _job_queue.shutdown()
+        _job_queue = None
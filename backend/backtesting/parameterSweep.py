@@ -0,0 +1,104 @@
+import itertools
+import os
+from typing import Dict, List, Union
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import load_strategy
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.riskMetrics import METRICS, held_from_signals, mark_to_market, periods_per_year, risk_metrics
+from backend.backtesting.vectorizedSimulator import simulate_batch
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
+# -------------------------------------------------
+# Parameter sweep (grid search) for one ticker
+# -------------------------------------------------
+# Every parameter combination's signals are computed with the strategy's
+# vectorized path. Indicators are shared between combinations through one
+# IndicatorStore (e.g. a single rolling-max array per window length), and the
+# signal rows are simulated in batched passes of SWEEP_BLOCK combinations, so
+# the (combinations x bars) intermediates stay bounded on a large grid.
+
+SWEEP_BLOCK = int(os.getenv("SWEEP_BLOCK", "256"))
+
+
+def parameter_grid(grid: Dict[str, list]) -> List[dict]:
+    """Expand {"window": [10, 20], "exit_band": [0.01, 0.02]} into a list of param dicts."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def sweep(
+    strategy_name: str,
+    price_data: Union[PriceSeries, List[dict]],
+    grid: Dict[str, list],
+    indicators: IndicatorStore = None,
+) -> List[dict]:
+    """
+    Backtest every combination in `grid` over price_data.
+
+    Returns one row per combination (in grid order) with the parameters
+    and the same metrics BacktestEngine.run reports. Pass the same
+    `indicators` store across calls on the same series to share indicators
+    between strategies too.
+    """
+    series = PriceSeries.coerce(price_data)
+    if len(series) < 2:
+        raise ValueError("Not enough price data")
+
+    combinations = parameter_grid(grid)
+    indicators = IndicatorStore.of(series.close, indicators)
+    buy_and_hold_return = float(series.close[-1] / series.open[0]) - 1
+    bars_per_year = periods_per_year(series.dates)
+
+    rows = []
+    for first in range(0, len(combinations), SWEEP_BLOCK):
+        block = combinations[first:first + SWEEP_BLOCK]
+        signals = np.empty((len(block), len(series)), dtype=np.int8)
+        for row, params in enumerate(block):
+            strategy = load_strategy(strategy_name, **params)
+            signals[row] = strategy.vectorized_signals(series.close, indicators)
+
+        batch = simulate_batch(series.open, series.close, signals)
+        held = held_from_signals(signals)
+        risk = risk_metrics(mark_to_market(series.open, series.close, held), held, bars_per_year)
+
+        strategy_return = batch["equity"] - 1
+        max_drawdown = (batch["peak_equity"] - batch["equity"]) / batch["peak_equity"]
+        time_in_market = batch["days_in_market"] / len(series)
+
+        rows.extend(
+            {
+                **params,
+                "strategy_return": float(strategy_return[row]),
+                "buy_and_hold_return": buy_and_hold_return,
+                "alpha": float(strategy_return[row]) - buy_and_hold_return,
+                "max_drawdown": float(max_drawdown[row]),
+                "trades": int(batch["trades"][row]),
+                "time_in_market": float(time_in_market[row]),
+                "risk": {name: float(risk[name][row]) for name in METRICS},
+            }
+            for row, params in enumerate(block)
+        )
+    return rows
+
+if __name__ == "__main__":
+    from datetime import date, timedelta
+    from backend.data.priceCache import PRICE_CACHE
+
+    end_date = date.today()
+    series = PRICE_CACHE.get("AAPL", end_date - timedelta(days=1825), end_date)
+
+    rows = sweep(
+        "momentum",
+        series,
+        {"entry_window": list(range(5, 101, 5)), "exit_window": list(range(5, 51, 5))},
+    )
+
+    print(f"{len(rows)} combinations")
+    for row in sorted(rows, key=lambda r: r["alpha"], reverse=True)[:5]:
+        print(
+            f"entry={row['entry_window']}, exit={row['exit_window']}: "
+            f"Alpha={row['alpha']:.2%}, Trades={row['trades']}, MaxDD={row['max_drawdown']:.2%}"
+        )
@@ -0,0 +1,162 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from backend.backtesting.priceSeries import PriceSeries
+
+
+# -------------------------------------------------
+# Date-aligned multi-ticker panel
+# -------------------------------------------------
+# One (dates x tickers) matrix per field over the union of every ticker's
+# trading days. A ticker with no bar on a date (not listed yet, delisted,
+# different holiday calendar) has NaN there. Row t is one day for the whole
+# universe, so portfolio code can update all tickers with array operations.
+#
+# 3,000 tickers x 20 years (~5,000 days) is 120 MB per float64 field;
+# dtype=np.float32 halves that.
+#
+# save() / open() keep a panel on disk as a read-only store that any number
+# of processes can memory-map instead of each holding its own copy:
+#   prices.npy    float (dates x tickers x fields), column-major, so one
+#                 ticker's field is a single contiguous run of dates
+#   dates.npy     datetime64 date axis
+#   symbols.json  symbol index (ticker order), field order and metadata
+# symbols.json is written last, so a store without it is incomplete.
+
+PRICES_FILE = "prices.npy"
+DATES_FILE = "dates.npy"
+SYMBOLS_FILE = "symbols.json"
+
+
+class PricePanel:
+    FIELDS = ("open", "close")
+    OPTIONAL_FIELDS = ("high", "low", "volume")
+
+    def __init__(self, dates: np.ndarray, tickers: List[str], open: np.ndarray, close: np.ndarray,
+                 high: np.ndarray = None, low: np.ndarray = None, volume: np.ndarray = None, path: str = None):
+        self.dates = np.asarray(dates)
+        self.tickers = list(tickers)
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.index = {ticker: j for j, ticker in enumerate(self.tickers)}
+        self.path = path        # store directory when opened with PricePanel.open
+
+        for field in self.fields:
+            if getattr(self, field).shape != (len(self.dates), len(self.tickers)):
+                raise ValueError(f"{field} must have shape (dates, tickers)")
+
+    @property
+    def fields(self) -> tuple:
+        return self.FIELDS + tuple(field for field in self.OPTIONAL_FIELDS if getattr(self, field) is not None)
+
+    @classmethod
+    def from_series(cls, series_by_ticker: Dict[str, PriceSeries], dtype=np.float64) -> "PricePanel":
+        tickers = [ticker for ticker, series in series_by_ticker.items() if len(series)]
+        if not tickers:
+            raise ValueError("No price data")
+
+        dates = np.unique(np.concatenate([series_by_ticker[ticker].dates.astype("datetime64[D]") for ticker in tickers]))
+        shape = (len(dates), len(tickers))
+        open_ = np.full(shape, np.nan, dtype=dtype)
+        close = np.full(shape, np.nan, dtype=dtype)
+
+        for j, ticker in enumerate(tickers):
+            series = series_by_ticker[ticker]
+            rows = np.searchsorted(dates, series.dates.astype("datetime64[D]"))
+            open_[rows, j] = series.open
+            close[rows, j] = series.close
+
+        return cls(dates, tickers, open_, close)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def series(self, ticker: str) -> PriceSeries:
+        """
+        The ticker's own bars (rows where it traded) as a PriceSeries. When
+        those rows are one unbroken range (no gaps inside the ticker's
+        history) the fields are views into the panel, not copies.
+        """
+        j = self.index[ticker]
+        rows = np.flatnonzero(~np.isnan(self.close[:, j]))
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            rows = slice(rows[0], rows[-1] + 1)
+        return PriceSeries(ticker, self.dates[rows], **{field: getattr(self, field)[rows, j] for field in self.fields})
+
+    def last_valid(self) -> np.ndarray:
+        """Per ticker, the row of its last bar (-1 if it has none)."""
+        valid = ~np.isnan(self.close)
+        last = len(self.dates) - 1 - np.argmax(valid[::-1], axis=0)
+        return np.where(valid.any(axis=0), last, -1)
+
+    # ---- On-disk store ----
+
+    def save(self, path: str, **meta):
+        """Write the panel as a store (see above); meta is kept in symbols.json."""
+        write_panel(path, self.dates, self.tickers, self.series, self.fields, self.close.dtype, **meta)
+
+    @classmethod
+    def open(cls, path: str) -> "PricePanel":
+        """Memory-map a store read-only; nothing is read until it is used."""
+        with open(os.path.join(path, SYMBOLS_FILE)) as f:
+            symbols = json.load(f)
+        prices = np.load(os.path.join(path, PRICES_FILE), mmap_mode="r")
+        dates = np.load(os.path.join(path, DATES_FILE), mmap_mode="r")
+        return cls(
+            dates,
+            symbols["tickers"],
+            path=path,
+            **{field: prices[:, :, k] for k, field in enumerate(symbols["fields"])}
+        )
+
+    @staticmethod
+    def metadata(path: str) -> dict:
+        """symbols.json of a store, or None when there is no complete store at path."""
+        try:
+            with open(os.path.join(path, SYMBOLS_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+def write_panel(path: str, dates: np.ndarray, tickers: List[str], series_for, fields=PriceSeries.FIELDS,
+                dtype=np.float64, **meta):
+    """
+    Write a store one ticker at a time: series_for(ticker) returns that
+    ticker's PriceSeries, whose dates must all be on the `dates` axis.
+    """
+    os.makedirs(path, exist_ok=True)
+    fields = tuple(fields)
+    if os.path.exists(os.path.join(path, SYMBOLS_FILE)):
+        os.remove(os.path.join(path, SYMBOLS_FILE))     # an existing store is incomplete while it is replaced
+    prices_tmp = os.path.join(path, PRICES_FILE + ".tmp")
+
+    prices = np.lib.format.open_memmap(prices_tmp, mode="w+", dtype=dtype,
+                                       shape=(len(dates), len(tickers), len(fields)), fortran_order=True)
+    prices[:] = np.nan
+    for j, ticker in enumerate(tickers):
+        series = series_for(ticker)
+        rows = np.searchsorted(dates, series.dates)
+        for k, field in enumerate(fields):
+            prices[rows, j, k] = getattr(series, field)
+    prices.flush()
+    del prices
+    os.replace(prices_tmp, os.path.join(path, PRICES_FILE))
+
+    with open(os.path.join(path, DATES_FILE + ".tmp"), "wb") as f:
+        np.save(f, np.asarray(dates))
+    os.replace(os.path.join(path, DATES_FILE + ".tmp"), os.path.join(path, DATES_FILE))
+
+    with open(os.path.join(path, SYMBOLS_FILE + ".tmp"), "w") as f:
+        json.dump({"tickers": list(tickers), "fields": list(fields), **meta}, f)
+    os.replace(os.path.join(path, SYMBOLS_FILE + ".tmp"), os.path.join(path, SYMBOLS_FILE))
@@ -0,0 +1,173 @@
+from datetime import date
+
+import numpy as np
+
+
+# -------------------------------------------------
+# Columnar price series
+# -------------------------------------------------
+# One contiguous float64 array per field plus a datetime64 date array,
+# instead of one dict per bar. Slicing returns views (no copies), and
+# integer indexing still returns a bar dict so code written against the
+# old list-of-dicts price_data keeps working.
+
+
+class PriceSeries:
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    __slots__ = ("symbol", "dates", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        symbol: str,
+        dates: np.ndarray,
+        open: np.ndarray,
+        close: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None,
+    ):
+        self.symbol = symbol
+        self.dates = np.asarray(dates)
+        if not np.issubdtype(self.dates.dtype, np.datetime64):
+            self.dates = self.dates.astype("datetime64[D]")
+
+        self.open = np.asarray(open, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+
+        def optional(values):
+            if values is None:
+                return np.full(len(self.close), np.nan)
+            return np.asarray(values, dtype=np.float64)
+
+        self.high = optional(high)
+        self.low = optional(low)
+        self.volume = optional(volume)
+
+        for field in self.FIELDS:
+            if len(getattr(self, field)) != len(self.dates):
+                raise ValueError(f"{field} has a different length than dates")
+
+    # ---- Construction ----
+
+    @classmethod
+    def from_dataframe(cls, df, symbol: str, date_unit: str = "D") -> "PriceSeries":
+        """
+        Build from a yfinance OHLCV DataFrame (date index, Open/High/Low/Close/Volume
+        columns) with one column copy per field and no per-row Python loop.
+        """
+        if getattr(df.columns, "nlevels", 1) > 1:
+            # yf.download returns (field, ticker) columns, even for one ticker
+            tickers = df.columns.get_level_values(-1)
+            df = df.xs(symbol, axis=1, level=-1) if symbol in tickers else df.droplevel(-1, axis=1)
+
+        index = df.index
+        if getattr(index, "tz", None) is not None:
+            # Ticker.history returns exchange-local timestamps; keep wall time
+            index = index.tz_localize(None)
+
+        def column(name):
+            if name not in df.columns:
+                return None
+            return df[name].to_numpy(dtype=np.float64)
+
+        return cls(
+            symbol=symbol,
+            dates=index.values.astype(f"datetime64[{date_unit}]"),
+            open=column("Open"),
+            high=column("High"),
+            low=column("Low"),
+            close=column("Close"),
+            volume=column("Volume"),
+        )
+
+    @classmethod
+    def from_records(cls, records, symbol: str = None) -> "PriceSeries":
+        """Build from the old list-of-dicts format ({"date", "open", "close", ...})."""
+        if symbol is None and records:
+            symbol = records[0].get("symbol")
+
+        def column(name):
+            if records and name not in records[0]:
+                return None
+            return np.array([day[name] for day in records], dtype=np.float64)
+
+        return cls(
+            symbol=symbol,
+            dates=np.array([day["date"] for day in records], dtype="datetime64[D]"),
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=column("volume"),
+        )
+
+    @classmethod
+    def concat(cls, parts, symbol: str = None) -> "PriceSeries":
+        """Join consecutive series (e.g. chunks of one ticker) into one."""
+        parts = list(parts)
+        if symbol is None and parts:
+            symbol = parts[0].symbol
+        return cls(
+            symbol,
+            np.concatenate([part.dates for part in parts]),
+            **{field: np.concatenate([getattr(part, field) for part in parts]) for field in cls.FIELDS}
+        )
+
+    @classmethod
+    def coerce(cls, price_data, symbol: str = None) -> "PriceSeries":
+        """Return price_data as a PriceSeries, converting a list of dicts if needed."""
+        if isinstance(price_data, cls):
+            return price_data
+        return cls.from_records(price_data, symbol)
+
+    # ---- Access ----
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return PriceSeries(
+                self.symbol,
+                self.dates[key],
+                open=self.open[key],
+                close=self.close[key],
+                high=self.high[key],
+                low=self.low[key],
+                volume=self.volume[key],
+            )
+        return self.bar(key)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.bar(i)
+
+    def bar(self, i: int) -> dict:
+        return {
+            "date": self.date_at(i),
+            "open": float(self.open[i]),
+            "high": float(self.high[i]),
+            "low": float(self.low[i]),
+            "close": float(self.close[i]),
+            "volume": float(self.volume[i]),
+            "symbol": self.symbol,
+        }
+
+    def date_at(self, i: int) -> date:
+        # datetime64[D] -> datetime.date, finer units -> datetime.datetime
+        return self.dates[i].astype(object)
+
+    def to_records(self) -> list:
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + sum(getattr(self, field).nbytes for field in self.FIELDS)
+
+
+def close_prices(historical_data):
+    """Closes from either a PriceSeries (array view) or a list of bar dicts."""
+    if isinstance(historical_data, PriceSeries):
+        return historical_data.close
+    return [day["close"] for day in historical_data]
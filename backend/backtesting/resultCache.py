@@ -0,0 +1,317 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from backend.backtesting.priceSeries import PriceSeries
+
+
+# -------------------------------------------------
+# Content-addressed backtest result cache
+# -------------------------------------------------
+# A run is keyed by a SHA-256 over everything that determines its result:
+# - the ticker and the bytes of the price series (dates + OHLCV)
+# - the strategy class, its parameters, and the source of its module plus
+#   every backend module it uses, directly or through other backend
+#   modules (editing a strategy or anything under it changes the key)
+# - the engine's source and any engine settings
+# Results live in an in-memory LRU tier and an on-disk tier
+# (<RESULT_CACHE_DIR>/<key[:2]>/<key>.pkl) shared by every process.
+# The disk tier is swept on the first write of a process and after every
+# tenth of RESULT_CACHE_MAX_BYTES written since: entries unused for
+# RESULT_CACHE_MAX_AGE_DAYS go first, then the least recently used until
+# the tier fits in RESULT_CACHE_MAX_BYTES. A file's mtime is its last use
+# (a disk hit touches it; atime is unreliable on relatime / noatime mounts).
+#
+# The key must describe the code this process is running, not the file on
+# disk: a module's source is hashed once per process (modules already
+# loaded are hashed when this module is imported), and a source file
+# modified after the process started cannot be matched to the code in
+# memory, so runs using it get no key and are neither cached nor stored.
+
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", ".result_cache")
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(1 << 30)))
+RESULT_CACHE_MAX_AGE_DAYS = float(os.getenv("RESULT_CACHE_MAX_AGE_DAYS", "30"))
+
+ABANDONED_WRITE_SECONDS = 3600      # a .tmp file this old belongs to a writer that died
+
+PARAM_TYPES = (int, float, str, bool, type(None))
+
+# Engine arguments that do not change the result (jit runs the same
+# arithmetic: see jitKernels, tests/signalParityTest.py)
+NON_RESULT_SETTINGS = {"progress", "jit"}
+
+
+def price_digest(series: PriceSeries) -> bytes:
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(series.dates.astype("datetime64[m]")).tobytes())
+    for field in PriceSeries.FIELDS:
+        h.update(np.ascontiguousarray(getattr(series, field), dtype=np.float64).tobytes())
+    return h.digest()
+
+
+def strategy_params(strategy) -> dict:
+    # Parameters are the constructor arguments (kept as same-named
+    # attributes); rolling state such as prev_close is not part of the key
+    params = {}
+    for name, parameter in inspect.signature(type(strategy).__init__).parameters.items():
+        if name == "self" or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        value = getattr(strategy, name, parameter.default)
+        params[name] = value if isinstance(value, PARAM_TYPES) else repr(value)
+    return params
+
+
+_PROCESS_STARTED = time.time()
+_source_hashes = {}     # module name -> sha256 hex of its source, None if it changed after start
+_source_lock = threading.Lock()
+
+
+def _module_hash(module):
+    name = module.__name__
+    with _source_lock:
+        if name in _source_hashes:
+            return _source_hashes[name]
+    path = getattr(module, "__file__", None)
+    if not path or not os.path.exists(path):
+        digest = ""
+    elif os.path.getmtime(path) > _PROCESS_STARTED:
+        digest = None       # edited after start: the loaded code may be older
+    else:
+        digest = hashlib.sha256(inspect.getsource(module).encode()).hexdigest()
+    with _source_lock:
+        return _source_hashes.setdefault(name, digest)
+
+
+def _backend_references(module) -> set:
+    # Backend modules whose names or values appear in the module's namespace
+    references = set()
+    for value in vars(module).values():
+        owner = value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None) or "")
+        if owner is not None and owner.__name__.startswith("backend."):
+            references.add(owner)
+    return references
+
+
+def code_version(cls) -> str:
+    """
+    Hash of the source of the module defining `cls` and of every backend
+    module reachable from it through module-level references (e.g. a
+    strategy -> rolling windows / indicators -> kernels), as loaded by this
+    process; None when that cannot be known.
+    """
+    module = sys.modules[cls.__module__]
+    modules, pending = {module}, [module]
+    while pending:
+        for owner in _backend_references(pending.pop()) - modules:
+            modules.add(owner)
+            pending.append(owner)
+
+    h = hashlib.sha256()
+    for owner in sorted(modules, key=lambda m: m.__name__):
+        digest = _module_hash(owner)
+        if digest is None:
+            return None
+        if digest:
+            h.update(owner.__name__.encode())
+            h.update(digest.encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root: str = RESULT_CACHE_DIR, max_entries: int = RESULT_CACHE_SIZE,
+                 max_bytes: int = RESULT_CACHE_MAX_BYTES, max_age_days: float = RESULT_CACHE_MAX_AGE_DAYS):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._written = None        # bytes written to disk since the last sweep (None: not swept yet)
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ---- Public API ----
+
+    def key(self, engine) -> str:
+        """The run's key, or None when it must not be cached (see above)."""
+        strategy_version = code_version(type(engine.strategy))
+        engine_version = code_version(type(engine))
+        if strategy_version is None or engine_version is None:
+            return None
+
+        series = PriceSeries.coerce(engine.price_data, engine.ticker)
+        strategy = engine.strategy
+        settings = {
+            name: value for name, value in sorted(vars(engine).items())
+            if name not in ("ticker", "price_data", "strategy") and name not in NON_RESULT_SETTINGS
+            and isinstance(value, PARAM_TYPES)
+        }
+
+        h = hashlib.sha256()
+        h.update(engine.ticker.encode())
+        h.update(price_digest(series))
+        h.update(f"{type(strategy).__module__}.{type(strategy).__qualname__}".encode())
+        h.update(json.dumps(strategy_params(strategy), sort_keys=True).encode())
+        h.update(strategy_version.encode())
+        h.update(engine_version.encode())
+        h.update(json.dumps(settings, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get(self, key: str):
+        if key is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        result = self._read(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, result)
+        return result
+
+    def put(self, key: str, result):
+        if key is None:
+            return
+        self._remember(key, result)
+        self._write(key, result)
+
+    def run(self, engine):
+        """engine.run(), or the stored result of an identical earlier run."""
+        key = self.key(engine)
+        result = self.get(key)
+        if result is None:
+            result = engine.run()
+            self.put(key, result)
+        return result
+
+    def clear(self, disk: bool = False):
+        """Drop the in-memory tier; with disk=True also delete every file of the on-disk tier."""
+        with self._lock:
+            self._memory.clear()
+        if disk:
+            for path, _ in self._files():
+                _remove(path)
+
+    def sweep(self) -> int:
+        """Bound the on-disk tier (see above). Returns the number of files deleted."""
+        now = time.time()
+        entries = []        # (last use, size, path), abandoned writes first
+        for path, stat in self._files():
+            if not path.endswith(".tmp"):
+                entries.append((stat.st_mtime, stat.st_size, path))
+            elif now - stat.st_mtime > ABANDONED_WRITE_SECONDS:
+                entries.append((0.0, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        expired = now - self.max_age_days * 86400
+        removed = 0
+        for used, size, path in entries:
+            if used >= expired and total <= self.max_bytes:
+                break
+            if _remove(path):
+                removed += 1
+            total -= size
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def _files(self):
+        # (path, stat) of every file in the on-disk tier's <key[:2]> directories
+        try:
+            directories = [entry.path for entry in os.scandir(self.root) if entry.is_dir() and len(entry.name) == 2]
+        except OSError:
+            return
+        for directory in directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    yield entry.path, entry.stat()
+                except OSError:
+                    continue        # removed by another process meanwhile
+
+    # ---- Tiers ----
+
+    def _remember(self, key: str, result):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".pkl")
+
+    def _read(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None     # missing, half-written by an old version, or from renamed classes
+        try:
+            os.utime(path)      # mark as used for the sweep
+        except OSError:
+            pass
+        return result
+
+    def _write(self, key: str, result):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+        os.replace(tmp, path)
+
+        with self._lock:
+            due = self._written is None or self._written + size >= self.max_bytes // 10
+            self._written = 0 if due else self._written + size
+        if due:
+            self.sweep()
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False        # already removed by another process
+
+
+for _module in list(sys.modules.values()):
+    if getattr(_module, "__name__", "").startswith("backend."):
+        _module_hash(_module)
+
+RESULT_CACHE = ResultCache()
@@ -1,6 +1,10 @@
 from datetime import date
 
+import numpy as np
+
 class Trade:
+    __slots__ = ("ticker", "entry_price", "exit_price", "entry_date", "exit_date", "return_pct", "duration_days")
+
     def __init__(
         self,
         ticker: str,
@@ -9,7 +13,7 @@ class Trade:
         entry_date: date,
         exit_date: date
     ):
-        
+
         if entry_price <= 0:
             raise ValueError("entry_price must be > 0")
 
@@ -31,3 +35,83 @@ class Trade:
             "return_pct": self.return_pct,
             "duration_days": self.duration_days
         }
+
+
+# -------------------------------------------------
+# Compact trade ledger
+# -------------------------------------------------
+# One structured NumPy record per trade (two float64 prices, two datetime64
+# dates: 32 bytes) in a buffer that doubles as it fills, instead of a Trade
+# object with two date objects each. Iterating or indexing builds Trade
+# objects on demand, so callers that want trade detail are unchanged.
+
+def trade_dtype(date_dtype="datetime64[D]") -> np.dtype:
+    return np.dtype([
+        ("entry_price", np.float64),
+        ("exit_price", np.float64),
+        ("entry_date", date_dtype),
+        ("exit_date", date_dtype),
+    ])
+
+
+class TradeLedger:
+    __slots__ = ("ticker", "_records", "_n")
+
+    def __init__(self, ticker: str, date_dtype="datetime64[D]", capacity: int = 16):
+        self.ticker = ticker
+        self._records = np.empty(capacity, dtype=trade_dtype(date_dtype))
+        self._n = 0
+
+    @classmethod
+    def from_arrays(cls, ticker: str, entry_prices, exit_prices, entry_dates, exit_dates) -> "TradeLedger":
+        entry_dates = np.asarray(entry_dates)
+        ledger = cls(ticker, entry_dates.dtype, capacity=max(len(entry_dates), 1))
+        records = ledger._records
+        records["entry_price"][:len(entry_dates)] = entry_prices
+        records["exit_price"][:len(entry_dates)] = exit_prices
+        records["entry_date"][:len(entry_dates)] = entry_dates
+        records["exit_date"][:len(entry_dates)] = exit_dates
+        ledger._n = len(entry_dates)
+        return ledger
+
+    def append(self, entry_price: float, exit_price: float, entry_date, exit_date):
+        if self._n == len(self._records):
+            grown = np.empty(max(2 * len(self._records), 16), dtype=self._records.dtype)
+            grown[:self._n] = self._records
+            self._records = grown
+        self._records[self._n] = (entry_price, exit_price, entry_date, exit_date)
+        self._n += 1
+
+    @property
+    def records(self) -> np.ndarray:
+        """The trades as a structured array (a view, no copy)."""
+        return self._records[:self._n]
+
+    @property
+    def nbytes(self) -> int:
+        return self.records.nbytes
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> Trade:
+        record = self.records[i]
+        return Trade(
+            self.ticker,
+            float(record["entry_price"]),
+            float(record["exit_price"]),
+            record["entry_date"].astype(object),
+            record["exit_date"].astype(object),
+        )
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self[i]
+
+    def __getstate__(self):
+        # Pickle only the filled records
+        return self.ticker, self.records.copy()
+
+    def __setstate__(self, state):
+        self.ticker, self._records = state
+        self._n = len(self._records)
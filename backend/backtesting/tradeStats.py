@@ -0,0 +1,69 @@
+from datetime import date
+
+
+# -------------------------------------------------
+# Online trade statistics
+# -------------------------------------------------
+# Every summary BacktestResult reports (total return, win rate, average
+# duration, time in market, max drawdown) is updated in O(1) as each trade
+# closes, so a run never needs its trades kept around to be summarized.
+# The arithmetic is the same, in the same order, as walking a Trade list.
+
+
+class TradeStats:
+    __slots__ = ("count", "wins", "invested_days", "equity", "peak", "max_drawdown")
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.invested_days = 0
+        self.equity = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+
+    @classmethod
+    def of(cls, trades) -> "TradeStats":
+        """Stats over an iterable of Trade objects (a list or a TradeLedger)."""
+        stats = cls()
+        for trade in trades:
+            stats.add_trade(trade)
+        return stats
+
+    def add(self, entry_price: float, exit_price: float, duration_days: int):
+        return_pct = ((exit_price - entry_price) / entry_price) * 100
+
+        self.count += 1
+        if return_pct > 0:
+            self.wins += 1
+        self.invested_days += duration_days
+
+        self.equity *= (1 + return_pct / 100)
+        self.peak = max(self.peak, self.equity)
+        self.max_drawdown = max(self.max_drawdown, (self.peak - self.equity) / self.peak)
+
+    def add_trade(self, trade):
+        self.add(trade.entry_price, trade.exit_price, trade.duration_days)
+
+    # ---- Summary (percent values, as in BacktestResult) ----
+
+    @property
+    def total_return_pct(self) -> float:
+        return (self.equity - 1) * 100
+
+    @property
+    def win_rate_pct(self) -> float:
+        return (self.wins / self.count) * 100 if self.count else 0.0
+
+    @property
+    def avg_duration_days(self) -> float:
+        return self.invested_days / self.count if self.count else 0.0
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        return self.max_drawdown * 100
+
+    def time_in_market_pct(self, start_date: date, end_date: date) -> float:
+        total_days = (end_date - start_date).days
+        if total_days <= 0:
+            return 0.0
+        return (self.invested_days / total_days) * 100
@@ -0,0 +1,170 @@
+from datetime import date
+from typing import List, Union
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import BacktestEngine, BacktestResult
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.riskMetrics import PERIODS_PER_YEAR, held_from_signals, periods_per_year, run_metrics
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
+# -------------------------------------------------
+# Array-based position / equity simulation
+# -------------------------------------------------
+# Reproduces BacktestEngine.run from a precomputed signal array:
+# - the signal on bar i is acted on at bar i + 1's open
+# - an open position is force-closed at the final close
+# - the signal on the last bar is never used
+
+
+def simulate_batch(opens: np.ndarray, closes: np.ndarray, signals: np.ndarray) -> dict:
+    """
+    Simulate many signal rows over one price series in a single pass.
+
+    signals has shape (runs, bars). Returns a dict of per-run arrays:
+    equity, peak_equity, trades, days_in_market.
+    """
+    opens = np.asarray(opens, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    signals = np.atleast_2d(signals)
+
+    n = len(closes)
+    if n < 2:
+        raise ValueError("Not enough price data")
+
+    # ---- Position state after each decision bar ----
+    # Buy (1) and sell (-1) flip the state, hold (0) keeps it, so the state
+    # after bar i is "long" exactly when the last non-zero signal was a buy.
+    decisions = signals[:, :-1]
+    bars = np.arange(n - 1)
+    last_nonzero = np.maximum.accumulate(np.where(decisions != 0, bars, -1), axis=1)
+    last_signal = np.take_along_axis(decisions, np.maximum(last_nonzero, 0), axis=1)
+    in_position = (last_nonzero >= 0) & (last_signal == 1)
+
+    was_in_position = np.zeros_like(in_position)
+    was_in_position[:, 1:] = in_position[:, :-1]
+
+    entries = in_position & ~was_in_position
+    exits = was_in_position & ~in_position
+
+    # ---- Trade returns (next-open fills, forced close at end) ----
+    # Every bar knows the entry price of the trade it belongs to; a trade's
+    # return is booked as a factor on its exit bar and 1.0 everywhere else.
+    fills = opens[1:]
+    last_entry = np.maximum.accumulate(np.where(entries, bars, -1), axis=1)
+    entry_price = fills[np.maximum(last_entry, 0)]
+
+    factors = np.ones((len(signals), n))
+    factors[:, :-1] = np.where(exits, fills / entry_price, 1.0)
+    factors[:, -1] = np.where(in_position[:, -1], closes[-1] / entry_price[:, -1], 1.0)
+
+    # cumprod is sequential along the row, so equity matches the engine's
+    # running product bit for bit (multiplying by 1.0 is exact).
+    equity_path = np.cumprod(factors, axis=1)
+
+    return {
+        "equity": equity_path[:, -1],
+        "peak_equity": np.maximum(equity_path.max(axis=1), 1.0),
+        "trades": entries.sum(axis=1),
+        "days_in_market": was_in_position.sum(axis=1),
+    }
+
+
+def simulate(
+    ticker: str,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    signals: np.ndarray,
+    start_date: date = None,
+    end_date: date = None,
+    bars_per_year: float = PERIODS_PER_YEAR,
+) -> BacktestResult:
+    batch = simulate_batch(opens, closes, np.asarray(signals)[np.newaxis, :])
+
+    equity = float(batch["equity"][0])
+    peak_equity = float(batch["peak_equity"][0])
+    n = len(closes)
+
+    # ---- Metrics ----
+    strategy_return = equity - 1
+    buy_and_hold_return = (float(closes[-1]) / float(opens[0])) - 1
+    max_drawdown = (peak_equity - equity) / peak_equity if peak_equity > 0 else 0
+    time_in_market_pct = int(batch["days_in_market"][0]) / n
+
+    equity_curve, risk = run_metrics(opens, closes, held_from_signals(signals), bars_per_year)
+
+    # ---- Sanity guards ----
+    assert 0 <= time_in_market_pct <= 1
+    assert 0 <= max_drawdown <= 1
+
+    return BacktestResult(
+        ticker=ticker,
+        start_date=start_date,
+        end_date=end_date,
+        strategy_return_pct=strategy_return,
+        buy_and_hold_return_pct=buy_and_hold_return,
+        max_drawdown_pct=max_drawdown,
+        trades_count=int(batch["trades"][0]),
+        time_in_market_pct=time_in_market_pct,
+        equity_curve=equity_curve,
+        risk=risk,
+    )
+
+
+def run_vectorized(ticker: str, price_data: Union[PriceSeries, List[dict]], strategy,
+                   indicators: IndicatorStore = None) -> BacktestResult:
+    """Vectorized equivalent of BacktestEngine(ticker, price_data, strategy).run()."""
+    series = PriceSeries.coerce(price_data, ticker)
+    signals = strategy.vectorized_signals(series.close, indicators)
+
+    return simulate(
+        ticker,
+        series.open,
+        series.close,
+        signals,
+        start_date=series.date_at(0) if len(series) else None,
+        end_date=series.date_at(-1) if len(series) else None,
+        bars_per_year=periods_per_year(series.dates),
+    )
+
+
+def run_vectorized_many(ticker: str, price_data: Union[PriceSeries, List[dict]], strategies) -> List[BacktestResult]:
+    """run_vectorized for several strategies on one ticker, sharing one IndicatorStore."""
+    series = PriceSeries.coerce(price_data, ticker)
+    indicators = IndicatorStore(series.close)
+    return [run_vectorized(ticker, series, strategy, indicators) for strategy in strategies]
+
+
+# Parity check against the bar-by-bar engine
+if __name__ == "__main__":
+    import importlib
+    from datetime import timedelta
+    from backend.backtesting.backtestEngine import STRATEGIES
+
+    rng = np.random.default_rng(7)
+    checked = 0
+
+    for trial in range(20):
+        # Cent-rounded like real quotes (odd trials to whole dollars, for long
+        # flat runs), so closes tie their moving averages
+        closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 800))), 2 if trial % 2 == 0 else 0)
+        opens = np.round(closes * (1 + rng.normal(0, 0.005, len(closes))), 2)
+        price_data = [
+            {"date": date(2015, 1, 1) + timedelta(days=i), "open": float(o), "close": float(c), "symbol": "TEST"}
+            for i, (o, c) in enumerate(zip(opens, closes))
+        ]
+
+        for name, path in STRATEGIES.items():
+            module_path, class_name = path.rsplit(".", 1)
+            StrategyClass = getattr(importlib.import_module(module_path), class_name)
+
+            expected = vars(BacktestEngine("TEST", price_data, StrategyClass()).run())
+            actual = vars(run_vectorized("TEST", price_data, StrategyClass()))
+            for field in ("trades", "trade_stats"):     # the simulator reports no trade detail
+                expected.pop(field), actual.pop(field)
+            assert np.array_equal(expected.pop("equity_curve"), actual.pop("equity_curve")), f"{name} curve mismatch on trial {trial}"
+            assert expected == actual, f"{name} mismatch on trial {trial}"
+            checked += 1
+
+    print(f"Vectorized simulator matches BacktestEngine on {checked} runs")
@@ -0,0 +1,260 @@
+from typing import Dict, List, Union
+
+import numpy as np
+
+from backend.backtesting.backtestEngine import load_strategy
+from backend.backtesting.parameterSweep import parameter_grid
+from backend.backtesting.priceSeries import PriceSeries
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
+# -------------------------------------------------
+# Rolling-window / walk-forward backtests
+# -------------------------------------------------
+# Signals are computed once over the full series. A window [lo, hi) then
+# trades those signals like BacktestEngine would on series[lo:hi]: it starts
+# flat, acts on the signal of bar i at bar i + 1's open and closes any open
+# position at its last close. From the first non-zero signal inside the
+# window onwards its position equals the full-series position, so every
+# window metric is a difference or ratio of arrays prepared once per series:
+# - equity: prefix products of open-to-open factors while long
+# - trades / days in market: prefix counts
+# - peak equity: a sparse table of equity at each exit (range max)
+# That is O(bars log bars) once plus O(1) per window, instead of one full
+# engine run per window. Windows are evaluated together as arrays.
+#
+# Indicators see the bars before a window (warm-up comes from the full
+# series), which is why results differ from a fresh engine run on the slice.
+
+
+class WindowEvaluator:
+    def __init__(self, opens: np.ndarray, closes: np.ndarray, signals: np.ndarray):
+        opens = np.asarray(opens, dtype=float)
+        closes = np.asarray(closes, dtype=float)
+        signals = np.asarray(signals)
+        n = len(closes)
+        if n < 2:
+            raise ValueError("Not enough price data")
+
+        self.opens = opens
+        self.closes = closes
+        self.signals = signals
+
+        # Full-series position after each decision bar, and the next
+        # non-zero signal at or after each bar (n if none)
+        bars = np.arange(n)
+        last_nonzero = np.maximum.accumulate(np.where(signals != 0, bars, -1))
+        self.long = (last_nonzero >= 0) & (signals[np.maximum(last_nonzero, 0)] == 1)
+        self.next_signal = np.minimum.accumulate(np.where(signals != 0, bars, n)[::-1])[::-1]
+
+        # held[k]: long from open k to open k + 1 (decided on bar k - 1)
+        held = np.zeros(n, dtype=bool)
+        held[1:] = self.long[:-1]
+
+        # P[k] = product of open-to-open factors over opens 0..k
+        factors = np.ones(n)
+        factors[1:] = np.where(held[:-1], opens[1:] / opens[:-1], 1.0)
+        self.prefix = np.cumprod(factors)
+
+        # Entries / exits happening at open k
+        was_held = np.zeros(n, dtype=bool)
+        was_held[1:] = held[:-1]
+        self.entries = np.concatenate(([0], np.cumsum(held & ~was_held)))
+        self.days_long = np.concatenate(([0], np.cumsum(self.long)))
+        self.exit_table = _sparse_max(np.where(was_held & ~held, self.prefix, 0.0))
+
+    def evaluate(self, lo: np.ndarray, hi: np.ndarray) -> Dict[str, np.ndarray]:
+        """Metrics of every window [lo[w], hi[w]) as arrays (same fields as simulate_batch)."""
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        if np.any(hi - lo < 2) or np.any(lo < 0) or np.any(hi > len(self.closes)):
+            raise ValueError("Windows must lie inside the series and span at least 2 bars")
+
+        first = self.next_signal[lo]            # first decision the window acts on
+        active = first <= hi - 2
+        f = np.where(active, first, lo)
+
+        # ---- Equity: held opens f+1 .. hi-2, then the last bar if still long ----
+        entry = f + 1
+        equity = np.where(active, self.prefix[hi - 1] / self.prefix[np.minimum(entry, hi - 1)], 1.0)
+        long_at_end = active & self.long[hi - 2]
+        equity = np.where(long_at_end, equity * self.closes[hi - 1] / self.opens[hi - 1], equity)
+
+        # ---- Peak of closed-trade equity (exits at opens f+2 .. hi-1) ----
+        has_exits = active & (f + 2 <= hi - 1)
+        exit_peak = _range_max(self.exit_table, np.where(has_exits, f + 2, 0), np.where(has_exits, hi - 1, 0))
+        exit_peak = np.where(has_exits, exit_peak / self.prefix[np.minimum(entry, hi - 1)], 0.0)
+        peak_equity = np.maximum(np.maximum(exit_peak, equity), 1.0)
+
+        # ---- Trades: the window's first buy, then full-series entries ----
+        first_buy = active & (self.signals[f] == 1)
+        later = np.where(active & (f + 2 <= hi - 1), self.entries[hi] - self.entries[np.minimum(f + 2, hi)], 0)
+        trades = first_buy.astype(np.int64) + later
+
+        # ---- Days in market: long after decisions f .. hi-3 ----
+        days = np.where(active & (f <= hi - 3), self.days_long[np.maximum(hi - 2, f)] - self.days_long[f], 0)
+
+        return {
+            "equity": equity,
+            "peak_equity": peak_equity,
+            "trades": trades,
+            "days_in_market": days,
+        }
+
+
+def _sparse_max(values: np.ndarray) -> List[np.ndarray]:
+    """table[j][i] = max(values[i : i + 2**j])."""
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+    return table
+
+
+def _range_max(table: List[np.ndarray], lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """max(values[lo : hi + 1]) for each pair (inclusive bounds)."""
+    level = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+    result = np.empty(len(lo))
+    for j in np.unique(level):
+        rows = level == j
+        result[rows] = np.maximum(table[j][lo[rows]], table[j][hi[rows] - (1 << j) + 1])
+    return result
+
+
+# ---- Window layouts ----
+
+def rolling_windows(n: int, length: int, step: int) -> np.ndarray:
+    """(windows, 2) array of [lo, hi) bar ranges of `length` bars every `step` bars."""
+    if length < 2 or step < 1:
+        raise ValueError("length must be >= 2 and step >= 1")
+    lo = np.arange(0, n - length + 1, step)
+    return np.stack([lo, lo + length], axis=1)
+
+
+def walk_forward_windows(n: int, train: int, test: int, step: int = None) -> np.ndarray:
+    """(folds, 4) array of train [lo, hi) followed by the test [lo, hi) right after it."""
+    step = step or test
+    train_lo = np.arange(0, n - train - test + 1, step)
+    return np.stack([train_lo, train_lo + train, train_lo + train, train_lo + train + test], axis=1)
+
+
+# ---- Results tables ----
+
+def _rows(series: PriceSeries, metrics: dict, lo: np.ndarray, hi: np.ndarray) -> List[dict]:
+    strategy_return = metrics["equity"] - 1
+    buy_and_hold_return = series.close[hi - 1] / series.open[lo] - 1
+    max_drawdown = (metrics["peak_equity"] - metrics["equity"]) / metrics["peak_equity"]
+    time_in_market = metrics["days_in_market"] / (hi - lo)
+
+    return [
+        {
+            "start_date": series.date_at(int(lo[w])).isoformat(),
+            "end_date": series.date_at(int(hi[w]) - 1).isoformat(),
+            "strategy_return": float(strategy_return[w]),
+            "buy_and_hold_return": float(buy_and_hold_return[w]),
+            "alpha": float(strategy_return[w] - buy_and_hold_return[w]),
+            "max_drawdown": float(max_drawdown[w]),
+            "trades": int(metrics["trades"][w]),
+            "time_in_market": float(time_in_market[w]),
+        }
+        for w in range(len(lo))
+    ]
+
+
+def rolling_backtest(
+    strategy,
+    price_data: Union[PriceSeries, List[dict]],
+    length: int,
+    step: int,
+    indicators: IndicatorStore = None,
+) -> List[dict]:
+    """One results row per rolling window of `length` bars, every `step` bars."""
+    series = PriceSeries.coerce(price_data)
+    windows = rolling_windows(len(series), length, step)
+    if len(windows) == 0:
+        return []
+
+    signals = strategy.vectorized_signals(series.close, IndicatorStore.of(series.close, indicators))
+    evaluator = WindowEvaluator(series.open, series.close, signals)
+    lo, hi = windows[:, 0], windows[:, 1]
+    return _rows(series, evaluator.evaluate(lo, hi), lo, hi)
+
+
+def walk_forward(
+    strategy_name: str,
+    price_data: Union[PriceSeries, List[dict]],
+    grid: Dict[str, list],
+    train: int,
+    test: int,
+    step: int = None,
+    metric: str = "alpha",
+    indicators: IndicatorStore = None,
+) -> List[dict]:
+    """
+    Walk-forward optimisation: on every fold, pick the grid combination
+    with the best `metric` on the train window and report it on the
+    following test window. Returns one row per fold.
+    """
+    series = PriceSeries.coerce(price_data)
+    folds = walk_forward_windows(len(series), train, test, step)
+    if len(folds) == 0:
+        return []
+
+    combinations = parameter_grid(grid)
+    indicators = IndicatorStore.of(series.close, indicators)
+
+    train_rows, test_rows = [], []
+    for params in combinations:
+        signals = load_strategy(strategy_name, **params).vectorized_signals(series.close, indicators)
+        evaluator = WindowEvaluator(series.open, series.close, signals)
+        train_rows.append(_rows(series, evaluator.evaluate(folds[:, 0], folds[:, 1]), folds[:, 0], folds[:, 1]))
+        test_rows.append(_rows(series, evaluator.evaluate(folds[:, 2], folds[:, 3]), folds[:, 2], folds[:, 3]))
+
+    results = []
+    for fold in range(len(folds)):
+        best = max(range(len(combinations)), key=lambda c: train_rows[c][fold][metric])
+        results.append({
+            "fold": fold,
+            "params": combinations[best],
+            "train": train_rows[best][fold],
+            "test": test_rows[best][fold],
+        })
+    return results
+
+
+# Parity with simulate() on each slice, and speed against per-window engine runs
+if __name__ == "__main__":
+    import time
+    from datetime import date, timedelta
+    from backend.backtesting.backtestEngine import STRATEGIES, BacktestEngine
+    from backend.backtesting.vectorizedSimulator import simulate_batch
+
+    rng = np.random.default_rng(3)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, 5040)))
+    opens = closes * (1 + rng.normal(0, 0.005, len(closes)))
+    dates = np.array([np.datetime64(date(2005, 1, 3) + timedelta(days=i)) for i in range(len(closes))])
+    series = PriceSeries("TEST", dates, open=opens, close=closes)
+
+    windows = np.concatenate([rolling_windows(len(series), length, 5) for length in (21, 63, 252, 1260)])
+    for name in STRATEGIES:
+        signals = load_strategy(name).vectorized_signals(series.close)
+        metrics = WindowEvaluator(opens, closes, signals).evaluate(windows[:, 0], windows[:, 1])
+        for w, (lo, hi) in enumerate(windows):
+            expected = simulate_batch(opens[lo:hi], closes[lo:hi], signals[lo:hi][np.newaxis, :])
+            for field, values in metrics.items():
+                assert np.isclose(values[w], expected[field][0], rtol=1e-9), (name, field, lo, hi)
+    print(f"{len(windows)} windows x {len(STRATEGIES)} strategies match simulate_batch on each slice")
+
+    strategy = load_strategy("trend_follower")
+    started = time.perf_counter()
+    rows = rolling_backtest(strategy, series, length=252, step=5)
+    prefix_time = time.perf_counter() - started
+
+    sample = rolling_windows(len(series), 252, 5)[::20]
+    started = time.perf_counter()
+    for lo, hi in sample:
+        BacktestEngine("TEST", series[lo:hi], load_strategy("trend_follower")).run()
+    engine_time = (time.perf_counter() - started) * len(rows) / len(sample)
+    print(f"{len(rows)} rolling 1y windows: {prefix_time * 1000:.1f}ms (engine per window: ~{engine_time:.1f}s)")
@@ -0,0 +1,74 @@
+# Batch rating against the real Finnhub rate limiter
+#
+#   python -m backend.benchmarks.batchRateLimitCheck [symbols]
+#
+# Finnhub is the local mock server from routeLoadTest, but unlike the load
+# test every call goes through the real TokenBucket (at a scaled-up rate so
+# the run takes seconds, not minutes). Checks that:
+# - no batch row loses its price / fundamentals to a limiter-queue timeout
+# - the batch never runs the bucket more than FINNHUB_IN_FLIGHT calls into debt
+# - a single quote right after the batch is not stuck behind it
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.routeLoadTest import start_mock_finnhub, write_fixtures
+
+RATE_PER_MINUTE = 1200      # 20 calls / s
+BURST = 10
+
+
+def main(count: int):
+    os.environ["FINNHUB_BASE_URL"] = start_mock_finnhub()
+    os.environ["FINNHUB_RATE_PER_MINUTE"] = str(RATE_PER_MINUTE)
+    os.environ["FINNHUB_BURST"] = str(BURST)
+
+    import backend.apis.finnhub as finnhub
+    import backend.stockBatch as stockBatch
+    from backend.data.priceSources import FixtureSource
+
+    symbols = [f"T{i:03d}" for i in range(count)]
+    fixtures = tempfile.mkdtemp()
+    write_fixtures(fixtures, symbols)
+    stockBatch.PRICE_CACHE.root = tempfile.mkdtemp()
+    stockBatch.PRICE_CACHE.source = FixtureSource(fixtures)
+
+    # Only Finnhub is under test: names and analyst scores stay local
+    async def company_name(symbol):
+        return symbol
+
+    stockBatch.asyncData.get_company_name = company_name
+    stockBatch.get_yahoo_consensus_score = lambda symbol: 50
+
+    bucket = finnhub.RATE_LIMITER
+    deepest = [bucket.tokens]
+    reserve = bucket._reserve
+
+    def watched_reserve():
+        wait = reserve()
+        deepest[0] = min(deepest[0], bucket.tokens)
+        return wait
+
+    bucket._reserve = watched_reserve
+
+    async def run():
+        started = time.perf_counter()
+        rows = [row async for row in stockBatch.rate_symbols(symbols)]
+        elapsed = time.perf_counter() - started
+        missing = sum(1 for row in rows if {"price", "fundamentals"} & set(row["missing"]))
+        print(f"{len(rows)} rows in {elapsed:.1f}s, rows missing price / fundamentals: {missing}")
+        print(f"deepest bucket debt: {-min(deepest[0], 0):.1f} tokens (in-flight cap {stockBatch.FINNHUB_IN_FLIGHT})")
+
+        started = time.perf_counter()
+        await asyncio.wait_for(finnhub.get_quote_async("SINGLE"), stockBatch.SOURCE_TIMEOUTS["price"])
+        print(f"single quote after the batch: {time.perf_counter() - started:.2f}s")
+        await finnhub.close_async_client()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
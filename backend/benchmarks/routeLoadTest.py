@@ -0,0 +1,158 @@
+# Load test for the async API routes against local mock upstreams
+#
+#   python -m backend.benchmarks.routeLoadTest [concurrency]
+#
+# - Finnhub is replaced by a local HTTP server that sleeps UPSTREAM_LATENCY
+#   per request (FINNHUB_BASE_URL points the client at it).
+# - Price downloads come from FixtureSource with the same injected latency.
+# Each scenario fires `concurrency` requests at once through an in-process
+# ASGI transport and compares the async route with a sync handler doing the
+# same blocking work (the pre-async implementation).
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+UPSTREAM_LATENCY = 0.2
+
+
+class MockFinnhubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(UPSTREAM_LATENCY)
+        body = b'{"c": 100.0, "metric": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockUpstreamServer(ThreadingHTTPServer):
+    request_queue_size = 1024     # the default backlog of 5 drops bursts of connections
+
+
+def _serve_mock_finnhub(port_queue):
+    server = MockUpstreamServer(("127.0.0.1", 0), MockFinnhubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_mock_finnhub() -> str:
+    # Separate process, so the mock's threads never compete with the app for the GIL
+    port_queue = multiprocessing.Queue()
+    multiprocessing.Process(target=_serve_mock_finnhub, args=(port_queue,), daemon=True).start()
+    return f"http://127.0.0.1:{port_queue.get()}"
+
+
+def write_fixtures(directory: str, tickers):
+    import numpy as np
+    import pandas as pd
+
+    index = pd.bdate_range("2018-01-01", pd.Timestamp.today(), name="Date")
+    for ticker in tickers:
+        closes = 100 * np.exp(np.cumsum(np.random.normal(0, 0.02, len(index))))
+        pd.DataFrame(
+            {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": 1e6},
+            index=index,
+        ).to_csv(os.path.join(directory, f"{ticker}.csv"))
+
+
+def build_app():
+    from datetime import date, timedelta
+
+    from fastapi import FastAPI
+
+    import backend.apis.finnhub as finnhub
+    from backend.backtesting.backtestEngine import BacktestEngine
+    from backend.data.priceCache import PRICE_CACHE
+    from backend.routes import backtest_routes
+    from backend.strategies.mockStrategy import MockStrategy
+
+    app = FastAPI()
+    app.include_router(backtest_routes.router, prefix="/api")
+
+    @app.get("/async/quote/{symbol}")
+    async def async_quote(symbol: str):
+        return await finnhub.get_quote_async(symbol)
+
+    @app.get("/sync/quote/{symbol}")
+    def sync_quote(symbol: str):
+        return finnhub.get_quote(symbol)
+
+    @app.post("/sync/backtest")
+    def sync_backtest(request: backtest_routes.BacktestRequest):
+        end_date = date.today()
+        start_date = end_date - timedelta(days=backtest_routes.TIME_PERIODS[request.time_period])
+        price_data = PRICE_CACHE.get(request.ticker, start_date, end_date, adjusted=True)
+        result = BacktestEngine(request.ticker, price_data, MockStrategy()).run()
+        return {"ticker": result.ticker, "strategy_return_pct": result.strategy_return_pct}
+
+    return app
+
+
+async def fire(app, method: str, paths, json=None):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.request(method, path, json=json(path) if json else None) for path in paths
+        ))
+        elapsed = time.perf_counter() - started
+
+    ok = sum(1 for r in responses if r.status_code == 200)
+    return ok, elapsed
+
+
+def main(concurrency: int):
+    os.environ["FINNHUB_BASE_URL"] = start_mock_finnhub()
+    # The mock closes every connection (HTTP/1.0), so give the async client
+    # enough connections that it is not throttled by reconnect churn
+    os.environ["FINNHUB_MAX_CONNECTIONS"] = str(concurrency)
+    # Measure the routes, not the Finnhub quota
+    os.environ["FINNHUB_RATE_PER_MINUTE"] = "1e9"
+    os.environ["FINNHUB_BURST"] = "1e9"
+
+    fixtures = tempfile.mkdtemp()
+    tickers = [f"T{i:03d}" for i in range(concurrency)]
+    write_fixtures(fixtures, tickers)
+
+    from backend.data import priceCache
+    from backend.data.priceSources import FixtureSource
+
+    app = build_app()
+
+    scenarios = [
+        ("quote sync     ", "GET", [f"/sync/quote/{t}" for t in tickers]),
+        ("quote async    ", "GET", [f"/async/quote/{t}" for t in tickers]),
+        ("backtest sync  ", "POST", ["/sync/backtest"] * concurrency),
+        ("backtest async ", "POST", ["/api/backtest"] * concurrency),
+    ]
+
+    async def run_all():
+        for name, method, paths in scenarios:
+            # Fresh cache per scenario so every backtest pays the upstream latency
+            priceCache.PRICE_CACHE.root = tempfile.mkdtemp()
+            priceCache.PRICE_CACHE.source = FixtureSource(fixtures, latency=UPSTREAM_LATENCY)
+            ticker_iter = iter(tickers)
+
+            def body(_):
+                return {"ticker": next(ticker_iter), "strategy": "mock", "time_period": "1y"}
+
+            ok, elapsed = await fire(app, method, paths, json=body if method == "POST" else None)
+            print(f"{name}: {ok}/{len(paths)} ok in {elapsed:.2f}s ({len(paths) / elapsed:.1f} req/s)")
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
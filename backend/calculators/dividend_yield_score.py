@@ -1,8 +1,8 @@
-import backend.apis.finnhub as finnhub
+import numpy as np
 
 
 def get_dividend_yield_score(stock_obj) -> float:
-    metrics = finnhub.get_metrics(stock_obj.symbol)["metric"]
+    metrics = stock_obj.get_fundamentals()     # shared snapshot, fetched once per Stock
     dividend_yield = metrics.get("dividendYield")
     if dividend_yield is None or dividend_yield < 0:
         return 50  # Neutral score if no data or invalid dividend yield
@@ -18,3 +18,13 @@ def get_dividend_yield_score(stock_obj) -> float:
         return 20
     else:
         return 0
+
+
+# Vectorized version for batch scoring (NaN = no data)
+def dividend_yield_scores(dividend_yields: np.ndarray) -> np.ndarray:
+    dy = np.asarray(dividend_yields, dtype=float)
+    return np.select(
+        [np.isnan(dy) | (dy < 0), dy > 5, dy > 4, dy > 3, dy > 2, dy > 1],
+        [50, 100, 80, 60, 40, 20],
+        default=0
+    ).astype(float)
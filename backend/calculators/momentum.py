@@ -1,9 +1,8 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-import time
+import numpy as np
 import pandas as pd
-import backend.apis.yahoo as yahoo
 
 if TYPE_CHECKING:
     from backend.stock import Stock
@@ -15,14 +14,11 @@ def get_momentum_score(stock_obj: Stock) -> float:
     if current_price is None:   
         stock_obj.set_currentPrice()              
         current_price = stock_obj.current_price             
-    one_year_ago = int(time.time()) - 365 * 24 * 60 * 60      # Timestamp for one year ago
-    today = int(time.time())                        # Current timestamp
-
-    candles = yahoo.get_candles(stock_obj.symbol, "1d", one_year_ago, today)
-    if candles is None or candles.empty:             # No data available
+    candles = stock_obj.get_candles()       # one year of daily prices, shared via the price cache
+    if candles is None or len(candles) == 0:             # No data available
         return 50
 
-    one_year_ago_price = candles["Close"].iloc[0]      # Closing price one year ago
+    one_year_ago_price = candles.close[0]      # Closing price one year ago
     if one_year_ago_price == 0 or pd.isna(one_year_ago_price):
         return 50    # Avoid division by zero or NaN
 
@@ -40,3 +36,16 @@ def get_momentum_score(stock_obj: Stock) -> float:
         return 20
     else:
         return 0
+
+
+# Vectorized version for batch scoring: first_closes is the close one year
+# ago per symbol (NaN when there are no candles)
+def momentum_scores(current_prices: np.ndarray, first_closes: np.ndarray) -> np.ndarray:
+    first = np.asarray(first_closes, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        momentum = (np.asarray(current_prices, dtype=float) - first) / first * 100
+    return np.select(
+        [np.isnan(first) | (first == 0), momentum >= 20, momentum >= 10, momentum >= 0, momentum >= -10, momentum >= -20],
+        [50, 100, 80, 60, 40, 20],
+        default=0
+    ).astype(float)
@@ -1,4 +1,4 @@
-import backend.apis.finnhub as finnhub
+import numpy as np
 
 
 def get_pb_ratio_score(stock_obj) -> float:
@@ -6,7 +6,7 @@ def get_pb_ratio_score(stock_obj) -> float:
     if current_price is None:
         stock_obj.set_currentPrice()
         current_price = stock_obj.current_price
-    metrics = finnhub.get_metrics(stock_obj.symbol)["metric"]
+    metrics = stock_obj.get_fundamentals()     # shared snapshot, fetched once per Stock
     bvps = metrics.get("bookValuePerShareAnnual")
     if bvps is None or bvps == 0:
         return 50  # Neutral score if no data or invalid book value
@@ -23,3 +23,15 @@ def get_pb_ratio_score(stock_obj) -> float:
         return 20
     else:
         return 0
+
+
+# Vectorized version for batch scoring (NaN = no data)
+def pb_ratio_scores(current_prices: np.ndarray, book_values: np.ndarray) -> np.ndarray:
+    bvps = np.asarray(book_values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pb = np.asarray(current_prices, dtype=float) / bvps
+    return np.select(
+        [np.isnan(bvps) | (bvps == 0), pb < 1, pb < 2, pb < 3, pb < 4, pb < 5],
+        [50, 100, 80, 60, 40, 20],
+        default=0
+    ).astype(float)
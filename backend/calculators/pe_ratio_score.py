@@ -1,8 +1,8 @@
-import backend.apis.finnhub as finnhub
+import numpy as np
 
 
 def get_pe_ratio_score(stock_obj) -> float:
-    metrics = finnhub.get_metrics(stock_obj.symbol)["metric"]
+    metrics = stock_obj.get_fundamentals()     # shared snapshot, fetched once per Stock
     pe_ratio = metrics.get("peBasicExclExtraTTM")
     if pe_ratio is None or pe_ratio <= 0:
         return 50  # Neutral score if no data or invalid PE ratio
@@ -18,3 +18,13 @@ def get_pe_ratio_score(stock_obj) -> float:
         return 20
     else:
         return 0
+
+
+# Vectorized version for batch scoring (NaN = no data)
+def pe_ratio_scores(pe_ratios: np.ndarray) -> np.ndarray:
+    pe = np.asarray(pe_ratios, dtype=float)
+    return np.select(
+        [np.isnan(pe) | (pe <= 0), pe < 10, pe < 15, pe < 20, pe < 25, pe < 30],
+        [50, 100, 80, 60, 40, 20],
+        default=0
+    ).astype(float)
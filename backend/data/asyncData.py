@@ -0,0 +1,40 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import yfinance as yf
+
+from backend.backtesting.priceSeries import PriceSeries
+from backend.data.priceCache import PRICE_CACHE
+
+
+# -------------------------------------------------
+# Async data access for the API routes
+# -------------------------------------------------
+# yfinance and the price cache are blocking, so they run on a dedicated
+# I/O thread pool rather than Starlette's shared threadpool (which also
+# serves every sync dependency and handler). Finnhub has native async
+# functions in backend/APIS/finnhub.py.
+
+IO_WORKERS = int(os.getenv("IO_WORKERS", "32"))
+
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+
+
+async def offload(fn, *args):
+    """Run a blocking call on the I/O pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_EXECUTOR, fn, *args)
+
+
+async def get_prices(ticker: str, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> PriceSeries:
+    return await offload(PRICE_CACHE.get, ticker, start, end, interval, adjusted)
+
+
+def _company_name(symbol: str) -> str:
+    return yf.Ticker(symbol).info.get("longName", "Unknown Company")
+
+
+async def get_company_name(symbol: str) -> str:
+    return await offload(_company_name, symbol)
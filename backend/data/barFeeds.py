@@ -0,0 +1,78 @@
+import asyncio
+import heapq
+from datetime import date, timedelta
+from typing import List
+
+from backend.data import asyncData
+from backend.data.priceCache import PRICE_CACHE
+
+
+# -------------------------------------------------
+# Bar feeds for the signal service
+# -------------------------------------------------
+# A feed is any async iterable of (ticker, bar) pairs, where bar is a
+# PriceSeries.bar dict (date, open, high, low, close, volume, symbol).
+# - ReplayFeed: stored bars from the price cache, all tickers merged in
+#   date order (tests, demos, catching up after downtime)
+# - PollingFeed: re-reads the last few days of every ticker on a timer;
+#   the cache only downloads what it does not hold yet, and only bars newer
+#   than the last one sent are yielded
+
+
+class ReplayFeed:
+    def __init__(self, tickers: List[str], start: date, end: date, interval: str = "1d",
+                 adjusted: bool = True, delay: float = 0.0, cache=PRICE_CACHE):
+        self.tickers = [ticker.upper() for ticker in dict.fromkeys(tickers)]
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.adjusted = adjusted
+        self.delay = delay          # seconds between bars (0 = as fast as possible)
+        self.cache = cache
+
+    async def __aiter__(self):
+        series = await asyncio.gather(*(
+            asyncData.offload(self.cache.get, ticker, self.start, self.end, self.interval, self.adjusted)
+            for ticker in self.tickers
+        ))
+
+        # k-way merge on (date, ticker order): one heap entry per ticker
+        heap = [(s.dates[0], t, 0) for t, s in enumerate(series) if len(s)]
+        heapq.heapify(heap)
+        while heap:
+            _, t, i = heapq.heappop(heap)
+            yield self.tickers[t], series[t].bar(i)
+            if i + 1 < len(series[t]):
+                heapq.heappush(heap, (series[t].dates[i + 1], t, i + 1))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+
+
+class PollingFeed:
+    def __init__(self, tickers: List[str], every: float = 60.0, interval: str = "1d",
+                 adjusted: bool = True, lookback_days: int = 5, cache=PRICE_CACHE):
+        self.tickers = [ticker.upper() for ticker in dict.fromkeys(tickers)]
+        self.every = every
+        self.interval = interval
+        self.adjusted = adjusted
+        self.lookback_days = lookback_days
+        self.cache = cache
+        self.last_sent = {}         # ticker -> datetime64 of the last bar yielded
+
+    async def __aiter__(self):
+        while True:
+            end = date.today()     # the cache only serves closed days
+            start = end - timedelta(days=self.lookback_days)
+            for ticker in self.tickers:
+                try:
+                    series = await asyncData.offload(self.cache.get, ticker, start, end, self.interval, self.adjusted)
+                except Exception as e:
+                    print(f"Polling {ticker} failed: {e}")
+                    continue
+                last = self.last_sent.get(ticker)
+                for i in range(len(series)):
+                    if last is None or series.dates[i] > last:
+                        yield ticker, series.bar(i)
+                if len(series):
+                    self.last_sent[ticker] = series.dates[-1]
+            await asyncio.sleep(self.every)
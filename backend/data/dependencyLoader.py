@@ -0,0 +1,49 @@
+import asyncio
+
+
+# -------------------------------------------------
+# Dependency-aware concurrent loader
+# -------------------------------------------------
+# Each Step is an async callable with the names of the steps it needs.
+# Every step starts as soon as its dependencies have settled, so all
+# independent upstream requests are in flight at once and the total
+# latency is the slowest chain, not the sum of every call.
+#
+# A step that raises or exceeds its timeout is recorded as failed; steps
+# that depend on it still run and can read the failure from `errors` to
+# degrade.
+
+
+class Step:
+    def __init__(self, name: str, run, deps=(), timeout: float = None):
+        self.name = name
+        self.run = run              # async callable taking no arguments
+        self.deps = tuple(deps)
+        self.timeout = timeout      # seconds, None = no limit
+
+
+async def run_steps(steps, errors: dict = None) -> dict:
+    """
+    Run `steps` concurrently in dependency order. Returns {name: exception}
+    for every step that failed (asyncio.TimeoutError for timeouts); pass
+    `errors` to have it filled in while the steps run.
+    """
+    tasks = {}
+    errors = {} if errors is None else errors
+
+    async def execute(step: Step):
+        if step.deps:
+            await asyncio.gather(*(tasks[dep] for dep in step.deps))
+        try:
+            await asyncio.wait_for(step.run(), step.timeout)
+        except Exception as e:
+            errors[step.name] = e
+
+    for step in steps:
+        missing = [dep for dep in step.deps if dep not in tasks]
+        if missing:
+            raise ValueError(f"Step {step.name!r} depends on {missing}, which must be listed before it")
+        tasks[step.name] = asyncio.ensure_future(execute(step))
+
+    await asyncio.gather(*tasks.values())
+    return errors
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+import backend.apis.finnhub as finnhub
+
+
+# -------------------------------------------------
+# Fundamentals snapshot (Finnhub /stock/metric)
+# -------------------------------------------------
+# The metric=all payload is large and changes at most daily, so one fetch
+# per symbol is shared by every score calculator and kept for
+# FUNDAMENTALS_TTL seconds across requests.
+
+FUNDAMENTALS_TTL = float(os.getenv("FUNDAMENTALS_TTL", "900"))
+
+
+class FundamentalsCache:
+    def __init__(self, ttl: float = FUNDAMENTALS_TTL):
+        self.ttl = ttl
+        self.entries = {}       # symbol -> (expires_at, metrics)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, symbol: str):
+        with self.lock:
+            entry = self.entries.get(symbol)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _store(self, symbol: str, metrics: dict) -> dict:
+        with self.lock:
+            self.entries[symbol] = (time.monotonic() + self.ttl, metrics)
+        return metrics
+
+    def get(self, symbol: str) -> dict:
+        """The "metric" dict for `symbol` (empty if Finnhub has none)."""
+        symbol = symbol.upper()
+        metrics = self._lookup(symbol)
+        if metrics is None:
+            # Concurrent misses for the same symbol are coalesced by the client
+            metrics = self._store(symbol, finnhub.get_metrics(symbol).get("metric") or {})
+        return metrics
+
+    async def get_async(self, symbol: str, timeout: float = None) -> dict:
+        """timeout covers the Finnhub call itself, not its wait on the rate limiter."""
+        symbol = symbol.upper()
+        metrics = self._lookup(symbol)
+        if metrics is None:
+            payload = await finnhub.get_metrics_async(symbol, timeout)
+            metrics = self._store(symbol, payload.get("metric") or {})
+        return metrics
+
+    def invalidate(self, symbol: str = None):
+        with self.lock:
+            if symbol is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(symbol.upper(), None)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+FUNDAMENTALS = FundamentalsCache()
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from datetime import date
+from typing import List
+
+import numpy as np
+
+from backend.backtesting.pricePanel import PricePanel, write_panel
+from backend.backtesting.priceSeries import PriceSeries
+from backend.data.batchFetcher import BATCH_FETCHER
+from backend.data.priceSources import date_unit
+
+
+# -------------------------------------------------
+# Shared on-disk price panels
+# -------------------------------------------------
+# Builds a PricePanel store (see pricePanel.py) for a ticker universe once,
+# through the normal fetch path, so worker processes can all memory-map the
+# same read-only file instead of each loading or receiving its own copy:
+# 1. fetch_many downloads / caches every ticker and gives the date axis
+#    (the union of every ticker's bars)
+# 2. each ticker is read back from the memory-mapped price cache and
+#    written into its (dates x fields) columns of the store
+# A store is named after its spec (tickers, window, interval, adjusted), so
+# building the same universe again just opens the existing store. Tickers
+# that failed to fetch or have no bars are left out and listed in the
+# store's metadata, and such an incomplete store is rebuilt by the next
+# build (the tickers already fetched come from the price cache), so an
+# outage is retried instead of being kept. When no ticker has data at all,
+# nothing is written and build_panel raises.
+
+PANEL_DIR = os.getenv("PRICE_PANEL_DIR", ".price_panels")
+
+
+def panel_path(tickers: List[str], start: date, end: date, interval: str = "1d", adjusted: bool = False,
+               root: str = PANEL_DIR) -> str:
+    spec = json.dumps([sorted(tickers), start.isoformat(), end.isoformat(), interval, adjusted])
+    return os.path.join(root, hashlib.sha1(spec.encode()).hexdigest()[:16])
+
+
+def build_panel(tickers: List[str], start: date, end: date, interval: str = "1d", adjusted: bool = False,
+                root: str = PANEL_DIR, fetcher=BATCH_FETCHER, dtype=np.float64) -> PricePanel:
+    """The memory-mapped panel of tickers over [start, end), building the store if it does not exist yet."""
+    path = panel_path(tickers, start, end, interval, adjusted, root)
+    meta = PricePanel.metadata(path)
+    if meta is None or meta["errors"]:
+        _write_store(path, tickers, start, end, interval, adjusted, fetcher, dtype)
+    return PricePanel.open(path)
+
+
+def _write_store(path, tickers, start, end, interval, adjusted, fetcher, dtype):
+    unit = f"datetime64[{date_unit(interval)}]"
+    dates, kept, errors = np.empty(0, dtype=unit), [], {}
+    for ticker, series, error in fetcher.fetch_many(tickers, start, end, interval, adjusted):
+        if error is not None:
+            errors[ticker] = str(error)
+        elif not len(series):
+            errors[ticker] = "No price data"
+        else:
+            dates = np.union1d(dates, series.dates.astype(unit))
+            kept.append(ticker)
+    if not kept:
+        raise ValueError(f"No price data for any ticker: {errors}")
+
+    def series_for(ticker):
+        # Already cached by the first pass, so this is a memory-mapped read
+        return fetcher.cache.mapped(ticker, start, end, interval, adjusted)
+
+    write_panel(
+        path, dates, kept, series_for, PriceSeries.FIELDS, dtype,
+        interval=interval, adjusted=adjusted, start=start.isoformat(), end=end.isoformat(), errors=errors,
+    )
+
+
+# Build once, then compare a memory-mapped view against the cached series
+if __name__ == "__main__":
+    import sys
+    import time
+    from datetime import timedelta
+
+    tickers = sys.argv[1:] or ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL"]
+    end = date.today()
+    start = end - timedelta(days=5 * 365)
+
+    started = time.perf_counter()
+    panel = build_panel(tickers, start, end)
+    print(f"{len(panel)} dates x {len(panel.tickers)} tickers at {panel.path} in {time.perf_counter() - started:.1f}s")
+
+    for ticker in panel.tickers:
+        view = panel.series(ticker)
+        cached = BATCH_FETCHER.cache.get(ticker, start, end)
+        same = all(np.array_equal(getattr(view, field), getattr(cached, field), equal_nan=True) for field in PriceSeries.FIELDS)
+        print(f"{ticker}: {len(view)} bars, memory-mapped view: {isinstance(view.close.base, np.memmap)}, matches cache: {same}")
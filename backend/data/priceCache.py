@@ -0,0 +1,305 @@
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.backtesting.priceSeries import PriceSeries
+from backend.data.priceSources import YahooSource, date_unit
+
+
+# -------------------------------------------------
+# Local OHLCV cache
+# -------------------------------------------------
+# One entry per (ticker, interval, adjusted) stored as two .npy files:
+#   <TICKER>.dates.npy  datetime64 bar dates
+#   <TICKER>.ohlcv.npy  5 x n float64 (open, high, low, close, volume)
+# plus <TICKER>.json recording the [start, end) range already fetched.
+# Requests inside that range are served offline; otherwise only the
+# missing head / tail is fetched and merged in.
+#
+# Yahoo answers network errors and unknown tickers with an empty frame
+# rather than an exception, so a fetch that returns no bars for a range
+# with weekdays in it is never recorded as covered: the next request
+# fetches it again instead of serving the gap as "no data" forever.
+# The exception is a head / tail of a ticker that is already cached and
+# ended at least EMPTY_SETTLE_DAYS ago: no bars are still coming for it
+# (an exchange holiday, the days before a listing or after a delisting),
+# so it is recorded as covered rather than fetched again on every request.
+# An empty tail reaching up to today is covered up to that settled date.
+#
+# An entry's files are replaced one after the other, so they are only
+# read under the entry's lock.
+
+CACHE_DIR = os.getenv("PRICE_CACHE_DIR", ".price_cache")
+EMPTY_SETTLE_DAYS = int(os.getenv("PRICE_CACHE_EMPTY_SETTLE_DAYS", "5"))
+
+
+class PriceCache:
+    def __init__(self, root: str = CACHE_DIR, source=None, mmap: bool = False):
+        self.root = root
+        self.source = source or YahooSource()
+        # mmap=True maps the .npy files instead of reading them. Off by
+        # default: Windows cannot replace a file that is still mapped, which
+        # would break top-ups while older series are alive.
+        self.mmap = mmap
+
+        self.hits = 0
+        self.misses = 0
+        self.top_ups = 0
+
+        # One lock per entry so concurrent fetches of different tickers run in
+        # parallel while two requests for the same entry never race on its files.
+        self._lock = threading.Lock()
+        self._entry_locks = {}
+
+    # ---- Public API ----
+
+    def get(self, ticker: str, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> PriceSeries:
+        """Bars for [start, end), fetching only what the cache does not cover yet."""
+        ticker = ticker.upper()
+        end = min(end, date.today())     # never record days that have not closed yet
+
+        with self._entry_lock(ticker, interval, adjusted):
+            coverage = self._read_coverage(ticker, interval, adjusted)
+
+            if coverage is None:
+                self._count("misses")
+                series = self.source.fetch(ticker, start, end, interval, adjusted)
+                if _fetched(series, start, end):
+                    self._write(ticker, interval, adjusted, series, start, end)
+
+            elif coverage[0] <= start and end <= coverage[1]:
+                self._count("hits")
+                series = self._load(ticker, interval, adjusted)
+
+            else:
+                self._count("top_ups")
+                cached_start, cached_end = coverage
+                parts = [self._load(ticker, interval, adjusted)]
+                if start < cached_start:
+                    head = self.source.fetch(ticker, start, cached_start, interval, adjusted)
+                    parts.insert(0, head)
+                    if _fetched(head, start, cached_start, known=True):
+                        cached_start = start
+                if end > cached_end:
+                    tail = self.source.fetch(ticker, cached_end, end, interval, adjusted)
+                    parts.append(tail)
+                    if _fetched(tail, cached_end, end, known=True):
+                        cached_end = end
+                    elif not len(tail):
+                        cached_end = max(cached_end, _settled_until())
+
+                series = _merge(ticker, parts)
+                if (cached_start, cached_end) != coverage:
+                    self._write(ticker, interval, adjusted, series, cached_start, cached_end)
+
+        return _slice_dates(series, start, end)
+
+    def mapped(self, ticker: str, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> PriceSeries:
+        """
+        Like get, but the bars are memory-mapped from the cache files, so a
+        long minute-bar history is paged in as it is read instead of loaded
+        up front (whatever the mmap setting).
+        """
+        ticker = ticker.upper()
+        end = min(end, date.today())
+        series = self._load_covered(ticker, start, end, interval, adjusted, mmap=True)
+        if series is None:
+            fetched = self.get(ticker, start, end, interval, adjusted)     # fetch what is missing first
+            with self._entry_lock(ticker, interval, adjusted):
+                if self._read_coverage(ticker, interval, adjusted) is None:
+                    return fetched      # nothing was cached (empty fetch)
+                series = self._load(ticker, interval, adjusted, mmap=True)
+        return _slice_dates(series, start, end)
+
+    def get_many(self, tickers, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> dict:
+        """
+        {ticker: bars for [start, end)} for a ticker list. Covered tickers are
+        read from disk; all the others are downloaded in one bulk request
+        when the source supports fetch_many.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        end = min(end, date.today())
+        if not hasattr(self.source, "fetch_many"):
+            return {ticker: self.get(ticker, start, end, interval, adjusted) for ticker in tickers}
+
+        result = {}
+        stale = []
+        for ticker in tickers:
+            series = self._load_covered(ticker, start, end, interval, adjusted)
+            if series is not None:
+                result[ticker] = _slice_dates(series, start, end)
+            else:
+                stale.append(ticker)
+
+        if stale:
+            fetched = self.source.fetch_many(stale, start, end, interval, adjusted)
+            for ticker in stale:
+                result[ticker] = self._store_range(ticker, interval, adjusted, fetched[ticker], start, end)
+
+        return {ticker: result[ticker] for ticker in tickers}
+
+    def _load_covered(self, ticker: str, start: date, end: date, interval: str, adjusted: bool, mmap: bool = None):
+        """The cached entry if it covers [start, end) (counted as a hit), else None."""
+        with self._entry_lock(ticker, interval, adjusted):
+            coverage = self._read_coverage(ticker, interval, adjusted)
+            if coverage is None or not (coverage[0] <= start and end <= coverage[1]):
+                return None
+            self._count("hits")
+            return self._load(ticker, interval, adjusted, mmap)
+
+    def _store_range(self, ticker: str, interval: str, adjusted: bool, series: PriceSeries, start: date, end: date) -> PriceSeries:
+        # Merge a freshly fetched [start, end) into the entry. Coverage must
+        # stay contiguous, so a gap between the cached range and this one is
+        # fetched too; if that fails, the entry is left as it was.
+        with self._entry_lock(ticker, interval, adjusted):
+            coverage = self._read_coverage(ticker, interval, adjusted)
+            if not _fetched(series, start, end, known=coverage is not None):
+                self._count("misses")
+            elif coverage is None:
+                self._count("misses")
+                self._write(ticker, interval, adjusted, series, start, end)
+            else:
+                self._count("top_ups")
+                parts = [self._load(ticker, interval, adjusted), series]
+                for gap_start, gap_end in ((coverage[1], start), (end, coverage[0])):
+                    if gap_start < gap_end:
+                        gap = self.source.fetch(ticker, gap_start, gap_end, interval, adjusted)
+                        if not _fetched(gap, gap_start, gap_end, known=True):
+                            return series
+                        parts.append(gap)
+                merged = _merge(ticker, parts)
+                self._write(ticker, interval, adjusted, merged, min(start, coverage[0]), max(end, coverage[1]))
+        return series
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses + self.top_ups
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "top_ups": self.top_ups,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def _entry_lock(self, ticker: str, interval: str, adjusted: bool) -> threading.Lock:
+        with self._lock:
+            return self._entry_locks.setdefault((ticker, interval, adjusted), threading.Lock())
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    # ---- Storage ----
+
+    def _path(self, ticker: str, interval: str, adjusted: bool) -> str:
+        return os.path.join(self.root, interval, "adjusted" if adjusted else "raw", ticker)
+
+    def _read_coverage(self, ticker: str, interval: str, adjusted: bool):
+        path = self._path(ticker, interval, adjusted) + ".json"
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f)
+        return date.fromisoformat(meta["start"]), date.fromisoformat(meta["end"])
+
+    def _load(self, ticker: str, interval: str, adjusted: bool, mmap: bool = None) -> PriceSeries:
+        path = self._path(ticker, interval, adjusted)
+        mmap_mode = "r" if (self.mmap if mmap is None else mmap) else None
+        dates = np.load(path + ".dates.npy", mmap_mode=mmap_mode)
+        ohlcv = np.load(path + ".ohlcv.npy", mmap_mode=mmap_mode)
+        return PriceSeries(
+            ticker,
+            dates,
+            open=ohlcv[0],
+            high=ohlcv[1],
+            low=ohlcv[2],
+            close=ohlcv[3],
+            volume=ohlcv[4],
+        )
+
+    def _write(self, ticker: str, interval: str, adjusted: bool, series: PriceSeries, start: date, end: date):
+        path = self._path(ticker, interval, adjusted)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        dates = series.dates.astype(f"datetime64[{date_unit(interval)}]")
+        ohlcv = np.vstack([getattr(series, field) for field in PriceSeries.FIELDS])
+
+        # Write to temp files first so a crash never leaves a half-written entry
+        for suffix, array in ((".dates.npy", dates), (".ohlcv.npy", ohlcv)):
+            with open(path + suffix + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + suffix + ".tmp", path + suffix)
+
+        with open(path + ".json.tmp", "w") as f:
+            json.dump({"start": start.isoformat(), "end": end.isoformat()}, f)
+        os.replace(path + ".json.tmp", path + ".json")
+
+
+def _merge(ticker: str, parts) -> PriceSeries:
+    """Concatenate series, keeping the last copy of any duplicated date."""
+    dates = np.concatenate([part.dates for part in parts])
+    columns = {field: np.concatenate([getattr(part, field) for part in parts]) for field in PriceSeries.FIELDS}
+
+    # np.unique keeps the first occurrence, so search the reversed arrays
+    _, last = np.unique(dates[::-1], return_index=True)
+    keep = len(dates) - 1 - last
+
+    return PriceSeries(ticker, dates[keep], **{field: values[keep] for field, values in columns.items()})
+
+
+def _fetched(series: PriceSeries, start: date, end: date, known: bool = False) -> bool:
+    """
+    Whether a fetch of [start, end) may be recorded as covered: it returned
+    bars, there were none to return, or the ticker is `known` (already
+    cached) and the range is settled.
+    """
+    return len(series) > 0 or np.busday_count(start, end) == 0 or (known and end <= _settled_until())
+
+
+def _settled_until() -> date:
+    """Ranges ending on or before this date get no more bars."""
+    return date.today() - timedelta(days=EMPTY_SETTLE_DAYS)
+
+
+def _slice_dates(series: PriceSeries, start: date, end: date) -> PriceSeries:
+    lo = np.searchsorted(series.dates, np.datetime64(start, "D"), side="left")
+    hi = np.searchsorted(series.dates, np.datetime64(end, "D"), side="left")
+    return series[lo:hi]
+
+
+PRICE_CACHE = PriceCache()
+
+
+# Test
+if __name__ == "__main__":
+    cache = PriceCache()
+    series = cache.get("AAPL", date(2020, 1, 1), date(2022, 12, 31))
+    print(len(series), series.date_at(0), series.date_at(-1))
+    cache.get("AAPL", date(2021, 1, 1), date(2021, 12, 31))
+    print(cache.stats())
+
+    # An empty fetch (Yahoo's answer to a network error) is not recorded as
+    # covered, so the next request retries it
+    import tempfile
+
+    from backend.data.priceSources import empty_series
+
+    class FlakySource:
+        def __init__(self, source):
+            self.source = source
+            self.down = True
+
+        def fetch(self, ticker, start, end, interval="1d", adjusted=False):
+            if self.down:
+                return empty_series(ticker, interval)
+            return self.source.fetch(ticker, start, end, interval, adjusted)
+
+    flaky = FlakySource(cache.source)
+    offline = PriceCache(tempfile.mkdtemp(), flaky)
+    print("while down:", len(offline.get("AAPL", date(2020, 1, 1), date(2022, 12, 31))), "bars,",
+          "coverage", offline._read_coverage("AAPL", "1d", False))
+    flaky.down = False
+    print("once back:", len(offline.get("AAPL", date(2020, 1, 1), date(2022, 12, 31))), "bars,",
+          "coverage", offline._read_coverage("AAPL", "1d", False))
@@ -0,0 +1,188 @@
+import os
+import re
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from backend.backtesting.priceSeries import PriceSeries
+
+
+# -------------------------------------------------
+# Price data sources
+# -------------------------------------------------
+# A source returns OHLCV bars for [start, end) as a PriceSeries (end is
+# exclusive, like yf.download). PriceCache only talks to this interface,
+# so the Yahoo source can be swapped for local fixtures.
+#
+# fetch_many(tickers, ...) returns {ticker: PriceSeries} from a single bulk
+# request where the provider supports one.
+
+INTERVAL_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+INTRADAY_INTERVALS = set(INTERVAL_MINUTES)
+
+# Longest [start, end) Yahoo serves in one intraday request; longer ranges
+# are fetched window by window
+MAX_REQUEST_DAYS = {"1m": 7, "60m": 730, "1h": 730}
+DEFAULT_INTRADAY_REQUEST_DAYS = 60
+
+EXCHANGE_TZ = os.getenv("EXCHANGE_TZ", "America/New_York")
+UTC_OFFSET = re.compile(r"[+-]\d\d:?\d\d$")
+
+
+def date_unit(interval: str) -> str:
+    """datetime64 unit used to store bars of the given interval."""
+    return "m" if interval in INTRADAY_INTERVALS else "D"
+
+
+def empty_series(symbol: str, interval: str = "1d") -> PriceSeries:
+    empty = np.array([], dtype=np.float64)
+    return PriceSeries(
+        symbol,
+        np.array([], dtype=f"datetime64[{date_unit(interval)}]"),
+        open=empty,
+        close=empty,
+        high=empty,
+        low=empty,
+        volume=empty,
+    )
+
+
+def request_windows(start: date, end: date, interval: str):
+    """[start, end) split into ranges a single request may cover."""
+    if interval not in INTRADAY_INTERVALS:
+        return [(start, end)]
+    step = timedelta(days=MAX_REQUEST_DAYS.get(interval, DEFAULT_INTRADAY_REQUEST_DAYS))
+    windows = []
+    while start < end:
+        windows.append((start, min(start + step, end)))
+        start += step
+    return windows
+
+
+def _joined(ticker: str, parts, interval: str) -> PriceSeries:
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return empty_series(ticker, interval)
+    return parts[0] if len(parts) == 1 else PriceSeries.concat(parts, ticker)
+
+
+def wall_time_index(df) -> pd.DataFrame:
+    """
+    df with its CSV timestamp strings parsed. Intraday exports carry UTC
+    offsets that change with DST, so they are converted to exchange wall
+    time; naive timestamps are wall time already.
+    """
+    if len(df) and not isinstance(df.index, pd.DatetimeIndex):
+        index = pd.to_datetime(df.index, utc=True)
+        if UTC_OFFSET.search(str(df.index[0])):
+            df.index = index.tz_convert(EXCHANGE_TZ).tz_localize(None)
+        else:
+            df.index = index.tz_localize(None)
+    return df
+
+
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+class YahooSource:
+    def fetch(self, ticker: str, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> PriceSeries:
+        return _joined(ticker, (
+            self._fetch_window(ticker, window_start, window_end, interval, adjusted)
+            for window_start, window_end in request_windows(start, end, interval)
+        ), interval)
+
+    def _fetch_window(self, ticker: str, start: date, end: date, interval: str, adjusted: bool) -> PriceSeries:
+        # Ticker.history instead of yf.download: download keeps module-level
+        # state shared between calls, so it is not safe to run from several
+        # threads at once (see BatchFetcher).
+        df = yf.Ticker(ticker).history(
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=adjusted,
+            actions=False
+        )
+
+        if df is None or df.empty:
+            return empty_series(ticker, interval)
+
+        return PriceSeries.from_dataframe(df, ticker, date_unit=date_unit(interval))
+
+    def fetch_many(self, tickers, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> dict:
+        windows = [
+            self._download_window(tickers, window_start, window_end, interval, adjusted)
+            for window_start, window_end in request_windows(start, end, interval)
+        ]
+        return {ticker: _joined(ticker, (window[ticker] for window in windows), interval) for ticker in tickers}
+
+    def _download_window(self, tickers, start: date, end: date, interval: str, adjusted: bool) -> dict:
+        # One multi-symbol yf.download; serialized because download is not thread-safe
+        with _DOWNLOAD_LOCK:
+            df = yf.download(
+                list(tickers),
+                start=start,
+                end=end,
+                interval=interval,
+                auto_adjust=adjusted,
+                actions=False,
+                group_by="ticker",
+                threads=True,
+                progress=False
+            )
+
+        result = {}
+        for ticker in tickers:
+            if df is None or df.empty or ticker not in df.columns.get_level_values(0):
+                result[ticker] = empty_series(ticker, interval)
+                continue
+            bars = df[ticker].dropna(how="all")
+            result[ticker] = (
+                PriceSeries.from_dataframe(bars, ticker, date_unit=date_unit(interval))
+                if not bars.empty else empty_series(ticker, interval)
+            )
+        return result
+
+
+class FixtureSource:
+    """
+    Reads bars from local CSV files named <TICKER>.csv with
+    Date, Open, High, Low, Close, Volume columns (the layout of
+    DataFrame.to_csv on a yfinance download). Used for tests and offline runs.
+
+    latency (seconds) is slept on every fetch to stand in for a network
+    round trip when benchmarking concurrent fetches.
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+        self.calls = 0
+
+    def fetch(self, ticker: str, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> PriceSeries:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._read(ticker, start, end, interval)
+
+    def _read(self, ticker: str, start: date, end: date, interval: str) -> PriceSeries:
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return empty_series(ticker, interval)
+
+        df = wall_time_index(pd.read_csv(path, index_col=0))
+        df = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+        if df.empty:
+            return empty_series(ticker, interval)
+
+        return PriceSeries.from_dataframe(df, ticker, date_unit=date_unit(interval))
+
+    def fetch_many(self, tickers, start: date, end: date, interval: str = "1d", adjusted: bool = False) -> dict:
+        # A bulk request pays the latency once
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {ticker: self._read(ticker, start, end, interval) for ticker in tickers}
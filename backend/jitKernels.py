@@ -0,0 +1,185 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:        # optional dependency
+    numba = None
+
+
+# -------------------------------------------------
+# Optional JIT-compiled kernels
+# -------------------------------------------------
+# Plain loops over float arrays for the engine's position / equity state
+# machine and the built-in indicators. With numba installed they are
+# compiled with @njit (cached on disk after the first call). Without it
+# they run as ordinary Python: the state machine is still cheap that way,
+# but IndicatorStore keeps the NumPy indicators unless NUMBA_AVAILABLE.
+# Each kernel reproduces its counterpart's arithmetic in the same order.
+# Only comparison-based indicators have kernels: moving averages and RSI
+# need exact window sums (math.fsum of the window, see vectorIndicators),
+# which a float loop cannot produce, so they stay on the NumPy path.
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def jit(fn):
+    return numba.njit(cache=True)(fn) if NUMBA_AVAILABLE else fn
+
+
+# ---- Position / equity state machine (BacktestEngine.run) ----
+
+@jit
+def position_kernel(opens, closes, signals):
+    """
+    Returns (equity, peak_equity, trades, days_in_market, entry_bars,
+    exit_bars, exit_prices). Trade k is entered at opens[entry_bars[k]] and
+    left at exit_prices[k] on bar exit_bars[k] (the last close if it was
+    still open at the end).
+    """
+    n = len(closes)
+    entry_bars = np.empty(n, np.int64)
+    exit_bars = np.empty(n, np.int64)
+    exit_prices = np.empty(n)
+
+    in_position = False
+    entry_price = 0.0
+    equity = 1.0
+    peak_equity = 1.0
+    trades = 0
+    days_in_market = 0
+    closed = 0
+
+    for i in range(n - 1):
+        signal = signals[i]
+        if not in_position and signal == 1:
+            entry_price = opens[i + 1]
+            entry_bars[trades] = i + 1
+            in_position = True
+            trades += 1
+        elif in_position:
+            days_in_market += 1
+            if signal == -1:
+                exit_price = opens[i + 1]
+                equity *= exit_price / entry_price
+                exit_bars[closed] = i + 1
+                exit_prices[closed] = exit_price
+                closed += 1
+                in_position = False
+                peak_equity = max(peak_equity, equity)
+
+    if in_position:
+        last_close = closes[n - 1]
+        equity *= last_close / entry_price
+        exit_bars[closed] = n - 1
+        exit_prices[closed] = last_close
+        closed += 1
+        peak_equity = max(peak_equity, equity)
+
+    return equity, peak_equity, trades, days_in_market, entry_bars[:trades], exit_bars[:closed], exit_prices[:closed]
+
+
+# ---- Indicators (same signatures and outputs as vectorIndicators) ----
+
+@jit
+def rolling_max_kernel(values, window):
+    # Monotonic deque of bar indices: O(n) regardless of window
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    queue = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    for i in range(n):
+        while tail > head and values[queue[tail - 1]] <= values[i]:
+            tail -= 1
+        queue[tail] = i
+        tail += 1
+        if queue[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = values[queue[head]]
+    return out
+
+
+@jit
+def rolling_min_kernel(values, window):
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    queue = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    for i in range(n):
+        while tail > head and values[queue[tail - 1]] >= values[i]:
+            tail -= 1
+        queue[tail] = i
+        tail += 1
+        if queue[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = values[queue[head]]
+    return out
+
+
+# Parity suite and benchmark: kernels vs the NumPy / Python paths
+if __name__ == "__main__":
+    import time
+    from datetime import date, timedelta
+    from backend.backtesting.backtestEngine import STRATEGIES, BacktestEngine, load_strategy
+    from backend.backtesting.priceSeries import PriceSeries
+    from backend.strategies import vectorIndicators
+
+    print(f"numba {'available: kernels are compiled' if NUMBA_AVAILABLE else 'not installed: kernels run as Python'}")
+    rng = np.random.default_rng(11)
+
+    # ---- Indicator parity ----
+    pairs = [
+        (vectorIndicators.rolling_max, rolling_max_kernel, (1, 20, 55)),
+        (vectorIndicators.rolling_min, rolling_min_kernel, (1, 20, 55)),
+    ]
+    for trial in range(10):
+        closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 1500))), 2)    # rounded: ties and flat bars
+        for numpy_fn, kernel, params in pairs:
+            for param in params:
+                assert np.array_equal(numpy_fn(closes, param), kernel(closes, param), equal_nan=True), (numpy_fn.__name__, param, trial)
+    print("indicator kernels match vectorIndicators")
+
+    # ---- Engine parity ----
+    def series_of(length, decimals=2):
+        # Rounded like real quotes, so closes tie their moving averages
+        closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, length))), decimals)
+        opens = np.round(closes * (1 + rng.normal(0, 0.005, length)), 2)
+        dates = np.array([np.datetime64(date(2000, 1, 3) + timedelta(days=i)) for i in range(length)])
+        return PriceSeries("TEST", dates, open=opens, close=closes)
+
+    def as_dict(result):
+        values = vars(result).copy()
+        values["trades"] = [trade.to_dict() for trade in result.trades]
+        values["equity_curve"] = result.equity_curve.tolist()
+        values["trade_stats"] = [getattr(result.trade_stats, name) for name in result.trade_stats.__slots__]
+        return values
+
+    checked = 0
+    for trial in range(10):
+        series = series_of(1000, 2 if trial % 2 == 0 else 0)
+        for name in STRATEGIES:
+            expected = as_dict(BacktestEngine("TEST", series, load_strategy(name), jit=False).run())
+            actual = as_dict(BacktestEngine("TEST", series, load_strategy(name), jit=True).run())
+            assert expected == actual, f"{name} mismatch on trial {trial}"
+            checked += 1
+    print(f"kernel engine path matches the Python loop on {checked} runs")
+
+    # ---- Benchmark ----
+    series = series_of(20 * 252)
+    for name in STRATEGIES:
+        timings = {}
+        for label, use_jit in (("python", False), ("kernels", True)):
+            engine = BacktestEngine("TEST", series, load_strategy(name), jit=use_jit)
+            engine.run()        # warm-up (compiles on first call)
+            started = time.perf_counter()
+            for _ in range(5):
+                engine.run()
+            timings[label] = (time.perf_counter() - started) / 5
+        print(f"{name:15s} python {timings['python'] * 1000:7.1f}ms  kernels {timings['kernels'] * 1000:7.1f}ms  ({timings['python'] / timings['kernels']:.1f}x)")
@@ -1,9 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routes import stock_routes, backtest_routes
+from backend.routes import stock_routes, backtest_routes, signal_routes
+from backend.backtesting import backtestPool, jobQueue
+from backend import signalService
+import backend.apis.finnhub as finnhub
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jobQueue.get_job_queue()
+    await signalService.start_configured()
+    try:
+        yield
+    finally:
+        await signalService.shutdown()
+        await finnhub.close_async_client()
+        finnhub.close_session()
+        backtestPool.shutdown()
+        jobQueue.shutdown()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,6 +34,7 @@ app.add_middleware(
 
 app.include_router(stock_routes.router, prefix="/api", tags=["Stocks"])
 app.include_router(backtest_routes.router, prefix="/api", tags=["Backtest"])
+app.include_router(signal_routes.router, prefix="/api", tags=["Signals"])
 
 @app.get("/")
 def read_root():
@@ -1,10 +1,18 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import date, timedelta
+from typing import List
 import importlib
-import yfinance as yf
+import json
 
-from backend.backtesting.backtestEngine import BacktestEngine
+from backend.backtesting import jobQueue
+from backend.backtesting.backtestPool import run_backtest_async
+from backend.backtesting.resultCache import RESULT_CACHE
+from backend.backtesting.backtestStream import backtest_report, stream_backtests
+from backend.data.asyncData import get_prices
+from backend.data.priceSources import INTRADAY_INTERVALS
 
 router = APIRouter()
 
@@ -12,6 +20,15 @@ class BacktestRequest(BaseModel):
     ticker: str
     strategy: str
     time_period: str
+    interval: str = "1d"    # or an intraday bar size, e.g. "5m" (Yahoo keeps ~60 days of those)
+
+class BatchBacktestRequest(BaseModel):
+    tickers: List[str]
+    strategies: List[str]
+    time_periods: List[str]
+
+class BacktestJobRequest(BatchBacktestRequest):
+    priority: int = 0       # higher runs first
 
 STRATEGIES = {
     "mock": "backend.strategies.mockStrategy.MockStrategy",
@@ -24,8 +41,12 @@ TIME_PERIODS = {
     "5y": 1825
 }
 
+INTERVALS = {"1d"} | INTRADAY_INTERVALS
+
+MAX_BATCH_CELLS = 500
+
 @router.post("/backtest")
-def run_backtest(request: BacktestRequest):
+async def run_backtest(request: BacktestRequest):
     """Run a backtest with the specified parameters"""
     
     # Validate inputs
@@ -34,6 +55,9 @@ def run_backtest(request: BacktestRequest):
     
     if request.time_period not in TIME_PERIODS:
         raise HTTPException(status_code=400, detail=f"Invalid time period: {request.time_period}")
+
+    if request.interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Invalid interval: {request.interval}")
     
     try:
         # Load strategy dynamically
@@ -46,36 +70,86 @@ def run_backtest(request: BacktestRequest):
         end_date = date.today()
         start_date = end_date - timedelta(days=TIME_PERIODS[request.time_period])
         
-        df = yf.download(request.ticker, start=start_date, end=end_date, progress=False)
-        if df.empty:
+        price_data = await get_prices(request.ticker, start_date, end_date, request.interval, adjusted=True)
+        if len(price_data) == 0:
             raise HTTPException(status_code=400, detail=f"No price data found for ticker: {request.ticker}")
         
-        # Convert dataframe to list of dicts
-        price_data = []
-        for idx, row in df.iterrows():
-            price_data.append({
-                "date": idx.date(),
-                "open": float(row["Open"]),
-                "close": float(row["Close"]),
-                "symbol": request.ticker
-            })
-        
-        # Run backtest
-        engine = BacktestEngine(
-            ticker=request.ticker,
-            price_data=price_data,
-            strategy=strategy
-        )
-        
-        result = engine.run()
+        # Run backtest (CPU-bound, so it runs on the backtest process pool)
+        result = await run_backtest_async(request.ticker, price_data, strategy)
         
         # Convert result to dict with trades
-        result_dict = result.to_dict()
-        result_dict["trades"] = [trade.to_dict() for trade in result.trades]
-        
-        return result_dict
+        return backtest_report(request.ticker, price_data, result)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backtest execution failed: {str(e)}")
+
+
+def validate_batch(request: BatchBacktestRequest):
+    for strategy in request.strategies:
+        if strategy not in STRATEGIES:
+            raise HTTPException(status_code=400, detail=f"Invalid strategy: {strategy}")
+
+    for time_period in request.time_periods:
+        if time_period not in TIME_PERIODS:
+            raise HTTPException(status_code=400, detail=f"Invalid time period: {time_period}")
+
+    cells = len({ticker.upper() for ticker in request.tickers}) * len(request.strategies) * len(request.time_periods)
+    if cells == 0:
+        raise HTTPException(status_code=400, detail="Need at least one ticker, strategy and time period")
+    if cells > MAX_BATCH_CELLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_CELLS} backtests per batch")
+
+
+@router.post("/backtest/batch")
+async def run_backtest_batch(request: BatchBacktestRequest):
+    """Run every ticker x strategy x period cell; one JSON report per line as each finishes"""
+    validate_batch(request)
+
+    async def ndjson():
+        async for row in stream_backtests(request.tickers, request.strategies, request.time_periods):
+            yield json.dumps(row) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/backtest/cache")
+async def backtest_cache_stats():
+    """Hit / miss counters of the backtest result cache"""
+    return RESULT_CACHE.stats()
+
+
+# -------------------------------------------------
+# Background jobs (submit / poll / cancel)
+# -------------------------------------------------
+
+@router.post("/backtest/jobs", status_code=202)
+async def submit_backtest_job(request: BacktestJobRequest):
+    """Queue a backtest grid and return its job id right away"""
+    validate_batch(request)
+    try:
+        job = jobQueue.get_job_queue().submit(
+            request.tickers, request.strategies, request.time_periods, request.priority
+        )
+    except jobQueue.QueueFull as e:
+        return JSONResponse(status_code=429, content={"detail": str(e)}, headers={"Retry-After": "5"})
+    return job.to_dict()
+
+
+@router.get("/backtest/jobs/{job_id}")
+async def get_backtest_job(job_id: str):
+    """Job status, progress in bars processed, and the results once done"""
+    job = jobQueue.get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
+
+
+@router.delete("/backtest/jobs/{job_id}")
+async def cancel_backtest_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = jobQueue.get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
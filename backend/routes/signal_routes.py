@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from backend.backtesting.backtestEngine import STRATEGIES
+from backend import signalService
+from backend.data import asyncData
+from backend.data.barFeeds import ReplayFeed
+from backend.signalService import get_signal_service
+
+router = APIRouter()
+
+class TrackRequest(BaseModel):
+    tickers: List[str]
+    strategies: List[str]
+
+class ReplayRequest(TrackRequest):
+    start: date
+    end: date
+    delay: float = 0.0      # seconds between replayed bars
+
+MAX_TRACKED_PAIRS = 500
+
+
+def validate_track(request: TrackRequest):
+    if not request.tickers or not request.strategies:
+        raise HTTPException(status_code=400, detail="tickers and strategies must not be empty")
+    unknown = [name for name in request.strategies if name not in STRATEGIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid strategy: {', '.join(unknown)}")
+    if len(request.tickers) * len(request.strategies) > MAX_TRACKED_PAIRS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TRACKED_PAIRS} ticker x strategy pairs per request")
+
+
+@router.get("/signals")
+async def get_signals(ticker: Optional[str] = None, strategy: Optional[str] = None):
+    """Current signal and position of every tracked (ticker, strategy)"""
+    service = get_signal_service()
+    return {
+        "signals": service.current(tickers=[ticker] if ticker else None, strategy=strategy),
+        "seq": service.last_seq,
+    }
+
+
+@router.get("/signals/changes")
+async def get_signal_changes(since: int = 0):
+    """Position changes after sequence number `since` (poll with the returned seq)"""
+    service = get_signal_service()
+    return {"changes": service.changes(since), "seq": service.last_seq}
+
+
+@router.post("/signals/track")
+async def track_signals(request: TrackRequest):
+    """Warm up and keep state for each (ticker, strategy)"""
+    validate_track(request)
+    try:
+        signals = await asyncData.offload(get_signal_service().track, request.tickers, request.strategies)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not load history: {str(e)}")
+    return {"signals": signals}
+
+
+def replay_report(replay_id: int, service, since: int = 0) -> dict:
+    return {
+        "replay_id": replay_id,
+        "running": service.running,
+        "signals": service.current(),
+        "changes": service.changes(since),
+        "seq": service.last_seq,
+    }
+
+
+@router.post("/signals/replay", status_code=202)
+async def replay_signals(request: ReplayRequest):
+    """
+    Warm up on the history before `start`, then replay cached bars from
+    start to end on a separate service (live signals are not affected);
+    poll it with GET /signals/replay/{replay_id}
+    """
+    validate_track(request)
+    if request.end <= request.start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    try:
+        replay_id, service = signalService.new_replay()
+    except signalService.TooManyReplays as e:
+        return JSONResponse(status_code=429, content={"detail": str(e)})
+    history_start = request.start - timedelta(days=service.history_days)
+
+    def warm_up():
+        history = {
+            ticker.upper(): service.cache.get(ticker, history_start, request.start, adjusted=True)
+            for ticker in request.tickers
+        }
+        return service.track(request.tickers, request.strategies, history)
+
+    try:
+        signals = await asyncData.offload(warm_up)
+    except Exception as e:
+        await signalService.stop_replay(replay_id)
+        raise HTTPException(status_code=500, detail=f"Could not load history: {str(e)}")
+
+    service.start(ReplayFeed(request.tickers, request.start, request.end, delay=request.delay))
+    return {"replay_id": replay_id, "signals": signals, "seq": service.last_seq}
+
+
+@router.get("/signals/replay/{replay_id}")
+async def get_replay(replay_id: int, since: int = 0):
+    """The replay's signals and its changes after sequence number `since`"""
+    service = signalService.get_replay(replay_id)
+    if service is None:
+        raise HTTPException(status_code=404, detail=f"Unknown replay: {replay_id}")
+    return replay_report(replay_id, service, since)
+
+
+@router.delete("/signals/replay/{replay_id}")
+async def stop_replay(replay_id: int):
+    """Stop the replay and drop its state; returns its final signals and changes"""
+    service = await signalService.stop_replay(replay_id)
+    if service is None:
+        raise HTTPException(status_code=404, detail=f"Unknown replay: {replay_id}")
+    return replay_report(replay_id, service)
+
+
+@router.get("/signals/stats")
+async def signal_stats():
+    return get_signal_service().stats()
@@ -1,16 +1,24 @@
-from fastapi import APIRouter
+import json
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from backend.stock import Stock
+from backend.stockBatch import rate_symbols
 
 router = APIRouter()
 
+MAX_BATCH_SYMBOLS = 500
+
+class BatchStockRequest(BaseModel):
+    symbols: List[str]
+
 @router.get("/stock/{symbol}")
-def get_stock(symbol: str):
+async def get_stock(symbol: str):
     stock = Stock(symbol)
     stock.set_symbol(symbol)
-    stock.set_name()
-    stock.set_currentPrice()
-    stock.set_consensus()
-    stock.set_signal()
+    await stock.load_async()       # all upstream sources in parallel
     return {
         "symbol": stock.symbol,
         "name": stock.name,
@@ -18,4 +26,20 @@ def get_stock(symbol: str):
         "score": stock.score,
         "consensus": stock.consensus,
         "signal": stock.signal,
+        "missing": stock.missing,
     }
+
+
+@router.post("/stocks/batch")
+async def get_stocks_batch(request: BatchStockRequest):
+    """Rate a watchlist; one JSON object per line, streamed as chunks finish"""
+    if not request.symbols:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(request.symbols) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per batch")
+
+    async def ndjson():
+        async for row in rate_symbols(request.symbols):
+            yield json.dumps(row) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -0,0 +1,282 @@
+# Live / paper-trading signal service
+# Casen Ward
+
+import asyncio
+import itertools
+import os
+import threading
+from collections import deque
+from datetime import date, timedelta
+from typing import List
+
+from backend.backtesting.backtestEngine import STRATEGIES, load_strategy
+from backend.backtesting.priceSeries import PriceSeries
+from backend.data import asyncData
+from backend.data.barFeeds import PollingFeed
+from backend.data.priceCache import PRICE_CACHE
+from backend.strategies.streamingAdapter import as_streaming
+
+
+# -------------------------------------------------
+# Signal service
+# -------------------------------------------------
+# Keeps one streaming strategy instance per (ticker, strategy) in memory.
+# A new state is warmed up once from SIGNAL_HISTORY_DAYS of cached bars;
+# after that every bar from a feed is one on_bar call (O(1) with the
+# rolling windows), and a change is recorded whenever the position the
+# backtest engine would hold flips (buy while flat, sell while long).
+# Changes carry a sequence number so clients can poll for new ones.
+#
+# SIGNAL_TICKERS (comma separated) starts a PollingFeed for those tickers
+# with SIGNAL_STRATEGIES (default: all) when the API starts.
+#
+# A replay runs on its own SignalService (own states, change log and
+# sequence numbers) registered under a replay id, so it never touches the
+# live states or the live change stream. At most MAX_REPLAYS are kept;
+# finished ones make room for new ones, running ones must be stopped.
+
+SIGNAL_STRATEGY = os.getenv("STOCK_SIGNAL_STRATEGY", "trend_follower")     # Stock.signal
+SIGNAL_HISTORY_DAYS = int(os.getenv("SIGNAL_HISTORY_DAYS", "400"))
+SIGNAL_CHANGES = int(os.getenv("SIGNAL_CHANGES", "1000"))       # recent changes kept
+SIGNAL_POLL_SECONDS = float(os.getenv("SIGNAL_POLL_SECONDS", "300"))
+MAX_REPLAYS = int(os.getenv("SIGNAL_MAX_REPLAYS", "8"))
+
+ACTIONS = {1: "buy", -1: "sell", 0: "hold"}
+
+
+def _iso(value) -> str:
+    return value.isoformat() if value is not None else None
+
+
+class SignalState:
+    __slots__ = ("ticker", "strategy_name", "strategy", "signal", "long", "as_of", "bars", "changed_at")
+
+    def __init__(self, ticker: str, strategy_name: str):
+        self.ticker = ticker
+        self.strategy_name = strategy_name
+        self.strategy = as_streaming(load_strategy(strategy_name))
+        self.strategy.reset()
+        self.signal = 0
+        self.long = False
+        self.as_of = None           # date of the last bar seen
+        self.bars = 0
+        self.changed_at = None      # date of the last position flip
+
+    def update(self, bar: dict) -> bool:
+        """Feed one bar; True when the position flips."""
+        self.signal = self.strategy.on_bar(bar)
+        self.as_of = bar["date"]
+        self.bars += 1
+        if (self.signal == 1 and not self.long) or (self.signal == -1 and self.long):
+            self.long = not self.long
+            self.changed_at = bar["date"]
+            return True
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "strategy": self.strategy_name,
+            "signal": ACTIONS[self.signal],
+            "position": "long" if self.long else "flat",
+            "as_of": _iso(self.as_of),
+            "changed_at": _iso(self.changed_at),
+            "bars": self.bars,
+        }
+
+
+class SignalService:
+    def __init__(self, history_days: int = SIGNAL_HISTORY_DAYS, max_changes: int = SIGNAL_CHANGES, cache=PRICE_CACHE):
+        self.history_days = history_days
+        self.cache = cache
+
+        self._states = {}           # ticker -> {strategy name: SignalState}
+        self._lock = threading.Lock()
+        self._changes = deque(maxlen=max_changes)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._listeners = []
+        self._tasks = set()
+
+    # ---- Tracking ----
+
+    def warm_up(self, ticker: str, strategy_name: str, history: PriceSeries = None) -> SignalState:
+        """A state fed with `history` (default: the cached SIGNAL_HISTORY_DAYS up to today)."""
+        if strategy_name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy_name}")
+        if history is None:
+            end = date.today()
+            history = self.cache.get(ticker, end - timedelta(days=self.history_days), end, adjusted=True)
+
+        state = SignalState(ticker, strategy_name)
+        for bar in history:
+            state.update(bar)
+        return state
+
+    def track(self, tickers: List[str], strategies: List[str], history: dict = None) -> List[dict]:
+        """Start keeping state for every (ticker, strategy); history maps ticker -> PriceSeries."""
+        history = history or {}
+        for ticker in (ticker.upper() for ticker in tickers):
+            for strategy_name in strategies:
+                with self._lock:
+                    if strategy_name in self._states.get(ticker, {}):
+                        continue
+                state = self.warm_up(ticker, strategy_name, history.get(ticker))
+                with self._lock:
+                    self._states.setdefault(ticker, {}).setdefault(strategy_name, state)
+        return self.current(tickers=tickers)
+
+    def untrack(self, ticker: str, strategy_name: str = None):
+        with self._lock:
+            states = self._states.get(ticker.upper(), {})
+            if strategy_name is None:
+                states.clear()
+            else:
+                states.pop(strategy_name, None)
+            if not states:
+                self._states.pop(ticker.upper(), None)
+
+    # ---- Bars in, changes out ----
+
+    def ingest(self, ticker: str, bar: dict) -> List[dict]:
+        """Apply one bar to every tracked strategy of the ticker; returns the changes it caused."""
+        changes = []
+        with self._lock:
+            for state in self._states.get(ticker.upper(), {}).values():
+                if state.as_of is not None and bar["date"] <= state.as_of:
+                    continue        # already seen (replays, overlapping polls)
+                if state.update(bar):
+                    change = state.to_dict()
+                    change["seq"] = self._last_seq = next(self._seq)
+                    self._changes.append(change)
+                    changes.append(change)
+            listeners = list(self._listeners)
+
+        for change in changes:
+            for listener in listeners:
+                listener(change)
+        return changes
+
+    def add_listener(self, listener):
+        """listener(change_dict) is called for every change (from the ingesting thread)."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    async def run(self, feed):
+        async for ticker, bar in feed:
+            self.ingest(ticker, bar)
+
+    def start(self, feed) -> asyncio.Task:
+        task = asyncio.ensure_future(self.run(feed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # ---- Queries ----
+
+    def current(self, tickers: List[str] = None, strategy: str = None) -> List[dict]:
+        with self._lock:
+            wanted = self._states.keys() if tickers is None else [ticker.upper() for ticker in tickers]
+            return [
+                state.to_dict()
+                for ticker in wanted
+                for name, state in self._states.get(ticker, {}).items()
+                if strategy is None or name == strategy
+            ]
+
+    def changes(self, since: int = 0) -> List[dict]:
+        with self._lock:
+            return [change for change in self._changes if change["seq"] > since]
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def signal_for(self, ticker: str, strategy_name: str = SIGNAL_STRATEGY, history: PriceSeries = None) -> dict:
+        """The tracked state if there is one, otherwise a one-off warm-up (not tracked)."""
+        with self._lock:
+            state = self._states.get(ticker.upper(), {}).get(strategy_name)
+            if state is not None:
+                return state.to_dict()
+        return self.warm_up(ticker.upper(), strategy_name, history).to_dict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tickers": len(self._states),
+                "states": sum(len(states) for states in self._states.values()),
+                "changes": self._last_seq,
+                "feeds": len(self._tasks),
+            }
+
+
+_signal_service = None
+
+
+def get_signal_service() -> SignalService:
+    global _signal_service
+    if _signal_service is None:
+        _signal_service = SignalService()
+    return _signal_service
+
+
+class TooManyReplays(Exception):
+    pass
+
+
+_replays = {}       # replay id -> SignalService
+_replay_ids = itertools.count(1)
+
+
+def new_replay(**settings):
+    """(replay id, SignalService) for a new replay; raises TooManyReplays when MAX_REPLAYS are running."""
+    for replay_id, service in list(_replays.items()):
+        if len(_replays) < MAX_REPLAYS:
+            break
+        if not service.running:
+            del _replays[replay_id]
+    if len(_replays) >= MAX_REPLAYS:
+        raise TooManyReplays(f"{MAX_REPLAYS} replays are running; stop one first")
+
+    replay_id = next(_replay_ids)
+    _replays[replay_id] = SignalService(**settings)
+    return replay_id, _replays[replay_id]
+
+
+def get_replay(replay_id: int) -> SignalService:
+    return _replays.get(replay_id)
+
+
+async def stop_replay(replay_id: int) -> SignalService:
+    """Stop the replay's feed and forget it; returns its service (None if unknown)."""
+    service = _replays.pop(replay_id, None)
+    if service is not None:
+        await service.stop()
+    return service
+
+
+async def start_configured():
+    """Track SIGNAL_TICKERS and poll them for new bars (no-op when unset)."""
+    tickers = [ticker.strip().upper() for ticker in os.getenv("SIGNAL_TICKERS", "").split(",") if ticker.strip()]
+    if not tickers:
+        return
+    strategies = [name.strip() for name in os.getenv("SIGNAL_STRATEGIES", ",".join(STRATEGIES)).split(",") if name.strip()]
+    service = get_signal_service()
+    await asyncData.offload(service.track, tickers, strategies)
+    service.start(PollingFeed(tickers, every=SIGNAL_POLL_SECONDS))
+
+
+async def shutdown():
+    if _signal_service is not None:
+        await _signal_service.stop()
+    for replay_id in list(_replays):
+        await stop_replay(replay_id)
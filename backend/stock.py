@@ -3,6 +3,17 @@
 
 import backend.apis.finnhub as finnhub
 import yfinance as yahoo
+from datetime import date, timedelta
+from backend.data import asyncData
+from backend.data.dependencyLoader import Step, run_steps
+from backend.data.priceCache import PRICE_CACHE
+from backend.data.fundamentals import FUNDAMENTALS
+from backend.calculators.pe_ratio_score import get_pe_ratio_score
+from backend.calculators.pb_ratio_score import get_pb_ratio_score
+from backend.calculators.dividend_yield_score import get_dividend_yield_score
+from backend.calculators.momentum import get_momentum_score
+from backend.calculators.yahoo_consensus_score import get_yahoo_consensus_score
+from backend.signalService import SIGNAL_STRATEGY, get_signal_service
 
 
 def final_rating(score: float) -> str:
@@ -18,14 +29,32 @@ def final_rating(score: float) -> str:
         return "Strong Sell"
 
 
+# Per-source timeouts (seconds) for Stock.load_async
+SOURCE_TIMEOUTS = {
+    "name": 5,
+    "price": 3,
+    "fundamentals": 5,
+    "candles": 8,
+    "analyst": 5,
+    "consensus": 5,
+    "signal": 5,
+}
+
+MOMENTUM_DAYS = 365     # candle history used by the momentum score
+
+
 class Stock:
     def __init__(self, symbol):
-        self.signal = None
+        self.signal = None          # SIGNAL_STRATEGY's current signal / position (signalService)
         self.symbol = None
         self.name = None
         self.current_price = None
         self.score = None
         self.consensus = None
+        self.fundamentals = None    # Finnhub "metric" snapshot shared by the score calculators
+        self.candles = None         # one year of daily prices (PriceSeries)
+        self.analyst_score = None   # Yahoo analyst consensus score
+        self.missing = []           # sources that failed or timed out in load_async
 
     def set_symbol(self, symbol):
         self.symbol = symbol.upper() 
@@ -37,5 +66,101 @@ class Stock:
     def set_currentPrice(self):
         self.current_price = finnhub.get_quote(self.symbol)["c"] # Current price is in the "c" field of the quote response
 
-        
-    
\ No newline at end of file
+    def set_fundamentals(self):
+        self.fundamentals = FUNDAMENTALS.get(self.symbol)
+
+    def get_fundamentals(self) -> dict:
+        if self.fundamentals is None:     # fetched once per Stock, then reused by every calculator
+            self.set_fundamentals()
+        return self.fundamentals
+
+    def set_candles(self):
+        end = date.today()
+        self.candles = PRICE_CACHE.get(self.symbol, end - timedelta(days=MOMENTUM_DAYS), end, adjusted=True)
+
+    def get_candles(self):
+        if self.candles is None:
+            self.set_candles()
+        return self.candles
+
+    def set_analyst_score(self):
+        self.analyst_score = get_yahoo_consensus_score(self.symbol)
+
+    def get_analyst_score(self) -> float:
+        if self.analyst_score is None:
+            self.set_analyst_score()
+        return self.analyst_score
+
+    def set_signal(self):
+        # The live state when the signal service tracks this ticker, else
+        # the strategy replayed over the candles already loaded
+        self.signal = get_signal_service().signal_for(self.symbol, SIGNAL_STRATEGY, self.get_candles())
+
+    def set_consensus(self):
+        # Each score with the sources it needs; scores whose sources failed are left out
+        calculators = [
+            (get_pe_ratio_score, ("fundamentals",)),
+            (get_pb_ratio_score, ("price", "fundamentals")),
+            (get_dividend_yield_score, ("fundamentals",)),
+            (get_momentum_score, ("price", "candles")),
+            (Stock.get_analyst_score, ("analyst",)),
+        ]
+        scores = [
+            calculator(self) for calculator, sources in calculators
+            if not any(source in self.missing for source in sources)
+        ]
+        if not scores:
+            return
+        self.score = sum(scores) / len(scores)
+        self.consensus = final_rating(self.score)
+
+
+    # Async versions used by the API routes (no blocking calls on the event loop)
+    async def set_name_async(self):
+        self.name = await asyncData.get_company_name(self.symbol)
+
+    async def set_currentPrice_async(self):
+        quote = await finnhub.get_quote_async(self.symbol)
+        self.current_price = quote["c"]
+
+    async def set_fundamentals_async(self):
+        self.fundamentals = await FUNDAMENTALS.get_async(self.symbol)
+
+    async def set_candles_async(self):
+        await asyncData.offload(self.set_candles)
+
+    async def set_analyst_score_async(self):
+        await asyncData.offload(self.set_analyst_score)
+
+    async def set_consensus_async(self, failed):
+        self.missing = sorted(failed)
+        await asyncData.offload(self.set_consensus)
+
+    async def set_signal_async(self):
+        await asyncData.offload(self.set_signal)
+
+    async def load_async(self):
+        """
+        Fetch every upstream source concurrently, then score. A source that
+        fails or times out is listed in self.missing and its field stays None;
+        the consensus is computed from the remaining scores.
+        """
+        sources = ["name", "price", "fundamentals", "candles", "analyst"]
+        errors = {}
+
+        steps = [
+            Step("name", self.set_name_async),
+            Step("price", self.set_currentPrice_async),
+            Step("fundamentals", self.set_fundamentals_async),
+            Step("candles", self.set_candles_async),
+            Step("analyst", self.set_analyst_score_async),
+            Step("consensus", lambda: self.set_consensus_async(errors), deps=sources),
+            Step("signal", self.set_signal_async, deps=["candles"]),
+        ]
+        for step in steps:
+            step.timeout = SOURCE_TIMEOUTS[step.name]
+
+        await run_steps(steps, errors)
+        self.missing = sorted(errors)
+        if self.name is None:
+            self.name = "Unknown Company"
@@ -0,0 +1,195 @@
+# Batch stock rating for watchlists
+# Casen Ward
+
+import asyncio
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+import backend.apis.finnhub as finnhub
+from backend.calculators.dividend_yield_score import dividend_yield_scores
+from backend.calculators.momentum import momentum_scores
+from backend.calculators.pb_ratio_score import pb_ratio_scores
+from backend.calculators.pe_ratio_score import pe_ratio_scores
+from backend.calculators.yahoo_consensus_score import get_yahoo_consensus_score
+from backend.data import asyncData
+from backend.data.fundamentals import FUNDAMENTALS
+from backend.data.priceCache import PRICE_CACHE
+from backend.signalService import SIGNAL_STRATEGY, get_signal_service
+from backend.stock import MOMENTUM_DAYS, SOURCE_TIMEOUTS, final_rating
+
+
+# -------------------------------------------------
+# Batch rating
+# -------------------------------------------------
+# Symbols are rated in chunks of BATCH_CHUNK. Per chunk:
+# - candles for every symbol come from one bulk download (PriceCache.get_many)
+# - quotes, fundamentals, analyst scores and names are requested concurrently
+#   (Finnhub has no multi-symbol endpoints; its client pools, coalesces and
+#   rate-limits the calls)
+# - at most FINNHUB_IN_FLIGHT Finnhub calls per event loop are queued on the
+#   shared rate limiter at a time, so a large batch cannot run it into debt
+#   and starve /api/stock; a call's source timeout starts once it is past
+#   the limiter
+# - all scores are computed for the whole chunk at once with NumPy
+# and the chunk's rows are yielded, so callers can stream them out before
+# the later chunks have been fetched.
+
+BATCH_CHUNK = int(os.getenv("STOCK_BATCH_CHUNK", "25"))
+FINNHUB_IN_FLIGHT = int(os.getenv("STOCK_BATCH_FINNHUB_IN_FLIGHT", "5"))
+
+METRIC_FIELDS = ("peBasicExclExtraTTM", "bookValuePerShareAnnual", "dividendYield")
+
+
+async def _gather_source(name: str, calls) -> list:
+    """Run one source for every symbol; a failed or timed-out call becomes an exception."""
+    timeout = SOURCE_TIMEOUTS[name]
+    return await asyncio.gather(
+        *(asyncio.wait_for(call, timeout) for call in calls),
+        return_exceptions=True
+    )
+
+
+_finnhub_slots = None      # (event loop, Semaphore)
+
+
+def _finnhub_slot() -> asyncio.Semaphore:
+    global _finnhub_slots
+    loop = asyncio.get_running_loop()
+    if _finnhub_slots is None or _finnhub_slots[0] is not loop:
+        _finnhub_slots = (loop, asyncio.Semaphore(FINNHUB_IN_FLIGHT))
+    return _finnhub_slots[1]
+
+
+async def _gather_finnhub(name: str, symbols, call) -> list:
+    """Like _gather_source for call(symbol, timeout) Finnhub calls, FINNHUB_IN_FLIGHT at a time."""
+    timeout = SOURCE_TIMEOUTS[name]
+    slots = _finnhub_slot()
+
+    async def one(symbol):
+        async with slots:
+            return await call(symbol, timeout)
+
+    return await asyncio.gather(*(one(symbol) for symbol in symbols), return_exceptions=True)
+
+
+def _failed(value) -> bool:
+    return isinstance(value, BaseException)
+
+
+def _metric(metrics, field: str) -> float:
+    if _failed(metrics) or metrics.get(field) is None:
+        return np.nan
+    return float(metrics[field])
+
+
+def score_chunk(symbols, names, quotes, metrics, first_closes, analyst) -> list:
+    """Vectorized scoring of one chunk; failed sources are left out of each symbol's average."""
+    prices = np.array([np.nan if _failed(q) else q["c"] for q in quotes], dtype=float)
+    price_ok = np.array([not _failed(q) for q in quotes])
+    metrics_ok = np.array([not _failed(m) for m in metrics])
+    candles_ok = np.array([not _failed(c) for c in first_closes])
+    analyst_ok = np.array([not _failed(a) for a in analyst])
+
+    pe, bvps, dividend_yield = (np.array([_metric(m, field) for m in metrics]) for field in METRIC_FIELDS)
+    first = np.array([np.nan if _failed(c) else c for c in first_closes], dtype=float)
+
+    # One column per calculator, NaN where its sources failed
+    scores = np.column_stack([
+        np.where(metrics_ok, pe_ratio_scores(pe), np.nan),
+        np.where(metrics_ok & price_ok, pb_ratio_scores(prices, bvps), np.nan),
+        np.where(metrics_ok, dividend_yield_scores(dividend_yield), np.nan),
+        np.where(candles_ok & price_ok, momentum_scores(prices, first), np.nan),
+        np.array([np.nan if _failed(a) else a for a in analyst], dtype=float),
+    ])
+    available = ~np.isnan(scores)
+    counts = available.sum(axis=1)
+    totals = np.where(available, scores, 0.0).sum(axis=1)
+
+    rows = []
+    for i, symbol in enumerate(symbols):
+        missing = [
+            source for source, ok in (
+                ("name", not _failed(names[i])),
+                ("price", price_ok[i]),
+                ("fundamentals", metrics_ok[i]),
+                ("candles", candles_ok[i]),
+                ("analyst", analyst_ok[i]),
+            ) if not ok
+        ]
+        score = totals[i] / counts[i] if counts[i] else None
+        rows.append({
+            "symbol": symbol,
+            "name": "Unknown Company" if _failed(names[i]) else names[i],
+            "current_price": None if np.isnan(prices[i]) else float(prices[i]),
+            "score": None if score is None else float(score),
+            "consensus": None if score is None else final_rating(score),
+            "missing": missing,
+        })
+    return rows
+
+
+async def _candles(chunk) -> list:
+    end = date.today()
+    try:
+        candles = await asyncData.offload(
+            PRICE_CACHE.get_many, chunk, end - timedelta(days=MOMENTUM_DAYS), end, "1d", True
+        )
+    except Exception as e:
+        return [e] * len(chunk)
+    return [candles[symbol] for symbol in chunk]
+
+
+def _first_close(candles):
+    # No candles = no data (neutral score), like get_momentum_score
+    if _failed(candles):
+        return candles
+    return candles.close[0] if len(candles) else np.nan
+
+
+def _signals(chunk, candles) -> list:
+    service = get_signal_service()
+    return [
+        None if _failed(series) else service.signal_for(symbol, SIGNAL_STRATEGY, series)
+        for symbol, series in zip(chunk, candles)
+    ]
+
+
+async def rate_chunk(chunk) -> list:
+    names, quotes, metrics, analyst, candles = await asyncio.gather(
+        _gather_source("name", (asyncData.get_company_name(symbol) for symbol in chunk)),
+        _gather_finnhub("price", chunk, finnhub.get_quote_async),
+        _gather_finnhub("fundamentals", chunk, FUNDAMENTALS.get_async),
+        _gather_source("analyst", (asyncData.offload(get_yahoo_consensus_score, symbol) for symbol in chunk)),
+        asyncio.wait_for(_candles(chunk), SOURCE_TIMEOUTS["candles"]),
+        return_exceptions=True
+    )
+    if _failed(candles):
+        candles = [candles] * len(chunk)
+    rows = score_chunk(chunk, names, quotes, metrics, [_first_close(c) for c in candles], analyst)
+
+    # Same signal as Stock.signal, replayed over the candles just fetched
+    for row, signal in zip(rows, await asyncData.offload(_signals, chunk, candles)):
+        row["signal"] = signal
+        if signal is None:
+            row["missing"].append("signal")
+    return rows
+
+
+async def rate_symbols(symbols, chunk_size: int = BATCH_CHUNK):
+    """Yields one row per symbol (the /api/stock fields), chunk by chunk, in input order."""
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))     # dedupe, keep order
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    # Start the next chunk while the current one is being sent
+    pending = asyncio.ensure_future(rate_chunk(chunks[0])) if chunks else None
+    try:
+        for i in range(len(chunks)):
+            rows = await pending
+            pending = asyncio.ensure_future(rate_chunk(chunks[i + 1])) if i + 1 < len(chunks) else None
+            for row in rows:
+                yield row
+    finally:
+        if pending is not None:
+            pending.cancel()        # client went away mid-stream
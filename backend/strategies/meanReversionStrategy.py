@@ -1,20 +1,46 @@
+import math
+
+import numpy as np
+
+from backend.backtesting.priceSeries import close_prices
+from backend.strategies.rollingWindows import RollingRSI
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
 class MeanReversionStrategy:
     """
     Mean reversion strategy using RSI:
     - Buy when RSI < 30
     - Sell when RSI > 50
+
+    Parameters:
+    - period: RSI lookback in close-to-close changes (default 14)
+    - buy_below / sell_above: RSI thresholds (default 30 / 50)
     """
 
+    def __init__(self, period: int = 14, buy_below: float = 30, sell_above: float = 50):
+        self.period = period
+        self.buy_below = buy_below
+        self.sell_above = sell_above
+        self.reset()
+
+    def reset(self):
+        self.rsi = RollingRSI(self.period)
+
+    @property
+    def lookback(self) -> int:
+        return self.period + 1      # period changes need period + 1 closes
+
     def calculate_signal(self, historical_data):
-        if len(historical_data) < 15:
+        if len(historical_data) < self.period + 1:
             return 0
 
-        closes = [day["close"] for day in historical_data]
+        closes = close_prices(historical_data)
 
         gains = []
         losses = []
 
-        for i in range(1, 15):
+        for i in range(1, self.period + 1):
             delta = closes[-i] - closes[-i - 1]
             if delta > 0:
                 gains.append(delta)
@@ -26,15 +52,49 @@ class MeanReversionStrategy:
         if not losses:
             return -1
 
-        avg_gain = sum(gains) / 14
-        avg_loss = sum(losses) / 14
+        avg_gain = math.fsum(gains) / self.period
+        avg_loss = math.fsum(losses) / self.period
+
+        if avg_loss <= 0:
+            rsi = 100.0     # only flat closes on the loss side
+        else:
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
+
+        if rsi < self.buy_below:
+            return 1
+        elif rsi > self.sell_above:
+            return -1
+        else:
+            return 0
+
+    def on_bar(self, bar) -> int:
+        self.rsi.push(bar["close"])
+        if not self.rsi.full:
+            return 0
 
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        if not self.rsi.has_gains:
+            return 1
+        if not self.rsi.has_losses:
+            return -1
+
+        rsi = self.rsi.value
 
-        if rsi < 30:
+        if rsi < self.buy_below:
             return 1
-        elif rsi > 50:
+        elif rsi > self.sell_above:
             return -1
         else:
             return 0
+
+    def vectorized_signals(self, closes: np.ndarray, indicators: IndicatorStore = None) -> np.ndarray:
+        store = IndicatorStore.of(closes, indicators)
+        rsi, gain_count = store.rsi(self.period)
+
+        signals = np.select(
+            [gain_count == 0, gain_count == self.period, rsi < self.buy_below, rsi > self.sell_above],
+            [1, -1, 1, -1],
+            default=0,
+        ).astype(np.int8)
+        signals[:self.period] = 0
+        return signals
@@ -1,3 +1,12 @@
+import math
+
+import numpy as np
+
+from backend.backtesting.priceSeries import close_prices
+from backend.strategies.rollingWindows import RollingMean
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
 class MockStrategy:
     """
     MockStrategy - A simple AI generated mock trading strategy for backtesting, used to test simple backtest engine functionality.
@@ -22,24 +31,85 @@ class MockStrategy:
             "close": float
         }
     - historical_data is ordered chronologically
+
+    Streaming:
+    - on_bar(bar) produces the same signal one bar at a time from a running
+      20-day sum, without rebuilding the close history
+    - every path averages with math.fsum, so ties with the SMA resolve the
+      same way whichever one runs
+    - vectorized_signals(closes) computes every bar's signal at once
+
+    Parameters:
+    - window: SMA length (default 20)
+    - exit_band: exit when price is this fraction below the SMA (default 0.02)
     """
 
+    def __init__(self, window: int = 20, exit_band: float = 0.02):
+        self.window = window
+        self.exit_band = exit_band
+        self.reset()
+
+    def reset(self):
+        self.sma = RollingMean(self.window)
+        self.bars_seen = 0
+        self.prev_close = None
+        self.prev_ma = None
+
+    @property
+    def lookback(self) -> int:
+        return self.window + 1      # today's and yesterday's SMA
+
     def calculate_signal(self, historical_data) -> int:
-        if len(historical_data) < 21:
+        if len(historical_data) < self.window + 1:
             return 0
 
-        closes = [day["close"] for day in historical_data]
+        closes = close_prices(historical_data)
 
         price_today = closes[-1]
         price_yesterday = closes[-2]
 
-        ma_today = sum(closes[-20:]) / 20
-        ma_yesterday = sum(closes[-21:-1]) / 20
+        ma_today = math.fsum(closes[-self.window:]) / self.window
+        ma_yesterday = math.fsum(closes[-self.window - 1:-1]) / self.window
+
+        if price_today > ma_today and price_yesterday <= ma_yesterday:
+            return 1
+
+        if price_today < ma_today * (1 - self.exit_band):
+            return -1
+
+        return 0
+
+    def on_bar(self, bar) -> int:
+        price_today = bar["close"]
+        self.sma.push(price_today)
+        self.bars_seen += 1
+
+        ma_today = self.sma.value if self.sma.full else None
+        price_yesterday, ma_yesterday = self.prev_close, self.prev_ma
+        self.prev_close, self.prev_ma = price_today, ma_today
+
+        if self.bars_seen < self.window + 1:
+            return 0
 
         if price_today > ma_today and price_yesterday <= ma_yesterday:
             return 1
 
-        if price_today < ma_today * 0.98:
+        if price_today < ma_today * (1 - self.exit_band):
             return -1
 
         return 0
+
+    def vectorized_signals(self, closes: np.ndarray, indicators: IndicatorStore = None) -> np.ndarray:
+        store = IndicatorStore.of(closes, indicators)
+        closes = store.closes
+        ma = store.sma(self.window)
+
+        price_yesterday = np.roll(closes, 1)
+        ma_yesterday = np.roll(ma, 1)
+
+        buy = (closes > ma) & (price_yesterday <= ma_yesterday)
+        sell = closes < ma * (1 - self.exit_band)
+
+        signals = np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+        signals[:self.window] = 0
+        return signals
@@ -1,23 +1,71 @@
+import numpy as np
+
+from backend.backtesting.priceSeries import close_prices
+from backend.strategies.rollingWindows import RollingMax, RollingMin
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
 class MomentumBreakoutStrategy:
     """
     Momentum breakout strategy:
     - Buy on 20-day breakout
     - Sell on 10-day breakdown
+
+    Parameters:
+    - entry_window: breakout lookback (default 20)
+    - exit_window: breakdown lookback (default 10)
     """
 
+    def __init__(self, entry_window: int = 20, exit_window: int = 10):
+        self.entry_window = entry_window
+        self.exit_window = exit_window
+        self.reset()
+
+    def reset(self):
+        self.high = RollingMax(self.entry_window)
+        self.low = RollingMin(self.exit_window)
+
+    @property
+    def lookback(self) -> int:
+        return max(self.entry_window, self.exit_window)
+
     def calculate_signal(self, historical_data):
-        if len(historical_data) < 20:
+        if len(historical_data) < self.lookback:
             return 0
 
-        closes = [day["close"] for day in historical_data]
+        closes = close_prices(historical_data)
 
         price_today = closes[-1]
-        high_20 = max(closes[-20:])
-        low_10 = min(closes[-10:])
+        high = max(closes[-self.entry_window:])
+        low = min(closes[-self.exit_window:])
+
+        if price_today >= high:
+            return 1
+        elif price_today <= low:
+            return -1
+        else:
+            return 0
 
-        if price_today >= high_20:
+    def on_bar(self, bar) -> int:
+        price_today = bar["close"]
+        self.high.push(price_today)
+        self.low.push(price_today)
+        if not (self.high.full and self.low.full):
+            return 0
+
+        if price_today >= self.high.value:
             return 1
-        elif price_today <= low_10:
+        elif price_today <= self.low.value:
             return -1
         else:
             return 0
+
+    def vectorized_signals(self, closes: np.ndarray, indicators: IndicatorStore = None) -> np.ndarray:
+        store = IndicatorStore.of(closes, indicators)
+        closes = store.closes
+        high = store.rolling_max(self.entry_window)
+        low = store.rolling_min(self.exit_window)
+
+        signals = np.where(closes >= high, 1, np.where(closes <= low, -1, 0)).astype(np.int8)
+        signals[:self.lookback - 1] = 0
+        return signals
@@ -0,0 +1,195 @@
+import math
+from collections import deque
+
+
+# -------------------------------------------------
+# Rolling window state for streaming strategies
+# -------------------------------------------------
+# Each window is updated one value at a time in O(1) (amortized), so a
+# strategy driven through on_bar never has to rebuild its close history.
+# Window sums are exact: a float running sum drifts away from the sum of
+# the values it holds, and on rounded prices that flips `price == ma` ties.
+
+# Every finite float is a whole multiple of 2**-1074 (the smallest subnormal)
+_UNIT = 1 << 1074
+
+
+class ExactSum:
+    """
+    Sum of floats that can also be taken back out, kept as an integer count
+    of 2**-1074 and rounded once when read: value is math.fsum of the values
+    held, whatever order they came and went in. NaN while it holds a NaN or
+    an infinity.
+    """
+
+    def __init__(self):
+        self.units = 0
+        self.nonfinite = 0
+
+    def add(self, value: float, sign: int = 1):
+        if math.isfinite(value):
+            numerator, denominator = value.as_integer_ratio()       # denominator is a power of two
+            self.units += sign * (numerator << (1075 - denominator.bit_length()))
+        else:
+            self.nonfinite += sign
+
+    @property
+    def value(self) -> float:
+        return self.units / _UNIT if not self.nonfinite else math.nan
+
+
+class RollingMean:
+    """Simple moving average over the last `window` values: math.fsum(window) / window."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.sum = ExactSum()
+
+    def push(self, value: float):
+        self.values.append(value)
+        self.sum.add(value)
+        if len(self.values) > self.window:
+            self.sum.add(self.values.popleft(), -1)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def value(self) -> float:
+        return self.sum.value / self.window
+
+
+class RollingMax:
+    """Maximum of the last `window` values (monotonic deque)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.candidates = deque()       # (index, value), values decreasing
+
+    def push(self, value: float):
+        while self.candidates and self.candidates[-1][1] <= value:
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self) -> float:
+        return self.candidates[0][1]
+
+
+class RollingMin:
+    """Minimum of the last `window` values (monotonic deque)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.candidates = deque()       # (index, value), values increasing
+
+    def push(self, value: float):
+        while self.candidates and self.candidates[-1][1] >= value:
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self) -> float:
+        return self.candidates[0][1]
+
+
+class RollingRSI:
+    """
+    RSI over the last `period` close-to-close changes.
+
+    Matches MeanReversionStrategy: gains and losses are averaged over the
+    window (not Wilder-smoothed), and an unchanged close counts as a zero loss.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.deltas = deque()
+        self.gain_sum = ExactSum()
+        self.loss_sum = ExactSum()
+        self.gain_count = 0
+
+    def push(self, close: float):
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self._add(delta, 1)
+            self.deltas.append(delta)
+            if len(self.deltas) > self.period:
+                self._add(self.deltas.popleft(), -1)
+        self.prev_close = close
+
+    def _add(self, delta: float, sign: int):
+        if delta > 0:
+            self.gain_sum.add(delta, sign)
+            self.gain_count += sign
+        else:
+            self.loss_sum.add(-delta, sign)
+
+    @property
+    def full(self) -> bool:
+        return len(self.deltas) == self.period
+
+    @property
+    def has_gains(self) -> bool:
+        return self.gain_count > 0
+
+    @property
+    def has_losses(self) -> bool:
+        return self.gain_count < len(self.deltas)
+
+    @property
+    def value(self) -> float:
+        avg_gain = self.gain_sum.value / self.period
+        avg_loss = self.loss_sum.value / self.period
+        if avg_loss <= 0:
+            return 100.0     # only flat closes on the loss side
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+# Regression check: rounded and flat prices, where a drifting running sum
+# used to resolve `price == ma` ties differently from calculate_signal
+if __name__ == "__main__":
+    import random
+    from backend.backtesting.backtestEngine import STRATEGIES, load_strategy
+    from backend.strategies.streamingAdapter import LegacyStrategyAdapter
+
+    rng = random.Random(5)
+    series = {
+        "rounded": [round(100 * 1.02 ** rng.gauss(0, 1) + i * 0.01, 2) for i in range(3000)],
+        "flat": [round(20 + 0.05 * rng.choice((-1, 0, 0, 0, 1)) * (i % 7), 2) for i in range(3000)],
+        "constant": [12.34] * 500,
+    }
+
+    for label, closes in series.items():
+        for window in (3, 20, 200):
+            mean = RollingMean(window)
+            for i, close in enumerate(closes):
+                mean.push(close)
+                if mean.full:
+                    assert mean.value == math.fsum(closes[i - window + 1:i + 1]) / window, (label, window, i)
+
+        bars = [{"close": close, "open": close} for close in closes]
+        for name in STRATEGIES:
+            streaming, legacy = load_strategy(name), LegacyStrategyAdapter(load_strategy(name))
+            for i, bar in enumerate(bars):
+                assert streaming.on_bar(bar) == legacy.on_bar(bar), (label, name, i)
+        print(f"{label}: rolling means exact, on_bar matches calculate_signal for {len(STRATEGIES)} strategies")
@@ -0,0 +1,31 @@
+class LegacyStrategyAdapter:
+    """
+    Wraps a strategy that only implements calculate_signal(historical_data)
+    so the engine can drive it one bar at a time through on_bar(bar).
+
+    The adapter keeps its own history list and passes it to the wrapped
+    strategy, so legacy strategies behave exactly as before. When the
+    strategy declares a `lookback` (bars its signal depends on), only the
+    last lookback bars are kept, so memory stays flat on long series.
+    """
+
+    def __init__(self, strategy, lookback: int = None):
+        self.strategy = strategy
+        self.lookback = lookback
+        self.history = []
+
+    def reset(self):
+        self.history = []
+
+    def on_bar(self, bar) -> int:
+        self.history.append(bar)
+        if self.lookback is not None and len(self.history) > 2 * self.lookback:
+            del self.history[:-self.lookback]       # amortized O(1) per bar
+        return self.strategy.calculate_signal(self.history)
+
+
+def as_streaming(strategy):
+    """Return an object with reset() / on_bar(bar) for any strategy."""
+    if hasattr(strategy, "on_bar"):
+        return strategy
+    return LegacyStrategyAdapter(strategy, getattr(strategy, "lookback", None))
@@ -1,21 +1,68 @@
+import math
+
+import numpy as np
+
+from backend.backtesting.priceSeries import close_prices
+from backend.strategies.rollingWindows import RollingMean
+from backend.strategies.vectorIndicators import IndicatorStore
+
+
 class TrendFollowerStrategy:
     """
     Classic trend-following strategy:
     - Buy when price > 200-day MA
     - Sell when price < 200-day MA
+
+    Parameters:
+    - window: moving average length (default 200)
     """
 
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.ma = RollingMean(self.window)
+
+    @property
+    def lookback(self) -> int:
+        return self.window
+
     def calculate_signal(self, historical_data):
-        if len(historical_data) < 200:
+        if len(historical_data) < self.window:
             return 0  # not enough data
 
-        closes = [day["close"] for day in historical_data]
+        closes = close_prices(historical_data)
         price_today = closes[-1]
-        ma_200 = sum(closes[-200:]) / 200
+        ma = math.fsum(closes[-self.window:]) / self.window
+
+        if price_today > ma:
+            return 1
+        elif price_today < ma:
+            return -1
+        else:
+            return 0
 
-        if price_today > ma_200:
+    def on_bar(self, bar) -> int:
+        price_today = bar["close"]
+        self.ma.push(price_today)
+        if not self.ma.full:
+            return 0  # not enough data
+
+        ma = self.ma.value
+
+        if price_today > ma:
             return 1
-        elif price_today < ma_200:
+        elif price_today < ma:
             return -1
         else:
             return 0
+
+    def vectorized_signals(self, closes: np.ndarray, indicators: IndicatorStore = None) -> np.ndarray:
+        store = IndicatorStore.of(closes, indicators)
+        closes = store.closes
+        ma = store.sma(self.window)
+
+        signals = np.where(closes > ma, 1, np.where(closes < ma, -1, 0)).astype(np.int8)
+        signals[:self.window - 1] = 0  # not enough data
+        return signals
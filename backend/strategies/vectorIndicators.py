@@ -0,0 +1,234 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from backend.jitKernels import NUMBA_AVAILABLE, rolling_max_kernel, rolling_min_kernel
+
+
+# -------------------------------------------------
+# Whole-series indicators (NumPy)
+# -------------------------------------------------
+# Every function takes a 1-D float array of closes and returns an array of
+# the same length. Bars without a full window are NaN, so index i always
+# lines up with the close at index i. Strategies get them through an
+# IndicatorStore (below) so they are computed once per series.
+# Window sums are exact (math.fsum of each window), like the streaming
+# windows in rollingWindows, so a tie between a close and its average
+# resolves the same way on every path.
+
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    math.fsum of every full window (len(values) - window + 1 sums), NaN for
+    windows holding a NaN or an infinity. Each float is split into an
+    integer mantissa and exponent and shifted onto the smallest exponent in
+    the series, so prefix sums of those (Python) integers are exact and each
+    window's sum is rounded once.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < window:
+        return np.empty(0)
+    finite = np.isfinite(values)
+    mantissa, exponent = np.frexp(np.where(finite, values, 0.0))
+    digits = (mantissa * 2.0 ** 53).astype(np.int64)       # exact: |mantissa| < 1
+    exponent = exponent.astype(np.int64) - 53
+    lowest = int(exponent.min())
+    units = digits.astype(object) << (exponent - lowest).astype(object)
+
+    prefix = np.concatenate(([0], np.cumsum(units)))
+    exact = prefix[window:] - prefix[:-window]
+    sums = (exact / (1 << -lowest) if lowest < 0 else exact * (1 << lowest)).astype(float)
+
+    nonfinite = np.concatenate(([0], np.cumsum(~finite)))
+    sums[nonfinite[window:] > nonfinite[:-window]] = np.nan
+    return sums
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    out[window - 1:] = window_sums(values, window) / window
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    out[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return out
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    out[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return out
+
+
+def rsi_components(closes: np.ndarray, period: int = 14):
+    """
+    Rolling RSI over the last `period` close-to-close changes, matching
+    MeanReversionStrategy (simple averages, unchanged close = zero loss).
+
+    Returns (rsi, gain_count): gain_count is the number of positive changes
+    in the window, so callers can apply the strategy's "no gains" /
+    "no losses" rules. Both arrays are NaN until `period` changes exist.
+    """
+    rsi = np.full(len(closes), np.nan)
+    gain_count = np.full(len(closes), np.nan)
+    if len(closes) <= period:
+        return rsi, gain_count
+
+    deltas = np.diff(closes)
+    up = deltas > 0
+    gains = np.where(up, deltas, 0.0)
+    losses = np.where(up, 0.0, -deltas)
+
+    avg_gain = window_sums(gains, period) / period
+    avg_loss = window_sums(losses, period) / period
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = np.where(avg_loss <= 0, 100.0, 100 - (100 / (1 + rs)))
+
+    rsi[period:] = values
+    gain_count[period:] = np.convolve(up.astype(float), np.ones(period), mode="valid")
+    return rsi, gain_count
+
+
+# -------------------------------------------------
+# Indicator store
+# -------------------------------------------------
+# Bound to one close series. Each indicator is computed once over the whole
+# series the first time it is asked for, memoized by (name, params), and
+# shared by every strategy evaluated on that series. append() extends the
+# closes and every memoized indicator by recomputing only the new bars
+# (plus the indicator's lookback), so a live feed never pays for a full
+# recompute.
+
+# name -> (function(closes, *params), lookback(*params) = extra bars needed before a new one)
+INDICATORS = {
+    "sma": (rolling_mean, lambda window: window - 1),
+    "max": (rolling_max, lambda window: window - 1),
+    "min": (rolling_min, lambda window: window - 1),
+    "rsi": (rsi_components, lambda period: period),
+}
+
+# The same indicators as compiled kernels (used by IndicatorStore(jit=True) when numba is installed).
+# sma and rsi keep their exact NumPy window sums, so jit never changes a signal.
+KERNEL_INDICATORS = {
+    "sma": INDICATORS["sma"],
+    "max": (rolling_max_kernel, INDICATORS["max"][1]),
+    "min": (rolling_min_kernel, INDICATORS["min"][1]),
+    "rsi": INDICATORS["rsi"],
+}
+
+
+def _read_only(view: np.ndarray) -> np.ndarray:
+    view.flags.writeable = False
+    return view
+
+
+class IndicatorStore:
+    def __init__(self, closes, jit: bool = False):
+        closes = getattr(closes, "close", closes)       # a PriceSeries or an array of closes
+        self._closes = np.array(closes, dtype=float)
+        self._indicators = KERNEL_INDICATORS if jit and NUMBA_AVAILABLE else INDICATORS
+        self._n = len(self._closes)
+        self._values = {}       # (name, *params) -> tuple of buffers, valid up to self._n
+
+        self.computed = 0
+        self.hits = 0
+
+    @staticmethod
+    def of(closes, store=None) -> "IndicatorStore":
+        """`store` if given (it must be bound to these closes), else a fresh store."""
+        if store is None:
+            return IndicatorStore(closes)
+        if len(store) != len(closes):
+            raise ValueError(f"IndicatorStore holds {len(store)} bars, not {len(closes)}")
+        return store
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def closes(self) -> np.ndarray:
+        return _read_only(self._closes[:self._n])
+
+    def get(self, name: str, *params):
+        """
+        The indicator as an array over every bar (a tuple of arrays for rsi).
+        Results are read-only views of the bars stored at the time of the
+        call: they do not grow with append (which may also move the
+        buffers), so call get again after appending.
+        """
+        key = (name,) + params
+        buffers = self._values.get(key)
+        if buffers is None:
+            compute, _ = self._indicators[name]
+            output = compute(self.closes, *params)
+            buffers = tuple(
+                np.concatenate((array, np.full(len(self._closes) - self._n, np.nan)))
+                for array in (output if isinstance(output, tuple) else (output,))
+            )
+            self._values[key] = buffers
+            self.computed += 1
+        else:
+            self.hits += 1
+
+        views = tuple(_read_only(buffer[:self._n]) for buffer in buffers)
+        return views if len(views) > 1 else views[0]
+
+    def at(self, i: int, name: str, *params):
+        """Indicator value at bar i (O(1) once the indicator is stored)."""
+        values = self.get(name, *params)
+        return tuple(array[i] for array in values) if isinstance(values, tuple) else values[i]
+
+    def sma(self, window: int) -> np.ndarray:
+        return self.get("sma", window)
+
+    def rolling_max(self, window: int) -> np.ndarray:
+        return self.get("max", window)
+
+    def rolling_min(self, window: int) -> np.ndarray:
+        return self.get("min", window)
+
+    def rsi(self, period: int = 14):
+        return self.get("rsi", period)
+
+    def append(self, closes):
+        """Add bars to the end and extend every stored indicator over them."""
+        closes = np.asarray(getattr(closes, "close", closes), dtype=float).ravel()
+        if len(closes) == 0:
+            return
+
+        old_n, new_n = self._n, self._n + len(closes)
+        if new_n > len(self._closes):
+            self._grow(max(new_n, 2 * len(self._closes)))
+
+        self._closes[old_n:new_n] = closes
+        self._n = new_n
+
+        for key, buffers in self._values.items():
+            name, params = key[0], key[1:]
+            compute, lookback = self._indicators[name]
+            lo = max(0, old_n - lookback(*params))
+            output = compute(self._closes[lo:new_n], *params)
+            for buffer, array in zip(buffers, output if isinstance(output, tuple) else (output,)):
+                buffer[old_n:new_n] = array[old_n - lo:]
+
+    def _grow(self, capacity: int):
+        # Doubling keeps a bar-by-bar feed amortized O(1) per bar
+        def grown(buffer, fill):
+            out = np.full(capacity, fill)
+            out[:self._n] = buffer[:self._n]
+            return out
+
+        self._closes = grown(self._closes, np.nan)
+        self._values = {key: tuple(grown(buffer, np.nan) for buffer in buffers) for key, buffers in self._values.items()}
+
+    def stats(self) -> dict:
+        return {"indicators": len(self._values), "computed": self.computed, "hits": self.hits}
@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.backtesting import parameterSweep
+from backend.backtesting.priceSeries import PriceSeries
+
+
+def _series(length=600, seed=7) -> PriceSeries:
+    rng = np.random.default_rng(seed)
+    closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, length))), 2)
+    opens = np.round(closes * (1 + rng.normal(0, 0.005, length)), 2)
+    dates = np.array([np.datetime64(date(2000, 1, 3) + timedelta(days=i)) for i in range(length)])
+    return PriceSeries("TEST", dates, open=opens, close=closes)
+
+
+GRID = {"entry_window": [5, 10, 20, 40], "exit_window": [3, 5, 10]}
+
+
+def test_blocks_match_one_pass(monkeypatch):
+    series = _series()
+    monkeypatch.setattr(parameterSweep, "SWEEP_BLOCK", len(parameterSweep.parameter_grid(GRID)))
+    expected = parameterSweep.sweep("momentum", series, GRID)
+
+    for block in (1, 5, 7):
+        monkeypatch.setattr(parameterSweep, "SWEEP_BLOCK", block)
+        assert parameterSweep.sweep("momentum", series, GRID) == expected
+
+
+def test_rows_follow_grid_order(monkeypatch):
+    monkeypatch.setattr(parameterSweep, "SWEEP_BLOCK", 5)
+    rows = parameterSweep.sweep("momentum", _series(), GRID)
+    assert [(row["entry_window"], row["exit_window"]) for row in rows] == \
+        [(params["entry_window"], params["exit_window"]) for params in parameterSweep.parameter_grid(GRID)]
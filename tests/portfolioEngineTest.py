@@ -0,0 +1,35 @@
+import numpy as np
+
+from backend.backtesting.portfolioEngine import PortfolioEngine
+from backend.backtesting.pricePanel import PricePanel
+
+
+class _AlwaysLong:
+    def vectorized_signals(self, closes, indicators=None):
+        return np.ones(len(closes), dtype=np.int8)
+
+
+def _panel(days=30, delisted_after=9):
+    dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-01-01") + days)
+    rising = 100 * 1.01 ** np.arange(days)
+    flat = np.where(np.arange(days) <= delisted_after, 50.0, np.nan)
+    prices = np.column_stack((rising, flat))
+    return PricePanel(dates, ["UP", "GONE"], prices.copy(), prices.copy())
+
+
+def test_delisted_ticker_releases_its_weight():
+    # GONE's last bar is day 9: it is sold at that close, and from day 10 UP
+    # is the only wanted ticker, so rebalancing puts the whole equity in it
+    panel = _panel()
+    result = PortfolioEngine(panel, _AlwaysLong(), rebalance_every=1).run()
+
+    growth = panel.close[-1, 0] / panel.close[10, 0]
+    assert np.isclose(result.equity[-1] / result.equity[10], growth)
+
+
+def test_delisted_position_is_sold_at_its_last_close():
+    panel = _panel()
+    result = PortfolioEngine(panel, _AlwaysLong()).run()
+    assert result.trades_count == 2
+    # Without rebalancing UP keeps its initial half; GONE's half is cash from day 9
+    assert np.isclose(result.equity[-1], 0.5 * panel.close[-1, 0] / panel.open[1, 0] + 0.5)
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.backtesting.priceSeries import PriceSeries
+from backend.data.priceCache import EMPTY_SETTLE_DAYS, PriceCache
+from backend.data.priceSources import empty_series
+
+
+class _Source:
+    """Weekday bars from `first` up to (not including) `last`; no bars while `down`."""
+
+    def __init__(self, first: date, last: date):
+        self.first, self.last = first, last
+        self.down = False
+        self.fetches = []
+
+    def fetch(self, ticker, start, end, interval="1d", adjusted=False):
+        self.fetches.append((start, end))
+        lo, hi = max(start, self.first), min(end, self.last)
+        if self.down or lo >= hi:
+            return empty_series(ticker, interval)
+        dates = np.arange(np.datetime64(lo), np.datetime64(hi), dtype="datetime64[D]")
+        dates = dates[np.is_busday(dates)]
+        closes = np.arange(len(dates), dtype=float) + 10
+        return PriceSeries(ticker, dates, open=closes, close=closes)
+
+
+def _coverage(cache):
+    return cache._read_coverage("TEST", "1d", False)
+
+
+def test_delisted_tail_is_covered_once_settled(tmp_path):
+    today = date.today()
+    source = _Source(date(2020, 1, 1), date(2021, 1, 1))
+    cache = PriceCache(str(tmp_path), source)
+    cache.get("TEST", date(2020, 1, 1), date(2021, 6, 1))
+
+    series = cache.get("TEST", date(2020, 1, 1), today)      # the tail has no bars at all
+    assert series.date_at(-1) < date(2021, 1, 1)
+    assert _coverage(cache) == (date(2020, 1, 1), today - timedelta(days=EMPTY_SETTLE_DAYS))
+
+    fetches = len(source.fetches)
+    cache.get("TEST", date(2020, 6, 1), today - timedelta(days=EMPTY_SETTLE_DAYS))
+    assert len(source.fetches) == fetches
+
+
+def test_holiday_head_is_covered_once_settled(tmp_path):
+    # 2020-12-25 (a Friday) has no bars
+    source = _Source(date(2020, 12, 28), date(2021, 6, 1))
+    cache = PriceCache(str(tmp_path), source)
+    cache.get("TEST", date(2020, 12, 28), date(2021, 3, 1))
+    cache.get("TEST", date(2020, 12, 25), date(2021, 3, 1))
+    assert _coverage(cache) == (date(2020, 12, 25), date(2021, 3, 1))
+
+
+def test_empty_first_fetch_is_not_covered(tmp_path):
+    source = _Source(date(2020, 1, 1), date(2021, 1, 1))
+    source.down = True
+    cache = PriceCache(str(tmp_path), source)
+    assert len(cache.get("TEST", date(2020, 1, 1), date(2020, 7, 1))) == 0
+    assert _coverage(cache) is None
+
+    source.down = False
+    assert len(cache.get("TEST", date(2020, 1, 1), date(2020, 7, 1))) > 0
+    assert _coverage(cache) == (date(2020, 1, 1), date(2020, 7, 1))
+
+
+def test_recent_empty_range_is_fetched_again(tmp_path):
+    today = date.today()
+    source = _Source(today - timedelta(days=400), today + timedelta(days=1))
+    cache = PriceCache(str(tmp_path), source)
+    cache.get("TEST", today - timedelta(days=400), today - timedelta(days=20))
+
+    source.down = True
+    cache.get("TEST", today - timedelta(days=400), today - timedelta(days=1))
+    assert _coverage(cache)[1] == today - timedelta(days=EMPTY_SETTLE_DAYS)
+
+    source.down = False
+    series = cache.get("TEST", today - timedelta(days=400), today - timedelta(days=1))
+    assert _coverage(cache)[1] == today - timedelta(days=1)
+    assert series.date_at(-1) > today - timedelta(days=EMPTY_SETTLE_DAYS)
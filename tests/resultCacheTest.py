@@ -0,0 +1,80 @@
+import os
+import time
+
+from backend.backtesting.resultCache import ResultCache
+
+
+def _entries(cache):
+    return sorted(os.path.basename(path)[:-4] for path, _ in cache._files())
+
+
+def _age(cache, key, seconds):
+    used = time.time() - seconds
+    os.utime(cache._path(key), (used, used))
+
+
+def test_sweep_drops_expired_then_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9, max_age_days=1)
+    for key in ("aa01", "bb02", "cc03", "dd04"):
+        cache.put(key, b"x" * 1000)
+    _age(cache, "aa01", 2 * 86400)      # expired
+    _age(cache, "bb02", 3000)
+    _age(cache, "cc03", 2000)
+    _age(cache, "dd04", 1000)
+
+    assert cache.sweep() == 1
+    assert _entries(cache) == ["bb02", "cc03", "dd04"]
+
+    cache.clear()
+    assert cache.get("bb02") is not None        # a disk hit marks bb02 as used
+    cache.max_bytes = 2500
+    assert cache.sweep() == 1
+    assert _entries(cache) == ["bb02", "dd04"]
+
+
+def test_writes_trigger_a_sweep(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=5000)
+    for i in range(20):
+        cache.put(f"{i:02d}key", b"x" * 1000)
+        _age(cache, f"{i:02d}key", 1000 - i)
+    assert sum(stat.st_size for _, stat in cache._files()) <= 5000
+    assert f"{19:02d}key" in _entries(cache)
+
+
+def test_clear_disk(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("ee05", {"result": 1})
+    cache.clear()
+    assert cache.get("ee05") == {"result": 1}      # still on disk
+    cache.clear(disk=True)
+    assert cache.get("ee05") is None
+
+
+def test_code_version_covers_indirect_backend_modules(tmp_path, monkeypatch):
+    import importlib.util
+    import sys
+
+    from backend.backtesting import resultCache
+
+    # strategy -> helper -> leaf, where the strategy module never names leaf
+    sources = {
+        "leaf": "def scale(x):\n    return 2 * x\n",
+        "helper": "from backend._versionTestLeaf import scale\n\ndef double(x):\n    return scale(x)\n",
+        "strategy": "from backend._versionTestHelper import double\n\nclass Strategy:\n    pass\n",
+    }
+    for name, source in sources.items():
+        path = tmp_path / f"{name}.py"
+        path.write_text(source)
+        os.utime(path, (0, 0))      # older than the process, so its source is hashed
+        module_name = f"backend._versionTest{name.title()}"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, module_name, module)
+        spec.loader.exec_module(module)
+
+    strategy = sys.modules["backend._versionTestStrategy"].Strategy
+    before = resultCache.code_version(strategy)
+    monkeypatch.setitem(resultCache._source_hashes, "backend._versionTestLeaf", "edited")
+    assert resultCache.code_version(strategy) != before
+    monkeypatch.setitem(resultCache._source_hashes, "backend._versionTestLeaf", None)
+    assert resultCache.code_version(strategy) is None
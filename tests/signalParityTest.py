@@ -0,0 +1,164 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.backtesting.backtestEngine import BacktestEngine, load_strategy
+from backend.backtesting.priceSeries import PriceSeries
+from backend.backtesting.vectorizedSimulator import run_vectorized
+from backend.strategies.rollingWindows import RollingMean
+from backend.strategies.streamingAdapter import LegacyStrategyAdapter
+from backend.strategies.vectorIndicators import INDICATORS, KERNEL_INDICATORS, rolling_mean, rsi_components, window_sums
+
+
+# -------------------------------------------------
+# Legacy / streaming / vectorized parity
+# -------------------------------------------------
+# calculate_signal (the reference), on_bar and vectorized_signals must give
+# the same signal on every bar, and the engine the same trades, on prices
+# like real quotes: rounded to the cent, with flat runs and ties between a
+# close and its moving average.
+
+
+def _series(closes, seed=0) -> PriceSeries:
+    closes = np.asarray(closes, dtype=float)
+    rng = np.random.default_rng(seed)
+    opens = np.round(closes * (1 + rng.normal(0, 0.005, len(closes))), 2)
+    dates = np.array([np.datetime64(date(2000, 1, 3) + timedelta(days=i)) for i in range(len(closes))])
+    return PriceSeries("TEST", dates, open=opens, close=closes)
+
+
+def _walk(length, decimals, seed):
+    rng = np.random.default_rng(seed)
+    return np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, length))), decimals)
+
+
+SERIES = {
+    "rounded": _series(_walk(1500, 2, 1)),
+    "whole_dollars": _series(_walk(1500, 0, 2)),        # long flat runs
+    "flat_steps": _series(np.repeat(_walk(300, 2, 3), 5)),
+    "constant": _series(np.full(400, 12.34)),
+    "short": _series(_walk(8, 2, 4)),
+}
+
+STRATEGIES = [
+    ("mock", {}),
+    ("mock", {"window": 5}),
+    ("trend_follower", {}),
+    ("trend_follower", {"window": 3}),
+    ("momentum", {}),
+    ("momentum", {"entry_window": 5, "exit_window": 3}),
+    ("mean_reversion", {}),
+    ("mean_reversion", {"period": 2}),
+]
+
+
+class _LegacyOnly:
+    """A strategy with only calculate_signal, so the engine wraps it in LegacyStrategyAdapter."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.lookback = strategy.lookback
+
+    def calculate_signal(self, historical_data):
+        return self.strategy.calculate_signal(historical_data)
+
+
+def _label(strategy):
+    name, params = strategy
+    return name + "".join(f"-{key}={value}" for key, value in params.items())
+
+
+@pytest.mark.parametrize("series_name", SERIES)
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=_label)
+def test_signals_match(series_name, strategy):
+    series = SERIES[series_name]
+    name, params = strategy
+    legacy = LegacyStrategyAdapter(load_strategy(name, **params), load_strategy(name, **params).lookback)
+    streaming = load_strategy(name, **params)
+
+    bars = [series.bar(i) for i in range(len(series))]
+    expected = np.array([legacy.on_bar(bar) for bar in bars])
+    np.testing.assert_array_equal(np.array([streaming.on_bar(bar) for bar in bars]), expected)
+    np.testing.assert_array_equal(load_strategy(name, **params).vectorized_signals(series.close), expected)
+
+
+@pytest.mark.parametrize("series_name", [name for name in SERIES if name != "short"])
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=_label)
+def test_trades_match(series_name, strategy):
+    series = SERIES[series_name]
+    name, params = strategy
+
+    expected = BacktestEngine("TEST", series, _LegacyOnly(load_strategy(name, **params)), jit=False).run()
+    streaming = BacktestEngine("TEST", series, load_strategy(name, **params), jit=False).run()
+    assert [trade.to_dict() for trade in streaming.trades] == [trade.to_dict() for trade in expected.trades]
+
+    vectorized = run_vectorized("TEST", series, load_strategy(name, **params))
+    for result in (streaming, vectorized):
+        assert result.trades_count == expected.trades_count
+        assert result.strategy_return_pct == expected.strategy_return_pct
+        assert result.time_in_market_pct == expected.time_in_market_pct
+        np.testing.assert_array_equal(result.equity_curve, expected.equity_curve)
+
+
+# ---- Indicators against math.fsum ----
+
+@pytest.mark.parametrize("series_name", SERIES)
+@pytest.mark.parametrize("window", [1, 3, 20, 200])
+def test_rolling_means_are_fsum(series_name, window):
+    closes = SERIES[series_name].close.tolist()
+    expected = [math.fsum(closes[i - window + 1:i + 1]) / window for i in range(window - 1, len(closes))]
+
+    vectorized = rolling_mean(np.array(closes), window)
+    assert np.isnan(vectorized[:window - 1]).all()
+    assert vectorized[window - 1:].tolist() == expected
+
+    mean, streamed = RollingMean(window), []
+    for close in closes:
+        mean.push(close)
+        if mean.full:
+            streamed.append(mean.value)
+    assert streamed == expected
+
+
+def test_window_sums_exact_and_nan():
+    values = np.array([0.1, 0.2, 0.3, 1e16, 1.0, -1e16, np.nan, 0.5, 2.5e-320, 7.25])
+    sums = window_sums(values, 3)
+    for i, total in enumerate(sums):
+        window = values[i:i + 3]
+        if np.isnan(window).any():
+            assert np.isnan(total)
+        else:
+            assert total == math.fsum(window)
+
+
+def test_rsi_flat_losses():
+    # Gains but only unchanged closes on the loss side: RSI 100, not a division by zero
+    closes = np.array([10.0, 10.0, 10.5, 10.5, 11.0])
+    rsi, gain_count = rsi_components(closes, 4)
+    assert rsi[-1] == 100.0 and gain_count[-1] == 2
+
+
+# ---- jit path (a non-result setting for the result cache) ----
+
+@pytest.mark.parametrize("series_name", [name for name in SERIES if name != "short"])
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=_label)
+def test_jit_matches_loop(series_name, strategy):
+    series = SERIES[series_name]
+    name, params = strategy
+    expected = BacktestEngine("TEST", series, load_strategy(name, **params), jit=False).run()
+    actual = BacktestEngine("TEST", series, load_strategy(name, **params), jit=True).run()
+
+    assert [trade.to_dict() for trade in actual.trades] == [trade.to_dict() for trade in expected.trades]
+    assert actual.strategy_return_pct == expected.strategy_return_pct
+    np.testing.assert_array_equal(actual.equity_curve, expected.equity_curve)
+
+
+@pytest.mark.parametrize("series_name", SERIES)
+def test_kernel_indicators_match(series_name):
+    closes = SERIES[series_name].close
+    for name, params in (("sma", (20,)), ("max", (20,)), ("min", (5,)), ("rsi", (14,))):
+        expected, actual = INDICATORS[name][0](closes, *params), KERNEL_INDICATORS[name][0](closes, *params)
+        for e, a in zip(expected if isinstance(expected, tuple) else (expected,), actual if isinstance(actual, tuple) else (actual,)):
+            np.testing.assert_array_equal(a, e)